@@ -0,0 +1,88 @@
+"""
+bench_character_similarity.py
+
+Character-theme similarity on synthetic (Character, Concept, Count) rows, two ways:
+  dense:  pivot(...).fillna(0) + .T.corr()  (the old report code; full characters^2 matrix)
+  sparse: relation_counts.to_sparse + character_similarity.top_k_neighbours (k per character)
+
+Reports time, peak traced memory (tracemalloc) and output rows, and checks that every sparse
+neighbour has the dense correlation value. The dense path is skipped above --dense-limit
+characters.
+
+Usage:
+    python benchmarks/bench_character_similarity.py --characters 500 2000 8000 --concepts 400
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from relation_counts import to_sparse  # noqa: E402
+from character_similarity import top_k_neighbours  # noqa: E402
+
+
+def synthetic_rows(n_characters, n_concepts, per_character, seed=0):
+    rng = np.random.default_rng(seed)
+    characters = np.repeat(np.arange(n_characters), per_character)
+    concepts = rng.zipf(1.5, size=len(characters)) % n_concepts
+    return pd.DataFrame({
+        "Character": [f"Character_{i}" for i in characters],
+        "Concept": [f"Concept_{i}" for i in concepts],
+        "Count": rng.integers(1, 10, size=len(characters)),
+    }).groupby(["Character", "Concept"], as_index=False)["Count"].sum()
+
+
+def measured(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, result
+
+
+def dense(df):
+    return df.pivot(index="Character", columns="Concept", values="Count").fillna(0).T.corr()
+
+
+def sparse_top_k(df, k):
+    matrix, labels, _ = to_sparse(df, rows="Character", columns="Concept", values="Count")
+    return top_k_neighbours(matrix, labels, k=k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--concepts", type=int, default=400)
+    parser.add_argument("--per-character", type=int, default=20, help="Concept rows drawn per character")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dense-limit", type=int, default=4000)
+    args = parser.parse_args()
+
+    print(f"{'characters':>10} {'dense':>8} {'MiB':>7} {'rows':>10}   {'top-k':>8} {'MiB':>7} {'rows':>8}")
+    for n_characters in args.characters:
+        df = synthetic_rows(n_characters, args.concepts, args.per_character)
+        sparse_time, sparse_mib, neighbours = measured(lambda: sparse_top_k(df, args.k))
+
+        if n_characters <= args.dense_limit:
+            dense_time, dense_mib, correlation = measured(lambda: dense(df))
+            values = correlation.to_numpy()
+            index = {name: i for i, name in enumerate(correlation.index)}
+            expected = values[[index[c] for c in neighbours["Character"]], [index[n] for n in neighbours["Neighbor"]]]
+            assert np.allclose(expected, neighbours["Similarity"]), "top-k similarities differ from .T.corr()"
+            dense_cols = f"{dense_time:7.3f}s {dense_mib:7.1f} {correlation.size:>10}"
+        else:
+            dense_cols = f"{'skipped':>8} {'':>7} {'':>10}"
+        print(f"{n_characters:>10} {dense_cols}   {sparse_time:7.3f}s {sparse_mib:7.1f} {len(neighbours):>8}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
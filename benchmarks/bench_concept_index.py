@@ -0,0 +1,95 @@
+"""
+bench_concept_index.py
+
+Top-k concept lookup for a batch of passages against N concepts, three ways:
+  brute:  concept_matcher.match_concepts (the old path: one dense matrix product per chunk)
+  index:  concept_index.ConceptIndex (exact numpy search up to --exact-limit concepts, faiss HNSW above)
+  cached: ConceptIndex.build again with the same concepts (loaded from disk, nothing embedded)
+
+Embeddings are synthetic (a fixed random unit vector per string, passages placed near a
+random concept) so that only indexing and search are timed. Reports build, load and search
+time and recall@k of the index against the exact brute-force top-k. Brute force scores
+4096 passages against every concept at once, so its memory grows with the concept count.
+
+Usage:
+    python benchmarks/bench_concept_index.py --concepts 1000 10000 50000 --passages 2000 --k 3
+    python benchmarks/bench_concept_index.py --concepts 50000 --exact-limit 0     # HNSW recall/speed
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+import concept_index  # noqa: E402
+from concept_index import ConceptIndex  # noqa: E402
+from concept_matcher import build_concept_matrix, match_concepts  # noqa: E402
+
+
+class LookupEmbedder:
+    """SentenceTransformer stand-in returning precomputed vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, **kwargs):
+        return np.stack([self.vectors[sentence] for sentence in sentences])
+
+
+def synthetic(n_concepts, n_passages, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    concepts = rng.standard_normal((n_concepts, dim)).astype(np.float32)
+    targets = rng.integers(0, n_concepts, n_passages)
+    passages = concepts[targets] + 0.8 * rng.standard_normal((n_passages, dim)).astype(np.float32)
+    labels = [f"concept {i}" for i in range(n_concepts)]
+    texts = [f"definition {i}" for i in range(n_concepts)]
+    queries = [f"passage {i}" for i in range(n_passages)]
+    vectors = dict(zip(texts, concepts))
+    vectors.update(zip(queries, passages))
+    return labels, texts, queries, LookupEmbedder(vectors)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concepts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--passages", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--exact-limit", type=int, default=concept_index.EXACT_LIMIT,
+                        help="Concept count above which the index uses HNSW (default: %(default)s)")
+    args = parser.parse_args()
+
+    concept_index.EXACT_LIMIT = args.exact_limit
+    if concept_index._faiss() is None:
+        print("ℹ faiss-cpu is not installed: every index uses exact search")
+    else:
+        print(f"ℹ Exact search up to {args.exact_limit} concepts, faiss HNSW above")
+    print(f"{'concepts':>9} {'brute':>9} {'build':>9} {'load':>8} {'search':>9} {'recall@k':>9}")
+    for n_concepts in args.concepts:
+        labels, texts, queries, embedder = synthetic(n_concepts, args.passages, args.dim)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            brute_time, expected = timed(lambda: match_concepts(
+                embedder, queries, labels, build_concept_matrix(embedder, labels, texts), top_k=args.k))
+            build_time, index = timed(lambda: ConceptIndex.build(embedder, labels, texts, "bench", cache_dir))
+            load_time, _ = timed(lambda: ConceptIndex.build(embedder, labels, texts, "bench", cache_dir))
+            search_time, got = timed(lambda: index.search(embedder, queries, k=args.k))
+
+        hits = sum(len({label for label, _ in a} & {label for label, _ in b}) for a, b in zip(expected, got))
+        recall = hits / sum(len(a) for a in expected)
+        print(f"{n_concepts:>9} {brute_time:8.3f}s {build_time:8.3f}s {load_time:7.3f}s {search_time:8.3f}s "
+              f"{recall:9.3f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+bench_document_windows.py
+
+Whole-document classification of criticism papers: the old 512-token truncation
+(predict_text on the whole paper) against overlapping windows (passage_classifier.classify_windows).
+
+Synthetic papers of --words words are filler text with one posthumanist paragraph placed at
+--position (fraction of the paper; 0 is the start). Two checks:
+  decisions:  a keyword stand-in model (relevant iff a window contains the paragraph's keywords)
+              shows which papers each strategy finds, whether the relevant spans contain the
+              paragraph, and how much of the text concept extraction still has to parse
+  cost:       the classifier at --model, truncation against batched windows, and whether the
+              first window's decision equals the truncated one (identical input)
+
+Usage:
+    python benchmarks/bench_document_windows.py --model models/posthuman_finetuned --words 300 2000 8000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from passage_classifier import (classify_windows, aggregate_windows, relevant_spans,  # noqa: E402
+                                AGGREGATIONS, DEFAULT_STRIDE, MAX_LENGTH)
+
+MODEL_PATH = os.path.join(BASE_DIR, "../models/posthuman_finetuned")
+FILLER = ("the novel was published in a year of considerable change and the author wrote "
+          "several letters to his editor about the manuscript and its reception").split()
+PARAGRAPH = ("Deckard's empathy test collapses the boundary of the human: the cyborg and the "
+             "android unsettle posthumanism's account of hybrid identity.")
+KEYWORDS = ("cyborg", "posthumanism")
+
+
+class KeywordModel(torch.nn.Module):
+    """Classifier stand-in: label 1 for windows containing every keyword token, label 0 otherwise."""
+
+    def __init__(self, tokenizer):
+        super().__init__()
+        self.keyword_ids = [tokenizer.convert_tokens_to_ids(tokenizer.tokenize(word))[0] for word in KEYWORDS]
+        if tokenizer.unk_token_id in self.keyword_ids:
+            raise SystemExit(f"❌ The tokenizer does not know the keywords {KEYWORDS}; pass a real one with --tokenizer")
+
+    def forward(self, input_ids, attention_mask=None, **kwargs):
+        present = torch.stack([(input_ids == i).any(dim=1) for i in self.keyword_ids]).all(dim=0)
+        logits = torch.stack([(~present).float(), present.float()], dim=1) * 4 - 2
+        return type("Output", (), {"logits": logits})()
+
+
+def paper(n_words, position, rng):
+    words = [rng.choice(FILLER) for _ in range(n_words)]
+    at = int(position * n_words)
+    text = " ".join(words[:at] + [PARAGRAPH] + words[at:])
+    start = text.index(PARAGRAPH)
+    return text, (start, start + len(PARAGRAPH))
+
+
+def predict_truncated(text, tokenizer, model):
+    """The old predict_text(): the first 512 tokens only, padded to max_length."""
+    inputs = tokenizer(text, return_tensors="pt", padding="max_length", truncation=True, max_length=MAX_LENGTH)
+    with torch.no_grad():
+        return torch.argmax(model(**inputs).logits, dim=1).item() == 1
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=MODEL_PATH, help="Classifier directory")
+    parser.add_argument("--tokenizer", default=None, help="Tokenizer directory (default: --model)")
+    parser.add_argument("--words", type=int, nargs="+", default=[300, 2000, 8000], help="Paper lengths in words")
+    parser.add_argument("--papers", type=int, default=8, help="Papers per length")
+    parser.add_argument("--position", type=float, default=0.7, help="Where the relevant paragraph starts")
+    parser.add_argument("--stride", type=int, default=DEFAULT_STRIDE)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer or args.model, use_fast=True)
+    keyword_model = KeywordModel(tokenizer)
+    model = AutoModelForSequenceClassification.from_pretrained(args.model)
+    model.eval()
+    rng = random.Random(0)
+
+    print(f"Relevant paragraph at {args.position:.0%} of each paper, stride {args.stride}\n")
+    print(f"{'words':>6} {'windows':>8} {'truncated':>10} " + " ".join(f"{m:>9}" for m in AGGREGATIONS)
+          + f" {'in spans':>9} {'parsed':>7}")
+    cost = []
+    for n_words in args.words:
+        papers = [paper(n_words, args.position, rng) for _ in range(args.papers)]
+        texts = [text for text, _ in papers]
+
+        truncated = sum(predict_truncated(text, tokenizer, keyword_model) for text in texts)
+        windows = classify_windows(texts, tokenizer, keyword_model, stride=args.stride, batch_size=args.batch_size)
+        found = {m: sum(aggregate_windows(w, m) for w in windows) for m in AGGREGATIONS}
+        spans = [relevant_spans(w) for w in windows]
+        covered = sum(any(s <= start and end <= e for s, e in doc_spans)
+                      for doc_spans, (_, (start, end)) in zip(spans, papers))
+        parsed = sum(e - s for doc_spans in spans for s, e in doc_spans) / sum(map(len, texts))
+        n_windows = sum(map(len, windows)) / len(texts)
+        print(f"{n_words:>6} {n_windows:>8.1f} {truncated:>7}/{len(texts)} "
+              + " ".join(f"{found[m]:>6}/{len(texts)}" for m in AGGREGATIONS)
+              + f" {covered:>6}/{len(texts)} {parsed:>7.1%}")
+
+        truncated_time, truncated_labels = timed(lambda: [predict_truncated(t, tokenizer, model) for t in texts])
+        windows_time, windows = timed(lambda: classify_windows(texts, tokenizer, model, stride=args.stride,
+                                                               batch_size=args.batch_size))
+        first_agree = sum(label == (w[0].score > 0.5) for label, w in zip(truncated_labels, windows))
+        cost.append((n_words, truncated_time, windows_time, sum(map(len, windows)), first_agree, len(texts)))
+
+    print(f"\nCost on {args.model} ({torch.get_num_threads()} threads)")
+    print(f"{'words':>6} {'truncated':>10} {'windows':>9} {'per window':>11} {'first window = truncated':>25}")
+    for n_words, truncated_time, windows_time, n_windows, agree, n in cost:
+        print(f"{n_words:>6} {truncated_time:9.3f}s {windows_time:8.3f}s {windows_time / n_windows * 1000:9.1f}ms "
+              f"{agree:>22}/{n}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
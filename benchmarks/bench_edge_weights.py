@@ -0,0 +1,107 @@
+"""
+bench_edge_weights.py
+
+Size and load time of the two update_rdf_ttl.py output modes on the merged graph:
+  reify:       a blank node + rdf:subject/predicate/object + ex:occurrenceCount per edge
+  side-table:  the original triples only, counts in <file>.ttl.counts.tsv keyed by triple ID
+
+For each mode the updated file is written to a temporary folder and loaded three ways:
+rdflib Turtle parse, graph_snapshot.load_graph (warm snapshot), and
+EdgeCounts.from_snapshot (edge counts ready for Table 5). The counts read back are checked
+against the counts written. --scale N replicates the graph N times with renamed subjects.
+
+Usage:
+    python benchmarks/bench_edge_weights.py --scale 1 20
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+from rdflib import Graph, URIRef, BNode, Literal, RDF
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from graph_snapshot import load_graph, write_snapshot, snapshot_dir_for  # noqa: E402
+from edge_counts import EdgeCounts, write_counts, counts_path_for, EX  # noqa: E402
+
+DEFAULT_TTL = os.path.join(BASE_DIR, "../results/merged_posthumanism_graph.ttl")
+
+
+def write_updated(edges, path, mode):
+    graph = Graph()
+    for (s, p, o), count in edges.items():
+        graph.add((s, p, o))
+        if mode == "reify":
+            statement = BNode()
+            graph.add((statement, RDF.subject, s))
+            graph.add((statement, RDF.predicate, p))
+            graph.add((statement, RDF.object, o))
+            graph.add((statement, EX.occurrenceCount, Literal(count)))
+    graph.serialize(destination=path, format="turtle")
+    write_snapshot(graph, path)
+    if mode == "side-table":
+        write_counts(edges, path)
+    return len(graph)
+
+
+def size_of(path):
+    """Bytes of the Turtle file plus its counts side table, and of its snapshot folder."""
+    ttl = os.path.getsize(path)
+    if os.path.exists(counts_path_for(path)):
+        ttl += os.path.getsize(counts_path_for(path))
+    directory = snapshot_dir_for(path)
+    snapshot = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    return ttl, snapshot
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ttl", default=DEFAULT_TTL)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 20])
+    parser.add_argument("--counts", type=int, default=5, help="Edge counts are drawn from 1..N")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    base = Graph()
+    base.parse(args.ttl, format="turtle")
+    rng = random.Random(0)
+    print(f"{'edges':>7} {'mode':<11} {'triples':>8} {'ttl+tsv':>10} {'snapshot':>10} "
+          f"{'parse':>8} {'load_graph':>11} {'EdgeCounts':>11}")
+    for scale in args.scale:
+        edges = {}
+        for copy in range(scale):
+            for s, p, o in base:
+                s = URIRef(f"{s}_{copy}") if isinstance(s, URIRef) and copy else s
+                edges[(s, p, o)] = rng.randint(1, args.counts)
+
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in ("reify", "side-table"):
+                path = os.path.join(directory, f"updated_{mode}.ttl")
+                n_triples = write_updated(edges, path, mode)
+                ttl_bytes, snapshot_bytes = size_of(path)
+
+                parse_time, _ = best_of(args.repeat, lambda: Graph().parse(path, format="turtle"))
+                load_time, _ = best_of(args.repeat, lambda: load_graph(path))
+                counts_time, counts = best_of(args.repeat, lambda: EdgeCounts.from_snapshot(path))
+
+                got = {(s, p, o): n for s, p, o, n in counts.to_frame().itertuples(index=False)}
+                assert got == edges, f"{mode}: counts read back differ from the counts written"
+                print(f"{len(edges):>7} {mode:<11} {n_triples:>8} {ttl_bytes / 1024:8.0f}kB {snapshot_bytes / 1024:8.0f}kB "
+                      f"{parse_time:7.3f}s {load_time:10.3f}s {counts_time:10.3f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
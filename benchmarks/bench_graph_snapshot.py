@@ -0,0 +1,73 @@
+"""
+bench_graph_snapshot.py
+
+Load time of a Turtle graph: rdflib Turtle parsing vs. the binary snapshot from
+scripts/graph_snapshot.py (both as an rdflib Graph and as raw term/ID arrays).
+
+--scale N replicates the graph N times with renamed subjects into a temporary file, to
+see how both paths grow with graph size.
+
+Usage:
+    python benchmarks/bench_graph_snapshot.py --ttl results/merged_posthumanism_graph.ttl --scale 1 10 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+from rdflib import Graph, URIRef
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from graph_snapshot import load_graph, load_triples, build_snapshot  # noqa: E402
+
+DEFAULT_TTL = os.path.join(BASE_DIR, "../results/merged_posthumanism_graph.ttl")
+
+
+def scaled_copy(source, scale, directory):
+    """Write `scale` renamed copies of `source` into one Turtle file."""
+    graph = Graph()
+    graph.parse(source, format="turtle")
+    scaled = Graph()
+    for copy in range(scale):
+        for s, p, o in graph:
+            subject = URIRef(f"{s}_{copy}") if isinstance(s, URIRef) and copy else s
+            scaled.add((subject, p, o))
+    path = os.path.join(directory, f"scaled_{scale}.ttl")
+    scaled.serialize(destination=path, format="turtle")
+    return path
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ttl", default=DEFAULT_TTL)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'triples':>9} {'MB':>6} {'turtle parse':>13} {'build snap':>11} {'snap->Graph':>12} {'snap arrays':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scale:
+            path = scaled_copy(args.ttl, scale, directory)
+            parse_time, graph = best_of(args.repeat, lambda: Graph().parse(path, format="turtle"))
+            build_time, _ = best_of(1, lambda: build_snapshot(path))
+            graph_time, loaded = best_of(args.repeat, lambda: load_graph(path))
+            arrays_time, _ = best_of(args.repeat, lambda: load_triples(path))
+            assert len(loaded) == len(graph)
+            print(f"{len(graph):>9} {os.path.getsize(path) / 1e6:6.1f} {parse_time:12.3f}s {build_time:10.3f}s "
+                  f"{graph_time:11.3f}s {arrays_time:11.3f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
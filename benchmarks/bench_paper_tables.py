@@ -0,0 +1,61 @@
+"""
+bench_paper_tables.py
+
+Wall time of regenerating every paper table:
+  before: one process per table (what running analysis.py, analyze_table4.py,
+          generate_table2.py, generate_table5.py and query_novel.py one by one does)
+  after:  `paper_tables.py run-all`, one process sharing every loaded graph
+
+Runs against a temporary results folder in which every input graph of paper_tables.py is
+a copy of --graph, so the repository's results/ is never touched. Snapshots are warmed
+up first, so both modes load graphs the same way.
+
+Usage:
+    python benchmarks/bench_paper_tables.py --graph results/merged_posthumanism_graph.ttl --repeat 3
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PAPER_TABLES = os.path.join(BASE_DIR, "../scripts/paper_tables.py")
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from paper_tables import GRAPH_FILES, TABLES  # noqa: E402
+
+DEFAULT_GRAPH = os.path.join(BASE_DIR, "../results/merged_posthumanism_graph.ttl")
+
+
+def run(arguments, results_dir):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, PAPER_TABLES, *arguments, "--results-dir", results_dir],
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", default=DEFAULT_GRAPH, help="Turtle file used for every input graph")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as results_dir:
+        for filenames in GRAPH_FILES.values():
+            for filename in filenames:
+                shutil.copyfile(args.graph, os.path.join(results_dir, filename))
+        run(["run-all"], results_dir)  # build snapshots
+
+        before = min(sum(run([name], results_dir) for name in TABLES) for _ in range(args.repeat))
+        after = min(run(["run-all"], results_dir) for _ in range(args.repeat))
+
+    print(f"{'one process per table':<28} {before:7.2f}s  ({len(TABLES)} processes)")
+    print(f"{'paper_tables.py run-all':<28} {after:7.2f}s  (1 process)")
+    print(f"speed-up: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
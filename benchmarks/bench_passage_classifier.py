@@ -0,0 +1,76 @@
+"""
+bench_passage_classifier.py
+
+Compares passages/sec of the original per-line classifier path (padding="max_length",
+one passage per forward pass) with the batched, length-bucketed classify_passages().
+
+Usage:
+    python benchmarks/bench_passage_classifier.py --limit 500 --batch-sizes 8 32 64
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+
+from passage_classifier import classify_passages
+
+MODEL_PATH = os.path.join(BASE_DIR, "../models/posthuman_finetuned")
+NOVEL_TEXT_PATH = os.path.join(BASE_DIR, "../data/primary_text.txt")
+
+
+def predict_per_line(texts, tokenizer, model):
+    """Reference implementation: the original predict_text() applied line by line."""
+    mask = []
+    for text in texts:
+        inputs = tokenizer(text, return_tensors="pt", padding="max_length", truncation=True)
+        with torch.no_grad():
+            outputs = model(**inputs)
+        mask.append(torch.argmax(outputs.logits, dim=1).item() == 1)
+    return mask
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--text", default=NOVEL_TEXT_PATH, help="Text file with one passage per line")
+    parser.add_argument("--limit", type=int, default=500, help="Number of non-empty lines to classify")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 64])
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads() value")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    with open(args.text, "r", encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()][:args.limit]
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, local_files_only=True)
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH, local_files_only=True)
+    model.eval()
+
+    print(f"Benchmarking {len(texts)} passages on {torch.get_num_threads()} CPU threads\n")
+
+    reference, elapsed = timed(predict_per_line, texts, tokenizer, model)
+    print(f"{'per-line (max_length)':<24} {len(texts) / elapsed:10.1f} passages/sec  ({elapsed:.2f}s)")
+
+    for batch_size in args.batch_sizes:
+        mask, elapsed = timed(classify_passages, texts, tokenizer, model, batch_size=batch_size)
+        agreement = sum(a == b for a, b in zip(mask, reference)) / len(texts)
+        print(f"{f'batched (bs={batch_size})':<24} {len(texts) / elapsed:10.1f} passages/sec  "
+              f"({elapsed:.2f}s, agreement {agreement:.2%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+bench_preprocess.py
+
+data/ -> data/processed/ cleaning on a synthetic folder of --files text files (--mb each):
+  old:          the previous preprocess_text.py (serial, whole-file reads, two uncompiled re.sub)
+  first run:    preprocess_text.preprocess_all with --workers processes, chunked streaming
+  rerun:        the same call again (every file skipped via the manifest)
+  one changed:  rerun after appending to one file
+  sentences:    first run with --sentences
+
+Checks that every cleaned output is byte-identical to the old one, and reports the peak
+traced memory (tracemalloc) of cleaning one file the old way and chunked.
+
+Usage:
+    python benchmarks/bench_preprocess.py --files 8 --mb 5 --workers 4
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+import preprocess_text  # noqa: E402
+
+WORDS = ("Deckard looked at the owl ; it was, perhaps, electric . \"Do androids dream?\" she asked -- "
+         "Mercer's empathy box hummed!\n\nThe  sheep  (a real one) grazed\ton the roof.").split(" ")
+
+
+def old_preprocess_all(input_dir, output_dir):
+    """The previous implementation, kept here as the baseline."""
+    os.makedirs(output_dir, exist_ok=True)
+    for file in os.listdir(input_dir):
+        input_path = os.path.join(input_dir, file)
+        if os.path.isfile(input_path):
+            with open(input_path, "r", encoding="utf-8") as infile:
+                text = infile.read()
+            text = re.sub(r'\s+', ' ', text)
+            text = re.sub(r'[^\w\s]', '', text)
+            with open(os.path.join(output_dir, file), "w", encoding="utf-8") as outfile:
+                outfile.write(text.strip())
+
+
+def write_corpus(directory, n_files, mb, seed=0):
+    rng = random.Random(seed)
+    os.makedirs(directory)
+    for i in range(n_files):
+        with open(os.path.join(directory, f"c-{i:03d}.txt"), "w", encoding="utf-8") as f:
+            size = 0
+            while size < mb * 2 ** 20:
+                line = " ".join(rng.choices(WORDS, k=200)) + "\n"
+                f.write(line)
+                size += len(line)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fn()
+    return time.perf_counter() - start
+
+
+def peak_mib(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--mb", type=float, default=5, help="Size of each input file in MB")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        data = os.path.join(root, "data")
+        write_corpus(data, args.files, args.mb)
+        old_dir, new_dir, sentence_dir = (os.path.join(root, name) for name in ("old", "new", "sentences"))
+
+        def run(output_dir, **kwargs):
+            return lambda: preprocess_text.preprocess_all(data, output_dir, workers=args.workers, **kwargs)
+
+        times = {
+            "old": timed(lambda: old_preprocess_all(data, old_dir)),
+            "first run": timed(run(new_dir)),
+            "rerun": timed(run(new_dir)),
+        }
+        with open(os.path.join(data, "c-000.txt"), "a", encoding="utf-8") as f:
+            f.write("One more line.\n")
+        times["one changed"] = timed(run(new_dir))
+        times["sentences"] = timed(run(sentence_dir, sentences=True))
+
+        # c-000.txt changed after the old run; clean it again the old way before comparing
+        shutil.rmtree(old_dir)
+        old_preprocess_all(data, old_dir)
+        for name in sorted(os.listdir(old_dir)):
+            with open(os.path.join(old_dir, name), "rb") as a, open(os.path.join(new_dir, name), "rb") as b:
+                assert a.read() == b.read(), f"{name} differs from the old output"
+
+        first = os.path.join(data, "c-001.txt")
+        old_peak = peak_mib(lambda: old_preprocess_all(data, old_dir))  # all files, one at a time
+        new_peak = peak_mib(lambda: preprocess_text.preprocess_file(first, os.path.join(root, "one.txt")))
+
+    print(f"{args.files} files x {args.mb} MB, {args.workers} worker(s)")
+    for name, seconds in times.items():
+        print(f"  {name:<12} {seconds:8.3f}s")
+    print(f"  peak memory: old {old_peak:.1f} MiB, chunked {new_peak:.1f} MiB")
+    print("✅ Chunked output is byte-identical to the old output.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+bench_quantized_classifier.py
+
+Accuracy parity and CPU cost of the classifier backends (classifier_backend.py):
+  fp32:  the fine-tuned model as saved
+  int8:  dynamic int8 quantization of the Linear layers (cached next to the model)
+
+Every *.txt file in the glossary term directory (label 1) and the negative sample directory
+(label 0) is classified by both backends, each in its own subprocess so that load time and
+peak RSS are measured cleanly. Batches are built like passage_classifier.classify_passages.
+
+Reports accuracy against the directory labels, fp32/int8 agreement (and every file whose
+label flips), the largest logit difference, load and inference time and peak RSS. Exits
+with status 1 when more than --max-flips files change label, so it can gate a switch to
+--backend int8.
+
+The term files are not distributed with the repository (see data/glossary_terms/README.md);
+point --positive-dir/--negative-dir at a local copy.
+
+Usage:
+    python benchmarks/bench_quantized_classifier.py
+    python benchmarks/bench_quantized_classifier.py --model models/posthuman_finetuned \\
+        --positive-dir data/glossary_terms --negative-dir data/glossary_terms_negative --repeat 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from classifier_backend import BACKENDS, ensure_quantized, quantized_path_for  # noqa: E402
+
+DEFAULT_MODEL = os.path.join(BASE_DIR, "../models/posthuman_finetuned")
+DEFAULT_POSITIVE_DIR = os.path.join(BASE_DIR, "../data/glossary_terms")
+DEFAULT_NEGATIVE_DIR = os.path.join(BASE_DIR, "../data/glossary_terms_negative")
+
+
+def load_samples(positive_dir, negative_dir):
+    """[(name, text, label)] for every .txt file; README files are documentation, not samples."""
+    samples = []
+    for directory, label in ((positive_dir, 1), (negative_dir, 0)):
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".txt") and not name.lower().startswith("readme"):
+                with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                    samples.append((os.path.join(os.path.basename(directory), name), f.read(), label))
+    return samples
+
+
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10  # bytes on macOS, KiB on Linux
+
+
+# =============================================================================
+# Worker: one backend per process
+# =============================================================================
+def run_backend(args):
+    import torch
+    from transformers import AutoTokenizer
+    from classifier_backend import load_classifier_model
+    from passage_classifier import length_buckets, MAX_LENGTH
+
+    texts = [text for _, text, _ in load_samples(args.positive_dir, args.negative_dir)]
+    baseline_rss = peak_rss_mib()
+
+    start = time.perf_counter()
+    tokenizer = AutoTokenizer.from_pretrained(args.model, local_files_only=True)
+    model = load_classifier_model(args.model, args.worker, local_files_only=True)
+    load_seconds = time.perf_counter() - start
+
+    encodings = tokenizer(texts, truncation=True, max_length=MAX_LENGTH)
+    lengths = [len(ids) for ids in encodings["input_ids"]]
+    batches = length_buckets(lengths, args.batch_size)
+
+    times = []
+    logits = [None] * len(texts)
+    with torch.inference_mode():
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for batch in batches:
+                features = [{key: encodings[key][i] for key in encodings.keys()} for i in batch]
+                inputs = tokenizer.pad(features, padding="longest", return_tensors="pt")
+                for i, row in zip(batch, model(**inputs).logits.tolist()):
+                    logits[i] = row
+            times.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        "logits": logits,
+        "load_seconds": load_seconds,
+        "infer_seconds": min(times),
+        "tokens": sum(lengths),
+        "baseline_rss_mib": baseline_rss,
+        "peak_rss_mib": peak_rss_mib(),
+    }))
+    return 0
+
+
+def measure(backend, args):
+    command = [sys.executable, os.path.abspath(__file__), "--worker", backend, "--model", args.model,
+               "--positive-dir", args.positive_dir, "--negative-dir", args.negative_dir,
+               "--batch-size", str(args.batch_size), "--repeat", str(args.repeat)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise RuntimeError(f"{backend} worker failed with status {completed.returncode}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def model_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in ("model.safetensors", "pytorch_model.bin")
+               if os.path.exists(os.path.join(path, name)))
+
+
+# =============================================================================
+# Parity report
+# =============================================================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--positive-dir", default=DEFAULT_POSITIVE_DIR, help="Glossary term files (label 1)")
+    parser.add_argument("--negative-dir", default=DEFAULT_NEGATIVE_DIR, help="Negative sample files (label 0)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per backend (best is reported)")
+    parser.add_argument("--max-flips", type=int, default=0, help="Allowed fp32/int8 label disagreements")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_backend(args)
+
+    if not os.path.exists(os.path.join(args.model, "config.json")):
+        print(f"❌ Classifier model not found: {args.model}")
+        return 1
+    samples = load_samples(args.positive_dir, args.negative_dir)
+    if not samples:
+        print(f"❌ No .txt samples in {args.positive_dir} or {args.negative_dir} "
+              f"(the term files are not distributed with the repository).")
+        return 1
+    n_positive = sum(label for _, _, label in samples)
+    print(f"{len(samples)} samples ({n_positive} glossary terms, {len(samples) - n_positive} negatives)")
+
+    # Quantize up front so that the int8 worker times loading the cached artifact
+    ensure_quantized(args.model, local_files_only=True)
+    results = {backend: measure(backend, args) for backend in BACKENDS}
+
+    labels = [label for _, _, label in samples]
+    predictions = {backend: [int(row[1] > row[0]) for row in result["logits"]] for backend, result in results.items()}
+    sizes = {"fp32": model_bytes(args.model), "int8": os.path.getsize(quantized_path_for(args.model))}
+
+    print(f"\n{'backend':<8} {'accuracy':>9} {'load':>8} {'infer':>8} {'tokens/s':>10} {'RSS MiB':>8} {'weights MiB':>12}")
+    for backend, result in results.items():
+        accuracy = sum(p == label for p, label in zip(predictions[backend], labels)) / len(labels)
+        print(f"{backend:<8} {accuracy:9.3f} {result['load_seconds']:7.2f}s {result['infer_seconds']:7.3f}s "
+              f"{result['tokens'] / result['infer_seconds']:10.0f} "
+              f"{result['peak_rss_mib'] - result['baseline_rss_mib']:8.1f} {sizes[backend] / 2 ** 20:12.1f}")
+
+    fp32, int8 = results["fp32"], results["int8"]
+    flips = [(name, a, b) for (name, _, _), a, b in zip(samples, predictions["fp32"], predictions["int8"]) if a != b]
+    max_diff = max(abs(a - b) for rows in zip(fp32["logits"], int8["logits"]) for a, b in zip(*rows))
+    print(f"\nint8 speedup: {fp32['infer_seconds'] / int8['infer_seconds']:.2f}x, "
+          f"largest logit difference: {max_diff:.4f}")
+    print(f"Agreement: {len(samples) - len(flips)}/{len(samples)}")
+    for name, a, b in flips:
+        print(f"  ⚠ {name}: fp32 {a} -> int8 {b}")
+
+    if len(flips) > args.max_flips:
+        print(f"❌ {len(flips)} label flips (allowed: {args.max_flips}); keep --backend fp32 for this model.")
+        return 1
+    print("✅ int8 backend keeps the fp32 decisions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+bench_relation_counts.py
+
+GROUP BY ?char ?rel ?concept COUNT(*) on the merged graph: rdflib SPARQL vs.
+relation_counts.count_relations() on a TripleIndex. Both results are checked for equality.
+
+The committed merged graph uses engagesWith / involves / appearsIn rather than the novel
+relations, so those are the default --relations. --scale N replicates the graph N times
+with renamed subjects to show how both paths grow.
+
+Usage:
+    python benchmarks/bench_relation_counts.py --scale 1 20 100
+    python benchmarks/bench_relation_counts.py --ttl results/novel_posthumanism_rdf.ttl --relations strugglesWith linkedTo questions
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from rdflib import Graph, URIRef
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from triple_index import TripleIndex  # noqa: E402
+from relation_counts import count_relations  # noqa: E402
+
+DEFAULT_TTL = os.path.join(BASE_DIR, "../results/merged_posthumanism_graph.ttl")
+
+
+def sparql_counts(graph, relations):
+    query = f"""
+    PREFIX ex: <http://example.org/posthuman#>
+    SELECT ?char ?rel ?concept (COUNT(*) AS ?relCount)
+    WHERE {{
+      ?char ?rel ?concept .
+      FILTER(?rel IN ({", ".join(f"ex:{r}" for r in relations)}))
+    }}
+    GROUP BY ?char ?rel ?concept
+    ORDER BY ?char ?rel
+    """
+    return {(row[0], row[1], row[2]): int(row[3]) for row in graph.query(query)}
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ttl", default=DEFAULT_TTL)
+    parser.add_argument("--relations", nargs="+", default=["engagesWith", "involves", "appearsIn"])
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 20])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    base = Graph()
+    base.parse(args.ttl, format="turtle")
+    print(f"{'triples':>9} {'groups':>7} {'SPARQL':>9} {'index build':>12} {'count_relations':>16}")
+    for scale in args.scale:
+        graph = Graph()
+        for copy in range(scale):
+            for s, p, o in base:
+                graph.add((URIRef(f"{s}_{copy}") if isinstance(s, URIRef) and copy else s, p, o))
+
+        sparql_time, expected = best_of(args.repeat, lambda: sparql_counts(graph, args.relations))
+        build_time, index = best_of(1, lambda: TripleIndex.from_graph(graph))
+        count_time, df = best_of(args.repeat, lambda: count_relations(index, args.relations))
+
+        got = {(c, r, o): n for c, r, o, n in df.itertuples(index=False)}
+        assert got == expected, "count_relations differs from SPARQL"
+        print(f"{len(graph):>9} {len(df):>7} {sparql_time:8.3f}s {build_time:11.3f}s {count_time:15.3f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
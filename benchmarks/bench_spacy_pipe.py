@@ -0,0 +1,67 @@
+"""
+bench_spacy_pipe.py
+
+Throughput comparison for named-entity extraction on a long text:
+  1. the original path: full en_core_web_sm pipeline, nlp(text) per passage
+  2. NER-only pipeline (unused components excluded), nlp(text) per passage
+  3. NER-only pipeline through nlp.pipe with batching (and optional n_process)
+
+Usage:
+    python benchmarks/bench_spacy_pipe.py --limit 5000 --batch-size 256 --processes 1 2
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import spacy
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+NOVEL_TEXT_PATH = os.path.join(BASE_DIR, "../data/primary_text.txt")
+NER_EXCLUDED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+
+def entity_tuples(docs):
+    return [[(ent.text, ent.label_) for ent in doc.ents] for doc in docs]
+
+
+def report(label, n_passages, elapsed):
+    print(f"{label:<40} {n_passages / elapsed:10.1f} passages/sec  ({elapsed:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--text", default=NOVEL_TEXT_PATH, help="Text file with one passage per line")
+    parser.add_argument("--limit", type=int, default=5000, help="Number of non-empty lines to process")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    with open(args.text, "r", encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()][:args.limit]
+    print(f"Benchmarking NER on {len(texts)} passages ({sum(map(len, texts))} characters)\n")
+
+    full_nlp = spacy.load("en_core_web_sm")
+    start = time.perf_counter()
+    reference = entity_tuples(full_nlp(text) for text in texts)
+    report("full pipeline, nlp() per passage", len(texts), time.perf_counter() - start)
+
+    ner_nlp = spacy.load("en_core_web_sm", exclude=NER_EXCLUDED_PIPES)
+    print(f"NER-only pipeline components: {ner_nlp.pipe_names}")
+    start = time.perf_counter()
+    entities = entity_tuples(ner_nlp(text) for text in texts)
+    report("NER-only, nlp() per passage", len(texts), time.perf_counter() - start)
+
+    for n_process in args.processes:
+        start = time.perf_counter()
+        piped = entity_tuples(ner_nlp.pipe(texts, batch_size=args.batch_size, n_process=n_process))
+        report(f"NER-only, nlp.pipe (n_process={n_process})", len(texts), time.perf_counter() - start)
+        entities = piped
+
+    agreement = sum(a == b for a, b in zip(entities, reference)) / max(len(texts), 1)
+    print(f"\nEntity agreement with the full pipeline: {agreement:.2%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+bench_startup.py
+
+Cold-start cost of the RDF builders: wall time and peak RSS of a fresh interpreter for
+  1. `--dry-run` (input validation only; no torch, spaCy or transformers import)
+  2. importing the builder and loading every model it uses (optional, --load-models)
+
+Each measurement runs in its own subprocess from the repository root, so numbers include
+interpreter start-up and are not affected by modules cached in this process.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 3
+    python benchmarks/bench_startup.py --load-models
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
+SCRIPTS_DIR = os.path.join(REPO_DIR, "scripts")
+
+BUILDERS = {
+    "build_novel_rdf_fixed": ["get_classifier", "get_nlp", "get_embedding_model"],
+    "build_criticism_rdf_fixed": ["get_classifier", "get_nlp", "get_embedding_model"],
+}
+
+
+def measure(command):
+    """Run `command` from the repository root; return (seconds, peak RSS in MB, exit code)."""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=REPO_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_mb = usage.ru_maxrss / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+    return elapsed, peak_mb, process.returncode
+
+
+def load_command(module, getters):
+    calls = "; ".join(f"m.{getter}()" for getter in getters)
+    code = f"import sys; sys.path.insert(0, {SCRIPTS_DIR!r}); import {module} as m; {calls}"
+    return [sys.executable, "-c", code]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best time is reported)")
+    parser.add_argument("--load-models", action="store_true", help="Also time importing and loading all models")
+    args = parser.parse_args()
+
+    cases = []
+    for module, getters in BUILDERS.items():
+        cases.append((f"{module} --dry-run", [sys.executable, os.path.join("scripts", f"{module}.py"), "--dry-run"]))
+        if args.load_models:
+            cases.append((f"{module} load models", load_command(module, getters)))
+
+    print(f"{'case':<45} {'best time':>10} {'peak RSS':>10} {'exit':>5}")
+    for label, command in cases:
+        runs = [measure(command) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run[0])
+        print(f"{label:<45} {best[0]:9.2f}s {max(run[1] for run in runs):8.0f}MB {best[2]:>5}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
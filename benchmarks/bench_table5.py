@@ -0,0 +1,98 @@
+"""
+bench_table5.py
+
+Table 5 on the merged graph, before and after the per-edge count index:
+  before: subject-level `?s ex:occurrenceCount ?n` literals (the old results/update_rdf_ttl.py)
+          and the SUM(?occ) join query, which pairs every edge of a character with every
+          count literal on that character
+  after:  what Table 5 reads now (paper_tables.table5): the plain graph plus the
+          .counts.tsv side table the novel builder writes next to its *_fixed.ttl output,
+          read with edge_counts.read_counts and joined by edge_counts.EdgeCounts - one row per edge
+
+The subject-level graph is built in memory and the side table is written to a temporary
+folder from --ttl with the edge counts of --counts (random 1..N, so subjects carry several
+distinct count literals as in real runs).
+--scale N replicates the graph N times with renamed subjects.
+
+Usage:
+    python benchmarks/bench_table5.py --scale 1 10 50
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+from rdflib import Graph, URIRef, Literal
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from triple_index import TripleIndex  # noqa: E402
+from edge_counts import EdgeCounts, EX, read_counts, write_counts  # noqa: E402
+
+DEFAULT_TTL = os.path.join(BASE_DIR, "../results/merged_posthumanism_graph.ttl")
+
+OLD_QUERY = """
+PREFIX ex: <http://example.org/posthuman#>
+SELECT ?character ?predicate ?concept (SUM(?occ) AS ?total_count)
+WHERE {
+  ?character ?predicate ?concept .
+  ?character ex:occurrenceCount ?occ .
+}
+GROUP BY ?character ?predicate ?concept
+ORDER BY DESC(?total_count)
+"""
+
+
+def updated_graphs(edges):
+    """(subject-level graph, plain graph) for {(s, p, o): count}."""
+    subject_level, plain = Graph(), Graph()
+    for (s, p, o), count in edges.items():
+        subject_level.add((s, p, o))
+        subject_level.add((s, EX.occurrenceCount, Literal(count)))
+        plain.add((s, p, o))
+    return subject_level, plain
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ttl", default=DEFAULT_TTL)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--counts", type=int, default=5, help="Edge counts are drawn from 1..N")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    base = Graph()
+    base.parse(args.ttl, format="turtle")
+    rng = random.Random(args.seed)
+    print(f"{'edges':>7} {'old rows':>9} {'old SPARQL':>11} {'new rows':>9} {'index+side table':>17}")
+    for scale in args.scale:
+        edges = {}
+        for copy in range(scale):
+            for s, p, o in base:
+                s = URIRef(f"{s}_{copy}") if isinstance(s, URIRef) and copy else s
+                edges[(s, p, o)] = rng.randint(1, args.counts)
+        subject_level, plain = updated_graphs(edges)
+
+        old_time, old_rows = timed(lambda: list(subject_level.query(OLD_QUERY)))
+        with tempfile.TemporaryDirectory() as root:
+            ttl_path = os.path.join(root, "novel_posthumanism_rdf_fixed.ttl")
+            write_counts(edges, ttl_path)
+            new_time, counts = timed(lambda: EdgeCounts.from_index(TripleIndex.from_graph(plain),
+                                                                   read_counts(ttl_path)))
+
+        got = {(s, p, o): n for s, p, o, n in counts.to_frame().itertuples(index=False)}
+        assert got == edges, "EdgeCounts differs from the edge counts written to the graph"
+        print(f"{len(edges):>7} {len(old_rows):>9} {old_time:10.3f}s {len(counts):>9} {new_time:16.3f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+bench_topk.py
+
+"Top 3 themes per character" on results/sparql_character_analysis.csv, three ways:
+  apply:   groupby("Character").apply(lambda x: x.nlargest(k, "Count"))  (the old report code)
+  vector:  topk.top_k_per_group (stable sort + cumcount)
+  stream:  topk.TopK fed row by row (heap per character)
+
+--scale N replicates the table N times with renamed characters (N times as many groups).
+All three must select the same rows in the same order.
+
+Usage:
+    python benchmarks/bench_topk.py --scale 1 10 100 --k 3
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from topk import top_k_per_group, TopK  # noqa: E402
+
+DEFAULT_CSV = os.path.join(BASE_DIR, "../results/sparql_character_analysis.csv")
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.csv)
+    print(f"{'rows':>8} {'groups':>7} {'apply':>9} {'vector':>9} {'stream':>9}")
+    for scale in args.scale:
+        df = pd.concat([base.assign(Character=base["Character"] + f"_{copy}") for copy in range(scale)],
+                       ignore_index=True)
+
+        apply_time, expected = best_of(args.repeat, lambda: df.groupby("Character", group_keys=False).apply(
+            lambda x: x.nlargest(args.k, "Count")))
+        vector_time, got = best_of(args.repeat, lambda: top_k_per_group(df, "Character", "Count", k=args.k))
+        stream_time, top = best_of(args.repeat, lambda: TopK(args.k).update(
+            zip(df["Character"].tolist(), df["Count"].tolist(), range(len(df)))))
+
+        rows = list(expected.index)
+        assert df.loc[rows].reset_index(drop=True).equals(got), "top_k_per_group differs from groupby.apply"
+        assert [row for ranked in top.items().values() for _, row in ranked] == rows, "TopK differs from groupby.apply"
+        print(f"{len(df):>8} {df['Character'].nunique():>7} {apply_time:8.3f}s {vector_time:8.3f}s {stream_time:8.3f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
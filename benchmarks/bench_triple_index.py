@@ -0,0 +1,102 @@
+"""
+bench_triple_index.py
+
+Character x relation x concept counting (the results/character_concept_analysis.py
+pattern) three ways:
+  1. full scan: `for s, p, o in graph` with string checks on every triple
+  2. TripleIndex: string checks once per distinct term, then count_by() on the index
+  3. TripleIndex build time (from the binary snapshot), paid once per process
+
+Usage:
+    python benchmarks/bench_triple_index.py --characters 200 --triples 200000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from collections import defaultdict
+
+from rdflib import Graph, Namespace
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+from graph_snapshot import load_graph  # noqa: E402
+from triple_index import TripleIndex  # noqa: E402
+
+EX = Namespace("http://example.org/posthuman#")
+RELATIONS = ["linkedTo", "strugglesWith", "questions", "exemplifies", "isMentionedIn"]
+CONCEPTS = ["Cyborg_Theory", "Animal_Ethics", "Posthuman_Ethics", "Empathy", "Identity", "Memory"]
+TRACKED = {"Deckard": ["Deckard", "Rick_Deckard"], "Rachael": ["Rachael"], "Isidore": ["Isidore", "John_Isidore"]}
+TRACKED_RELATIONS = ["linkedTo", "strugglesWith", "questions"]
+
+
+def synthetic_graph(n_characters, n_triples, seed=0):
+    rng = random.Random(seed)
+    characters = [f"Character_{i}" for i in range(n_characters)] + [v for vs in TRACKED.values() for v in vs]
+    graph = Graph()
+    while len(graph) < n_triples:
+        graph.add((EX[rng.choice(characters)], EX[rng.choice(RELATIONS)],
+                   EX[rng.choice(CONCEPTS)] if rng.random() < 0.7 else EX[f"passage_{rng.randrange(n_triples)}"]))
+    return graph
+
+
+def scan_counts(graph):
+    counts = defaultdict(int)
+    for s, p, o in graph:
+        s, p = str(s), str(p)
+        for character, variants in TRACKED.items():
+            if any(f"http://example.org/posthuman#{variant}" in s for variant in variants):
+                for relation in TRACKED_RELATIONS:
+                    if f"http://example.org/posthuman#{relation}" in p:
+                        counts[(character, relation, str(o))] += 1
+    return counts
+
+
+def index_counts(index):
+    counts = defaultdict(int)
+    for character, variants in TRACKED.items():
+        subjects = index.find_terms(
+            lambda term: any(f"http://example.org/posthuman#{variant}" in str(term) for variant in variants),
+            position="s")
+        for relation in TRACKED_RELATIONS:
+            relation_uri = f"http://example.org/posthuman#{relation}"
+            predicates = index.find_terms(lambda term: relation_uri in str(term), position="p")
+            for (obj,), count in index.count_by("o", s=subjects, p=predicates).items():
+                counts[(character, relation, str(obj))] += count
+    return counts
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=200)
+    parser.add_argument("--triples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "novel.ttl")
+        synthetic_graph(args.characters, args.triples).serialize(destination=path, format="turtle")
+
+        load_graph(path)  # build the snapshot
+        graph_time, graph = timed(lambda: load_graph(path))
+        build_time, index = timed(lambda: TripleIndex.from_snapshot(path))
+        scan_time, expected = timed(lambda: scan_counts(graph))
+        query_time, counts = timed(lambda: index_counts(index))
+
+    assert counts == expected, "TripleIndex counts differ from the full scan"
+    print(f"{len(graph)} triples, {len(index.terms)} distinct terms, {len(counts)} result rows")
+    print(f"{'full scan over rdflib Graph':<32} {scan_time:8.3f}s  (+ {graph_time:.3f}s graph load)")
+    print(f"{'TripleIndex count_by':<32} {query_time:8.3f}s  (+ {build_time:.3f}s index build)")
+    print(f"speed-up (query only): {scan_time / query_time:.0f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
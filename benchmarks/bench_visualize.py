@@ -0,0 +1,117 @@
+"""
+bench_visualize.py
+
+Rendering a novel-style RDF graph (one passage node per relevant passage, characters,
+androids, animals and locations linked to --concepts concepts) with --passages passages:
+  old:      the previous visualize_rdf.py (every triple as a node/edge, spring_layout over all
+            of it, every node and edge label drawn; pyvis add_node/add_edge per triple)
+  coarsen:  visualize_rdf.coarsen + filter_graph (passages collapsed, parallel edges weighted)
+  layout:   cached_layout on a cold cache, then again (read from the cache)
+  png/html: draw_static_graph / draw_interactive_graph on the coarsened graph
+
+The old path is skipped above --old-limit passages.
+
+Usage:
+    python benchmarks/bench_visualize.py --passages 1000 5000 20000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+
+import rdflib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "../scripts"))
+import visualize_rdf  # noqa: E402
+
+EX = rdflib.Namespace("http://example.org/posthuman#")
+PREDICATES = ["embodies", "questions", "linkedTo", "strugglesWith", "symbolizes", "contextualizes"]
+
+
+def synthetic_graph(n_passages, n_concepts, n_entities, seed=0):
+    rng = random.Random(seed)
+    concepts = [EX[f"Concept_{i}"] for i in range(n_concepts)]
+    entities = [EX[f"Entity_{i}"] for i in range(n_entities)]
+    g = rdflib.Graph()
+    for i in range(n_passages):
+        passage = EX[f"passage_{i}"]
+        for concept in rng.sample(concepts, rng.choice([1, 1, 1, 2])):
+            g.add((concept, EX["isMentionedIn"], passage))
+            for entity in rng.sample(entities, rng.randint(1, 3)):
+                g.add((entity, EX[rng.choice(PREDICATES)], concept))
+    return g
+
+
+def old_static(g, path):
+    import networkx as nx
+    import matplotlib.pyplot as plt
+    G = nx.DiGraph()
+    for subj, pred, obj in g:
+        G.add_edge(str(subj), str(obj), label=str(pred).split("#")[-1])
+    plt.figure(figsize=(12, 8))
+    pos = nx.spring_layout(G, seed=42)
+    nx.draw(G, pos, with_labels=True, node_color="lightblue", edge_color="gray", node_size=2000, font_size=10)
+    nx.draw_networkx_edge_labels(G, pos, edge_labels={(u, v): d["label"] for u, v, d in G.edges(data=True)},
+                                 font_size=8)
+    plt.savefig(path)
+    plt.close()
+
+
+def old_interactive(g, path):
+    from pyvis.network import Network
+    net = Network(notebook=False, directed=True, cdn_resources="in_line")
+    for subj, pred, obj in g:
+        net.add_node(str(subj), label=str(subj), color="lightblue")
+        net.add_node(str(obj), label=str(obj), color="lightgreen")
+        net.add_edge(str(subj), str(obj), title=str(pred).split("#")[-1])
+    net.save_graph(path)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--passages", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--concepts", type=int, default=150)
+    parser.add_argument("--entities", type=int, default=60)
+    parser.add_argument("--max-nodes", type=int, default=visualize_rdf.MAX_NODES)
+    parser.add_argument("--old-limit", type=int, default=1000, help="Largest graph drawn the old way (passages)")
+    args = parser.parse_args()
+
+    print(f"{'passages':>9} {'triples':>8} {'nodes':>11} {'old png':>9} {'old html':>9} {'coarsen':>8} "
+          f"{'layout':>8} {'cached':>7} {'png':>7} {'html':>7}")
+    for n_passages in args.passages:
+        g = synthetic_graph(n_passages, args.concepts, args.entities)
+        with tempfile.TemporaryDirectory() as root:
+            old_png = old_html = "-"
+            if n_passages <= args.old_limit:
+                old_png = f"{timed(lambda: old_static(g, os.path.join(root, 'old.png')))[0]:8.2f}s"
+                old_html = f"{timed(lambda: old_interactive(g, os.path.join(root, 'old.html')))[0]:8.2f}s"
+
+            coarsen_time, G = timed(lambda: visualize_rdf.filter_graph(visualize_rdf.coarsen(g),
+                                                                       max_nodes=args.max_nodes))
+            cache_dir = os.path.join(root, "layouts")
+            layout_time, pos = timed(lambda: visualize_rdf.cached_layout(G, cache_dir=cache_dir))
+            cached_time, cached = timed(lambda: visualize_rdf.cached_layout(G, cache_dir=cache_dir))
+            assert cached == pos, "cached layout differs from the computed one"
+            png_time, _ = timed(lambda: visualize_rdf.draw_static_graph(G, pos, os.path.join(root, "new.png")))
+            html_time, _ = timed(lambda: visualize_rdf.draw_interactive_graph(G, pos, os.path.join(root, "new.html")))
+
+        n_old_nodes = len(set(g.subjects()) | set(g.objects()))
+        print(f"{n_passages:>9} {len(g):>8} {f'{G.number_of_nodes()}/{n_old_nodes}':>11} {old_png:>9} "
+              f"{old_html:>9} {coarsen_time:7.2f}s {layout_time:7.2f}s {cached_time:6.3f}s "
+              f"{png_time:6.2f}s {html_time:6.2f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
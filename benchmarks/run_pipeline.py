@@ -0,0 +1,452 @@
+"""
+run_pipeline.py
+
+End-to-end benchmark of the build-and-analyze pipeline on a synthetic corpus:
+  1. build_criticism_rdf_fixed.py   (criticism graph from data/c-*.txt)
+  2. build_novel_rdf_fixed.py       (novel graph, concepts from the criticism graph)
+  3. paper_tables.py                (analysis.py and every table generator)
+
+A corpus of --passages novel passages and --criticism-files criticism papers, mentioning
+--characters characters and --concepts concepts, is generated in a temporary folder laid out
+like the repository (data/, models/, results/). Small stand-in models keep the run fast:
+  - classifier: a randomly initialised DistilBERT (--model-dim, 2 layers) with a vocabulary
+    built from the corpus, saved to models/posthuman_finetuned and loaded by the builders'
+    own get_classifier()
+  - spaCy: a blank English pipeline with an entity_ruler for the synthetic names
+  - Sentence-BERT: hashed bag-of-words vectors (not semantic, so the criticism builder's
+    phrase-to-concept threshold is lowered to let concept mapping run)
+A glossary of --glossary-terms term files (the corpus concepts, then numbered extra terms)
+is written to data/glossary_terms/ and indexed by both builders; the concept index is
+cached inside the temporary folder.
+
+Each stage and the main functions inside it (classify_document, classify_passages,
+infer_concepts, NER, serialization, each table, ...) are timed by wrapping the module
+attributes, and the result is written as JSON together with the commit, so runs can be
+compared across commits. The repository's results/ folder is never touched.
+
+Usage:
+    python benchmarks/run_pipeline.py --passages 2000 --criticism-files 20 --output before.json
+    python benchmarks/run_pipeline.py --compare before.json after.json
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import functools
+import contextlib
+import subprocess
+from collections import defaultdict
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
+sys.path.insert(0, os.path.join(REPO_DIR, "scripts"))
+import build_novel_rdf_fixed as novel_builder  # noqa: E402
+import build_criticism_rdf_fixed as criticism_builder  # noqa: E402
+import paper_tables  # noqa: E402
+import concept_index  # noqa: E402
+from graph_snapshot import load_graph, write_snapshot  # noqa: E402
+
+DEFAULT_OUTPUT_DIR = os.path.join(BASE_DIR, "results")
+
+HUMAN_NAMES = ["Deckard", "Rachael", "Isidore", "Iran", "Bryant", "Luba Luft", "Phil Resch", "Mercer"]
+LOCATIONS = ["San Francisco", "Mars", "Seattle", "Oregon"]
+ANIMALS = ["sheep", "owl", "toad", "goat", "spider"]
+CUES = ["struggles with", "questions", "seems to represent", "doubts", "is linked to", "resists", "thinks about"]
+FILLER = ("the morning was grey and the building was quiet while the empathy box hummed in the corner "
+          "and the news spoke of the colonies where nobody wanted to stay").split()
+
+
+# =============================================================================
+# Synthetic corpus
+# =============================================================================
+def concept_names(n_concepts):
+    """The criticism builder's own concepts first, then numbered ones."""
+    names = list(criticism_builder.concepts)
+    return (names + [f"Concept {i}" for i in range(len(names), n_concepts)])[:n_concepts]
+
+
+def character_names(n_characters):
+    return (HUMAN_NAMES + [f"Character{i}" for i in range(len(HUMAN_NAMES), n_characters)])[:n_characters]
+
+
+def novel_passage(rng, characters, concepts):
+    words = rng.sample(FILLER, 8)
+    sentence = (f"{rng.choice(characters)} {rng.choice(CUES)} {rng.choice(concepts).lower()} "
+                f"near {rng.choice(LOCATIONS)} while {rng.choice(characters)} watches the {rng.choice(ANIMALS)}")
+    if rng.random() < 0.2:
+        sentence += " and wonders whether the android can feel"
+    return f"{' '.join(words[:4])} {sentence} {' '.join(words[4:])}."
+
+
+def criticism_paper(rng, concepts, n_words):
+    definitions = [c["definition"] for c in criticism_builder.concepts.values()]
+    paragraphs, size = [], 0
+    while size < n_words:
+        paragraph = (f"{rng.choice(concepts)} {rng.choice(['challenges', 'extends', 'has an influence on'])} "
+                     f"{rng.choice(concepts)}. {rng.choice(definitions)} "
+                     f"Critics such as {rng.choice(HUMAN_NAMES)} read {rng.choice(concepts)} through "
+                     f"{' '.join(rng.sample(FILLER, 10))}.")
+        paragraphs.append(paragraph)
+        size += len(paragraph.split())
+    return "\n\n".join(paragraphs)
+
+
+def write_corpus(root, args):
+    rng = random.Random(args.seed)
+    characters, concepts = character_names(args.characters), concept_names(args.concepts)
+    os.makedirs(os.path.join(root, "data"))
+    os.makedirs(os.path.join(root, "results"))
+    with open(os.path.join(root, "data", "primary_text.txt"), "w", encoding="utf-8") as f:
+        for _ in range(args.passages):
+            f.write(novel_passage(rng, characters, concepts) + "\n")
+    for i in range(args.criticism_files):
+        with open(os.path.join(root, "data", f"c-{i:03d}.txt"), "w", encoding="utf-8") as f:
+            f.write(criticism_paper(rng, concepts, args.words_per_file))
+    glossary_dir = os.path.join(root, "data", "glossary_terms")
+    os.makedirs(glossary_dir)
+    terms = (concepts + [f"Glossary Term {i}" for i in range(args.glossary_terms)])[:args.glossary_terms]
+    for i, term in enumerate(terms):
+        with open(os.path.join(glossary_dir, f"term_{i:05d}.txt"), "w", encoding="utf-8") as f:
+            f.write(glossary_term(rng, term))
+    return characters, concepts
+
+
+def glossary_term(rng, term):
+    """A term file in the data/glossary_terms/README.md format."""
+    return (f"# Term: {term}\n\n## Definition\n{term} names a way of reading "
+            f"{' '.join(rng.sample(FILLER, 10))}.\n\n## Related Concepts\n- Posthumanism\n")
+
+
+# =============================================================================
+# Stand-in models
+# =============================================================================
+class HashingEmbedder:
+    """SentenceTransformer stand-in: hashed bag-of-words vectors, deterministic per text."""
+
+    def __init__(self, dim=384):
+        self.dim = dim
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        vectors = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            for word in str(sentence).lower().split():
+                h = zlib.crc32(word.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h & 1 << 31 else -1.0
+        if normalize_embeddings:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1.0, norms)
+        return vectors
+
+
+class ChunkedDoc:
+    """spaCy Doc view with noun_chunks (a blank pipeline has no parser); concept phrases stand in."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.text = doc.text
+        self.ents = [ent for ent in doc.ents if ent.label_ != "CONCEPT"]
+        self.noun_chunks = [ent for ent in doc.ents if ent.label_ == "CONCEPT"]
+
+
+class ChunkingPipeline:
+    """Wraps a blank spaCy pipeline so the criticism builder can read doc.noun_chunks."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+
+    def __call__(self, text):
+        return ChunkedDoc(self.nlp(text))
+
+    def pipe(self, texts, as_tuples=False, **kwargs):
+        if as_tuples:
+            for doc, context in self.nlp.pipe(texts, as_tuples=True, **kwargs):
+                yield ChunkedDoc(doc), context
+        else:
+            for doc in self.nlp.pipe(texts, **kwargs):
+                yield ChunkedDoc(doc)
+
+
+def entity_pipeline(characters, concepts):
+    import spacy
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    patterns = [{"label": "PERSON", "pattern": name} for name in characters + HUMAN_NAMES]
+    patterns += [{"label": "GPE", "pattern": name} for name in LOCATIONS]
+    patterns += [{"label": "ANIMAL", "pattern": name} for name in ANIMALS]
+    patterns += [{"label": "CONCEPT", "pattern": name} for name in concepts]
+    patterns += [{"label": "CONCEPT", "pattern": name.lower()} for name in concepts]
+    ruler.add_patterns(patterns)
+    return nlp
+
+
+def save_classifier(model_dir, root, dim, seed, relevant_fraction):
+    """
+    Random DistilBERT with a corpus vocabulary, saved like the fine-tuned model. The label-1
+    bias is shifted so that about `relevant_fraction` of the passages and papers pass.
+    """
+    import torch
+    from transformers import DistilBertConfig, DistilBertForSequenceClassification, DistilBertTokenizerFast
+
+    words, texts = set(), []
+    for name in sorted(os.listdir(os.path.join(root, "data"))):
+        if not name.endswith(".txt"):
+            continue
+        with open(os.path.join(root, "data", name), encoding="utf-8") as f:
+            text = f.read()
+        words.update(word.strip(".,").lower() for word in text.split())
+        texts.extend(text.splitlines() if name == "primary_text.txt" else [text])
+    os.makedirs(model_dir)
+    vocab_path = os.path.join(model_dir, "vocab.txt")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ".", ","] + sorted(words)) + "\n")
+
+    torch.manual_seed(seed)
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_dir, do_lower_case=True, model_max_length=512)
+    config = DistilBertConfig(vocab_size=tokenizer.vocab_size, dim=dim, n_layers=2, n_heads=2,
+                              hidden_dim=dim * 4, num_labels=2)
+    model = DistilBertForSequenceClassification(config).eval()
+    margins = []
+    with torch.inference_mode():
+        for start in range(0, len(texts), 64):
+            inputs = tokenizer(texts[start:start + 64], padding=True, truncation=True, return_tensors="pt")
+            logits = model(**inputs).logits
+            margins.extend((logits[:, 1] - logits[:, 0]).tolist())
+        model.classifier.bias[1] -= float(np.quantile(margins, 1 - relevant_fraction))
+    tokenizer.save_pretrained(model_dir)
+    model.save_pretrained(model_dir)
+
+
+# =============================================================================
+# Timing
+# =============================================================================
+class StageTimer:
+    """Inclusive wall time and call counts per stage; functions are timed by wrapping module attributes."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._patches = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    def wrap(self, owner, attribute, name):
+        original = getattr(owner, attribute)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return original(*args, **kwargs)
+
+        setattr(owner, attribute, timed)
+        self._patches.append((owner, attribute, original))
+
+    def restore(self):
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches.clear()
+
+    def as_dict(self):
+        return {name: {"seconds": round(self.seconds[name], 4), "calls": self.calls[name]} for name in self.seconds}
+
+
+@contextlib.contextmanager
+def quiet(verbose):
+    if verbose:
+        yield
+    else:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def add_definitions(path, concepts):
+    """
+    The novel builder takes its concepts from ex:hasDefinition / ex:hasCriticism texts in the
+    criticism graph (the committed results/criticism_rdf_fixed.ttl has them); add one per concept.
+    """
+    graph = load_graph(path)
+    definitions = {c: v["definition"] for c, v in criticism_builder.concepts.items()}
+    for concept in concepts:
+        text = definitions.get(concept, f"A synthetic concept named {concept}.")
+        graph.add((criticism_builder.safe_uri(concept), criticism_builder.EX["hasDefinition"],
+                   criticism_builder.rdflib.Literal(text)))
+    graph.serialize(destination=path, format="turtle")
+    write_snapshot(graph, path)
+    return len(graph)
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+def run_pipeline(root, args, characters, concepts, timer):
+    counts = {}
+    nlp = entity_pipeline(characters, concepts)
+    embedder = HashingEmbedder()
+    novel_output = os.path.join(root, "results", "novel_posthumanism_rdf_fixed.ttl")
+    criticism_output = os.path.join(root, "results", "criticism_rdf_fixed.ttl")
+
+    # The builders load the saved stand-in classifier themselves; spaCy and Sentence-BERT are injected
+    criticism_builder._models.clear()
+    criticism_builder._models.update(nlp=ChunkingPipeline(nlp), embedding_model=embedder)
+    criticism_builder.CONCEPT_SIMILARITY_THRESHOLD = args.concept_threshold
+    novel_builder._models.clear()
+    novel_builder._models.update(nlp=nlp, embedding_model=embedder)
+    novel_builder.MODEL_PATH = os.path.join(root, "models", "posthuman_finetuned")
+    novel_builder.CRITICISM_RDF_PATH = criticism_output
+    concept_index.CACHE_DIR = os.path.join(root, ".cache", "concept_index")
+    glossary_dir = os.path.join(root, "data", "glossary_terms")
+
+    for name in ["get_classifier", "classify_document", "get_concept_index", "map_phrases_to_concepts",
+                 "infer_relationships", "file_triples", "write_snapshot"]:
+        timer.wrap(criticism_builder, name, f"criticism.{name}")
+    for name in ["get_classifier", "load_concept_index", "classify_passages", "infer_concepts",
+                 "extract_named_entities_batch", "write_counts", "write_snapshot"]:
+        timer.wrap(novel_builder, name, f"novel.{name}")
+    timer.wrap(novel_builder.GraphWriter, "close", "novel.serialize")
+
+    try:
+        with working_directory(root), quiet(args.verbose):
+            sys.argv = ["build_criticism_rdf_fixed.py", "--backend", args.backend, "--glossary", glossary_dir]
+            with timer.stage("criticism.total"):
+                criticism_builder.main()
+        counts["criticism_triples"] = add_definitions(criticism_output, concepts)
+
+        with quiet(args.verbose):
+            sys.argv = ["build_novel_rdf_fixed.py", "--input", os.path.join(root, "data", "primary_text.txt"),
+                        "--output", novel_output, "--full-rebuild", "--backend", args.backend,
+                        "--glossary", glossary_dir]
+            with timer.stage("novel.total"):
+                novel_builder.main()
+        counts["novel_triples"] = len(load_graph(novel_output))
+
+        # Tables read the same graph under their other file names
+        for filenames in paper_tables.GRAPH_FILES.values():
+            for filename in filenames:
+                path = os.path.join(root, "results", filename)
+                if not os.path.exists(path):
+                    shutil.copyfile(novel_output, path)
+        with quiet(args.verbose), timer.stage("tables.total"):
+            table_times = paper_tables.run_tables(list(paper_tables.TABLES), paper_tables.GraphStore(
+                os.path.join(root, "results")))
+        for name, seconds in table_times.items():
+            timer.seconds[f"tables.{name}"] += seconds
+            timer.calls[f"tables.{name}"] += 1
+    finally:
+        timer.restore()
+    return counts
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def compare(paths):
+    runs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            runs.append(json.load(f))
+    stages = sorted({name for run in runs for name in run["stages"]})
+    labels = [f"{run['commit']}{'+' if run['dirty'] else ''}" if run["commit"] else os.path.basename(path)
+              for run, path in zip(runs, paths)]
+    header = "".join(f"{label[:13]:>14}" for label in labels)
+    print(f"{'stage':<42}{header}{'ratio':>9}")
+    for name in stages:
+        seconds = [run["stages"].get(name, {}).get("seconds") for run in runs]
+        cells = "".join(f"{s:13.3f}s" if s is not None else f"{'-':>14}" for s in seconds)
+        ratio = f"{seconds[-1] / seconds[0]:8.2f}x" if None not in (seconds[0], seconds[-1]) and seconds[0] else ""
+        print(f"{name:<42}{cells}{ratio:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--passages", type=int, default=2000)
+    parser.add_argument("--characters", type=int, default=40)
+    parser.add_argument("--concepts", type=int, default=20)
+    parser.add_argument("--criticism-files", type=int, default=10)
+    parser.add_argument("--glossary-terms", type=int, default=152, help="Glossary term files to index")
+    parser.add_argument("--words-per-file", type=int, default=2000)
+    parser.add_argument("--model-dim", type=int, default=64, help="Hidden size of the stand-in DistilBERT")
+    parser.add_argument("--relevant-fraction", type=float, default=0.5,
+                        help="Share of passages/papers the stand-in classifier marks as relevant")
+    parser.add_argument("--concept-threshold", type=float, default=0.3,
+                        help="Phrase-to-concept threshold for the criticism builder with hashed embeddings")
+    parser.add_argument("--backend", choices=["fp32", "int8"], default="fp32",
+                        help="Classifier backend passed to both builders")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON result path (default: benchmarks/results/pipeline-<commit>.json)")
+    parser.add_argument("--keep", help="Copy the synthetic corpus and outputs to this folder")
+    parser.add_argument("--verbose", action="store_true", help="Show the builders' own output")
+    parser.add_argument("--compare", nargs="+", metavar="JSON", help="Compare earlier results instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+        return 0
+
+    commit, dirty = git_commit()
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory() as root:
+        with timer.stage("setup.corpus"):
+            characters, concepts = write_corpus(root, args)
+        with timer.stage("setup.classifier"), quiet(args.verbose):
+            save_classifier(os.path.join(root, "models", "posthuman_finetuned"), root, args.model_dim, args.seed,
+                            args.relevant_fraction)
+        counts = run_pipeline(root, args, characters, concepts, timer)
+        if args.keep:
+            shutil.copytree(root, args.keep, dirs_exist_ok=True)
+
+    result = {
+        "commit": commit,
+        "dirty": dirty,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "keep", "verbose", "compare")},
+        "counts": counts,
+        "stages": timer.as_dict(),
+    }
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"pipeline-{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    for name, stage in sorted(result["stages"].items()):
+        print(f"{name:<42} {stage['seconds']:9.3f}s  ({stage['calls']} calls)")
+    print(f"✅ {counts} -> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
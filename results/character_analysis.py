@@ -1,4 +1,10 @@
-from rdflib import Graph
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../scripts"))
+from triple_index import TripleIndex
+from relation_counts import to_sparse
+from character_similarity import top_k_neighbours
+from topk import top_k_per_group
 import pandas as pd
 from collections import defaultdict
 
@@ -6,15 +12,12 @@ from collections import defaultdict
 criticism_rdf_path = "criticism_rdf.ttl"
 novel_rdf_path = "novel_posthumanism_rdf.ttl"
 
-# Load RDF graphs
-criticism_graph = Graph()
-novel_graph = Graph()
+# Load RDF graphs as integer-encoded triple indexes
+criticism_index = TripleIndex.from_snapshot(criticism_rdf_path)
+novel_index = TripleIndex.from_snapshot(novel_rdf_path)
 
-criticism_graph.parse(criticism_rdf_path, format="turtle")
-novel_graph.parse(novel_rdf_path, format="turtle")
-
-print(f"Loaded {len(criticism_graph)} triples from {criticism_rdf_path}")
-print(f"Loaded {len(novel_graph)} triples from {novel_rdf_path}")
+print(f"Loaded {len(criticism_index)} triples from {criticism_rdf_path}")
+print(f"Loaded {len(novel_index)} triples from {novel_rdf_path}")
 
 # Define characters of interest
 characters = ["Deckard", "Rachael", "Isidore"]
@@ -22,21 +25,17 @@ characters = ["Deckard", "Rachael", "Isidore"]
 # Define a dictionary to store interactions
 character_analysis = defaultdict(lambda: defaultdict(int))
 
-# Iterate through RDF data and extract ALL interactions for each character
-for subj, pred, obj in novel_graph:
-    subj_str = str(subj)
-    pred_str = str(pred)
-    obj_str = str(obj)
+# Extract ALL interactions for each character: subjects are matched against the character
+# URI once per distinct term, then their triples are counted per object through the index
+for character in characters:
+    character_uri = f"http://example.org/posthuman#{character.replace(' ', '_')}"
+    subjects = novel_index.find_terms(lambda term: character_uri in str(term), position="s")
 
-    # Check if the subject is a tracked character
-    for character in characters:
-        character_uri = f"http://example.org/posthuman#{character.replace(' ', '_')}"
-        if character_uri in subj_str:
-            concept_name = obj_str.split("#")[-1].replace("_", " ")  # Extract readable concept name
-            predicate_name = pred_str.split("#")[-1]  # Extract predicate name
+    for (obj,), count in novel_index.count_by("o", s=subjects).items():
+        concept_name = str(obj).split("#")[-1].replace("_", " ")  # Extract readable concept name
 
-            # Count the interactions
-            character_analysis[character][concept_name] += 1
+        # Count the interactions
+        character_analysis[character][concept_name] += count
 
 # Convert to a structured DataFrame
 character_df = []
@@ -50,9 +49,7 @@ df_character_analysis = pd.DataFrame(character_df, columns=["Character", "Concep
 # 1️⃣ Identify Most Significant Themes Per Character
 # ----------------------------- #
 
-df_top_concepts = df_character_analysis.groupby("Character").apply(
-    lambda x: x.nlargest(3, "Mentions")
-).reset_index(drop=True)
+df_top_concepts = top_k_per_group(df_character_analysis, "Character", "Mentions", k=3)
 
 print("\n🔍 Top 3 Themes for Each Character:")
 print(df_top_concepts)
@@ -61,11 +58,13 @@ print(df_top_concepts)
 # 2️⃣ Character-Theme Overlap Analysis
 # ----------------------------- #
 
-# Create a character-theme matrix for overlap detection
-character_theme_matrix = df_character_analysis.pivot(index="Character", columns="Concept", values="Mentions").fillna(0)
+# Sparse character x theme matrix (counts of the same character-concept pair are summed)
+character_theme_matrix, character_labels, _ = to_sparse(df_character_analysis, rows="Character",
+                                                        columns="Concept", values="Mentions")
 
-# Compute thematic similarity between characters
-character_correlation = character_theme_matrix.T.corr()
+# Thematic similarity: the 10 most correlated characters per character (Pearson over themes,
+# the same values as the dense .T.corr()), in long format
+character_correlation = top_k_neighbours(character_theme_matrix, character_labels, k=10)
 
 print("\n🔗 Character-Theme Correlation:")
 print(character_correlation)
@@ -75,6 +74,6 @@ print(character_correlation)
 # ----------------------------- #
 df_character_analysis.to_csv("character_analysis.csv", index=False)
 df_top_concepts.to_csv("top_character_themes.csv", index=False)
-character_correlation.to_csv("character_correlation.csv")
+character_correlation.to_csv("character_correlation.csv", index=False)
 
 print("\n✅ Analysis complete! Results saved as CSV files.")
@@ -1,4 +1,8 @@
-from rdflib import Graph
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../scripts"))
+from triple_index import TripleIndex
+from topk import top_k_per_group
 import pandas as pd
 from collections import defaultdict
 
@@ -6,14 +10,11 @@ from collections import defaultdict
 criticism_rdf_path = "criticism_rdf.ttl"
 novel_rdf_path = "novel_posthumanism_rdf.ttl"
 
-criticism_graph = Graph()
-novel_graph = Graph()
+criticism_index = TripleIndex.from_snapshot(criticism_rdf_path)
+novel_index = TripleIndex.from_snapshot(novel_rdf_path)
 
-criticism_graph.parse(criticism_rdf_path, format="turtle")
-novel_graph.parse(novel_rdf_path, format="turtle")
-
-print(f"✅ Loaded {len(criticism_graph)} triples from {criticism_rdf_path}")
-print(f"✅ Loaded {len(novel_graph)} triples from {novel_rdf_path}")
+print(f"✅ Loaded {len(criticism_index)} triples from {criticism_rdf_path}")
+print(f"✅ Loaded {len(novel_index)} triples from {novel_rdf_path}")
 
 # ----------------------------- #
 # 1️⃣ Extract Character-Concept Interactions (Fixing Count Issues)
@@ -41,18 +42,18 @@ character_interactions = defaultdict(lambda: defaultdict(int))
 def clean_concept_uri(uri):
     return uri.replace("http://example.org/posthuman#", "").replace("_", " ")
 
-# Iterate through RDF data and count interactions
-for subj, pred, obj in novel_graph:
-    subj_str = str(subj)
-    pred_str = str(pred)
-    obj_str = clean_concept_uri(str(obj))  # Fix concept name formatting
+# Count interactions through the triple index: URI checks run once per distinct term
+for character, variants in characters_of_interest.items():
+    # Subjects that match any character variant
+    subjects = novel_index.find_terms(
+        lambda term: any(f"http://example.org/posthuman#{variant}" in str(term) for variant in variants),
+        position="s")
 
-    # Check if the subject matches any character variant
-    for character, variants in characters_of_interest.items():
-        if any(f"http://example.org/posthuman#{variant}" in subj_str for variant in variants):
-            for rel_type, rel_uri in relationship_types.items():
-                if rel_uri in pred_str:
-                    character_interactions[character][(rel_type, obj_str)] += 1
+    for rel_type, rel_uri in relationship_types.items():
+        predicates = novel_index.find_terms(lambda term: rel_uri in str(term), position="p")
+        for (obj,), count in novel_index.count_by("o", s=subjects, p=predicates).items():
+            obj_str = clean_concept_uri(str(obj))  # Fix concept name formatting
+            character_interactions[character][(rel_type, obj_str)] += count
 
 # ----------------------------- #
 # 2️⃣ Convert Data into Structured Format
@@ -71,9 +72,7 @@ df_character_interactions = pd.DataFrame(interaction_data, columns=["Character",
 # ----------------------------- #
 
 # Extract the most significant interactions per character
-df_top_interactions = df_character_interactions.groupby("Character").apply(
-    lambda x: x.nlargest(3, "Count")
-).reset_index(drop=True)
+df_top_interactions = top_k_per_group(df_character_interactions, "Character", "Count", k=3)
 
 # Print analysis summary
 print("\n🔍 Most Frequent Character-Concept Interactions:")
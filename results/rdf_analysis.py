@@ -1,4 +1,7 @@
-from rdflib import Graph
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../scripts"))
+from graph_snapshot import load_graph
 import pandas as pd
 
 # RDF file paths (Ensure the files are in the same directory)
@@ -7,11 +10,8 @@ novel_rdf_path = "/Users/sujinkkang/Dropbox/pkd_rdf_project/results/novel_posthu
 
 
 # Load RDF graphs
-criticism_graph = Graph()
-novel_graph = Graph()
-
-criticism_graph.parse(criticism_rdf_path, format="turtle")
-novel_graph.parse(novel_rdf_path, format="turtle")
+criticism_graph = load_graph(criticism_rdf_path)
+novel_graph = load_graph(novel_rdf_path)
 
 print(f"Loaded {len(criticism_graph)} triples from {criticism_rdf_path}")
 print(f"Loaded {len(novel_graph)} triples from {novel_rdf_path}")
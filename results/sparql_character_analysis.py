@@ -1,68 +1,52 @@
-from rdflib import Graph
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../scripts"))
+from triple_index import TripleIndex
+from relation_counts import count_relations, to_sparse, EX
+from character_similarity import top_k_neighbours
+from topk import top_k_per_group
 import pandas as pd
 
 # Load RDF datasets
 criticism_rdf_path = "criticism_rdf.ttl"
 novel_rdf_path = "novel_posthumanism_rdf.ttl"
 
-criticism_graph = Graph()
-novel_graph = Graph()
+criticism_index = TripleIndex.from_snapshot(criticism_rdf_path)
+novel_index = TripleIndex.from_snapshot(novel_rdf_path)
 
-criticism_graph.parse(criticism_rdf_path, format="turtle")
-novel_graph.parse(novel_rdf_path, format="turtle")
-
-print(f"✅ Loaded {len(criticism_graph)} triples from {criticism_rdf_path}")
-print(f"✅ Loaded {len(novel_graph)} triples from {novel_rdf_path}")
+print(f"✅ Loaded {len(criticism_index)} triples from {criticism_rdf_path}")
+print(f"✅ Loaded {len(novel_index)} triples from {novel_rdf_path}")
 
 # ----------------------------- #
-# 1️⃣ SPARQL Query: Extract Character-Concept Interactions
+# 1️⃣ Extract Character-Concept Interactions
 # ----------------------------- #
 
-sparql_character_query = """
-SELECT ?character ?relation ?concept (COUNT(?concept) AS ?count)
-WHERE {
-  ?character ?relation ?concept .
-  FILTER (?relation IN (
-    <http://example.org/posthuman#linkedTo>, 
-    <http://example.org/posthuman#strugglesWith>, 
-    <http://example.org/posthuman#questions>
-  ))
-}
-GROUP BY ?character ?relation ?concept
-ORDER BY ?character ?relation DESC(?count)
-"""
-
-# Execute SPARQL query on the novel RDF dataset
-query_results = novel_graph.query(sparql_character_query)
-
-# Process query results into a structured DataFrame
+# (character, relation, concept) counts for linkedTo / strugglesWith / questions, computed on
+# the triple index (same groups as GROUP BY ?character ?relation ?concept in SPARQL)
+query_results = count_relations(novel_index, ["linkedTo", "strugglesWith", "questions"])
+
+# Process results into a structured DataFrame (ORDER BY ?character ?relation DESC(?count))
 character_interactions = []
-for row in query_results:
-    character = str(row[0]).split("#")[-1]  # Extract character name
-    relation = str(row[1]).split("#")[-1]  # Extract relationship type
-    concept = str(row[2]).split("#")[-1].replace("_", " ")  # Extract concept name
-    count = int(row[3])
+for character_uri, relation_uri, concept_uri, count in sorted(
+        query_results.itertuples(index=False), key=lambda row: (str(row[0]), str(row[1]), -row[3])):
+    character = str(character_uri).split("#")[-1]  # Extract character name
+    relation = str(relation_uri).split("#")[-1]  # Extract relationship type
+    concept = str(concept_uri).split("#")[-1].replace("_", " ")  # Extract concept name
 
     character_interactions.append([character, relation, concept, count])
 
 df_character_analysis = pd.DataFrame(character_interactions, columns=["Character", "Relation", "Concept", "Count"])
 
 # ----------------------------- #
-# 2️⃣ SPARQL Query: Find Alternative Names for Cyborg Theory
+# 2️⃣ Find Alternative Names for Cyborg Theory
 # ----------------------------- #
 
-sparql_alternate_names = """
-SELECT ?concept ?relatedConcept
-WHERE {
-  ?concept <http://example.org/posthuman#relatedTo> ?relatedConcept .
-  FILTER (CONTAINS(LCASE(STR(?concept)), "cyborg_theory"))
-}
-"""
-
-query_alternate_names = novel_graph.query(sparql_alternate_names)
+# ?concept ex:relatedTo ?relatedConcept, for concepts whose URI contains "cyborg_theory"
+cyborg_concepts = novel_index.find_terms(lambda term: "cyborg_theory" in str(term).lower(), position="s")
+related = novel_index.match(s=cyborg_concepts, p=EX.relatedTo)
 
 # Extract alternate concept names
-alternate_names = {str(row[1]).split("#")[-1].replace("_", " ") for row in query_alternate_names}
+alternate_names = {str(novel_index.terms[o]).split("#")[-1].replace("_", " ") for o in related[:, 2].tolist()}
 
 print("\n🔍 Alternate Names for 'Cyborg Theory':", alternate_names)
 
@@ -70,9 +54,7 @@ print("\n🔍 Alternate Names for 'Cyborg Theory':", alternate_names)
 # 3️⃣ Identify Top Interactions for Each Character
 # ----------------------------- #
 
-df_top_concepts = df_character_analysis.groupby("Character", group_keys=False).apply(
-    lambda x: x.nlargest(3, "Count")
-).reset_index(drop=True)
+df_top_concepts = top_k_per_group(df_character_analysis, "Character", "Count", k=3)
 
 print("\n🔍 Most Frequent Character-Concept Interactions:")
 print(df_top_concepts)
@@ -81,12 +63,13 @@ print(df_top_concepts)
 # 4️⃣ Compute Character-Thematic Similarity
 # ----------------------------- #
 
-# Create a character-theme matrix for correlation analysis
-df_character_aggregated = df_character_analysis.groupby(["Character", "Concept"], as_index=False)["Count"].sum()
-character_theme_matrix = df_character_aggregated.pivot(index="Character", columns="Concept", values="Count").fillna(0)
+# Sparse character x theme matrix (counts of the same character-concept pair are summed)
+character_theme_matrix, character_labels, _ = to_sparse(df_character_analysis, rows="Character",
+                                                        columns="Concept", values="Count")
 
-# Compute thematic similarity between characters
-character_correlation = character_theme_matrix.T.corr()
+# Thematic similarity: the 10 most correlated characters per character (Pearson over themes,
+# the same values as the dense .T.corr()), in long format
+character_correlation = top_k_neighbours(character_theme_matrix, character_labels, k=10)
 
 print("\n🔗 Character-Theme Correlation:")
 print(character_correlation)
@@ -97,6 +80,6 @@ print(character_correlation)
 
 df_character_analysis.to_csv("sparql_character_analysis.csv", index=False)
 df_top_concepts.to_csv("sparql_top_character_themes.csv", index=False)
-character_correlation.to_csv("sparql_character_correlation.csv")
+character_correlation.to_csv("sparql_character_correlation.csv", index=False)
 
 print("\n✅ SPARQL Analysis Complete! Results saved as CSV files.")
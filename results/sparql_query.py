@@ -1,15 +1,18 @@
-from rdflib import Graph
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../scripts"))
+from graph_snapshot import load_graph
+from relation_counts import to_sparse
+from character_similarity import top_k_neighbours
+from topk import top_k_per_group
 import pandas as pd
 
 # 📌 Load RDF datasets
 criticism_rdf_path = "criticism_rdf.ttl"
 novel_rdf_path = "novel_posthumanism_rdf.ttl"
 
-criticism_graph = Graph()
-novel_graph = Graph()
-
-criticism_graph.parse(criticism_rdf_path, format="turtle")
-novel_graph.parse(novel_rdf_path, format="turtle")
+criticism_graph = load_graph(criticism_rdf_path)
+novel_graph = load_graph(novel_rdf_path)
 
 print(f"✅ Loaded {len(criticism_graph)} triples from {criticism_rdf_path}")
 print(f"✅ Loaded {len(novel_graph)} triples from {novel_rdf_path}")
@@ -53,9 +56,7 @@ df_character_analysis = pd.DataFrame(character_interactions, columns=["Character
 # 2️⃣ Identify Top Themes for Each Character
 # ----------------------------- #
 
-df_top_concepts = df_character_analysis.groupby("Character").apply(
-    lambda x: x.nlargest(3, "Count")
-).reset_index(drop=True)
+df_top_concepts = top_k_per_group(df_character_analysis, "Character", "Count", k=3)
 
 print("\n🔍 Top 3 Themes for Each Character:")
 print(df_top_concepts)
@@ -64,11 +65,13 @@ print(df_top_concepts)
 # 3️⃣ Compute Character Similarities (Theme Overlap)
 # ----------------------------- #
 
-# Create a character-theme matrix for correlation analysis
-character_theme_matrix = df_character_analysis.pivot(index="Character", columns="Concept", values="Count").fillna(0)
+# Sparse character x theme matrix (counts of the same character-concept pair are summed)
+character_theme_matrix, character_labels, _ = to_sparse(df_character_analysis, rows="Character",
+                                                        columns="Concept", values="Count")
 
-# Compute thematic similarity between characters
-character_correlation = character_theme_matrix.T.corr()
+# Thematic similarity: the 10 most correlated characters per character (Pearson over themes,
+# the same values as the dense .T.corr()), in long format
+character_correlation = top_k_neighbours(character_theme_matrix, character_labels, k=10)
 
 print("\n🔗 Character-Theme Correlation:")
 print(character_correlation)
@@ -79,6 +82,6 @@ print(character_correlation)
 
 df_character_analysis.to_csv("sparql_character_analysis.csv", index=False)
 df_top_concepts.to_csv("sparql_top_character_themes.csv", index=False)
-character_correlation.to_csv("sparql_character_correlation.csv")
+character_correlation.to_csv("sparql_character_correlation.csv", index=False)
 
 print("\n✅ SPARQL Analysis Complete! Results saved as CSV files.")
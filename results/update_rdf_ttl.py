@@ -3,6 +3,14 @@ update_rdf_ttl.py
 
 This script loads two RDF/Turtle files, counts occurrences of each (subject, predicate, object) triple,
 and updates the files by adding an 'ex:occurrenceCount' property for each relationship.
+Counts are attached to each edge, not to the subject: a subject-level count cannot say which
+of its edges it belongs to, and joining it back onto the edges multiplied the rows of Table 5.
+By default they go to a updated_*.ttl.counts.tsv side table keyed by triple ID (see
+scripts/edge_counts.py); --mode reify adds an RDF reification node per edge instead.
+
+build_novel_rdf_fixed.py now writes the side table for its own output while it processes the
+passages, with real multiplicities (this script can only count each triple of a graph once),
+so Table 5 no longer needs this step; it remains for graphs built by other means.
 
 Installation:
     pip install rdflib
@@ -10,10 +18,17 @@ Installation:
 Usage:
     Run this script in VS Code terminal:
     python update_rdf_ttl.py
+    python update_rdf_ttl.py --mode reify
 """
 
-from rdflib import Graph, Namespace, Literal
+import argparse
+from rdflib import Graph, Namespace, Literal, RDF, BNode
 from collections import defaultdict
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../scripts"))
+from graph_snapshot import load_graph, write_snapshot
+from edge_counts import write_counts
 
 # 📂 File paths (Modify if needed)
 base_path = "/Users/sujinkkang/Dropbox/pkd_rdf_project/results/"
@@ -27,7 +42,7 @@ updated_criticism_ttl_path = base_path + "updated_criticism_rdf.ttl"
 # Define the namespace for 'ex:occurrenceCount'
 ex = Namespace("http://example.org/posthuman#")
 
-def process_ttl_file(input_path, output_path):
+def process_ttl_file(input_path, output_path, mode="side-table"):
     """
     Reads an RDF Turtle file, counts occurrences of each (subject, predicate, object) triple,
     and writes a new Turtle file with 'ex:occurrenceCount' added.
@@ -35,8 +50,7 @@ def process_ttl_file(input_path, output_path):
     print(f"📂 Processing: {input_path}")
 
     # 1️⃣ Load the RDF file
-    g = Graph()
-    g.parse(input_path, format="turtle")
+    g = load_graph(input_path)
 
     # 2️⃣ Count occurrences of each (subject, predicate, object) triple
     triple_counts = defaultdict(int)
@@ -47,17 +61,37 @@ def process_ttl_file(input_path, output_path):
     new_g = Graph()
     new_g += g  # Keep existing triples
 
-    # 4️⃣ Add 'ex:occurrenceCount' property for each triple
-    for (s, p, o), count in triple_counts.items():
-        new_g.add((s, ex.occurrenceCount, Literal(count)))
+    # 4️⃣ Add 'ex:occurrenceCount' property for each triple (one reified statement per edge)
+    if mode == "reify":
+        for (s, p, o), count in triple_counts.items():
+            statement = BNode()
+            new_g.add((statement, RDF.subject, s))
+            new_g.add((statement, RDF.predicate, p))
+            new_g.add((statement, RDF.object, o))
+            new_g.add((statement, ex.occurrenceCount, Literal(count)))
 
     # 5️⃣ Save the updated RDF file
     new_g.serialize(destination=output_path, format="turtle")
+    write_snapshot(new_g, output_path)
+    if mode == "side-table":
+        print(f"✅ Occurrence counts saved: {write_counts(triple_counts, output_path)}")
 
     print(f"✅ Updated RDF file saved: {output_path}\n")
 
-# 📌 Process both RDF files and update them
-process_ttl_file(novel_ttl_path, updated_novel_ttl_path)
-process_ttl_file(criticism_ttl_path, updated_criticism_ttl_path)
+parser = argparse.ArgumentParser(description="Add per-edge occurrence counts to the RDF files")
+parser.add_argument("--mode", choices=["side-table", "reify"], default="side-table",
+                    help="Store counts in a .counts.tsv side table (default) or as RDF reification")
+args = parser.parse_args()
 
-print("🎉 All RDF files have been updated with ex:occurrenceCount!")
+# 📌 Process both RDF files and update them
+process_ttl_file(novel_ttl_path, updated_novel_ttl_path, args.mode)
+process_ttl_file(criticism_ttl_path, updated_criticism_ttl_path, args.mode)
+
+if args.mode == "reify":
+    print("🎉 All RDF files have been updated with ex:occurrenceCount!")
+else:
+    print("🎉 All RDF files have been updated with .counts.tsv side tables!")
+    # A parsed graph holds each triple once, so every edge written here has count 1
+    print("ℹ These side tables can only record a count of 1 per edge. For real occurrence counts use the "
+          ".counts.tsv that build_novel_rdf_fixed.py writes next to its output "
+          "(results/novel_posthumanism_rdf_fixed.ttl.counts.tsv).")
@@ -1,35 +1,100 @@
 import os
-import re
+import time
+import argparse
 import rdflib
-import torch
-import spacy
-import nltk
+import numpy as np
 from urllib.parse import quote
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
-from sentence_transformers import SentenceTransformer, util
-from collections import defaultdict
-from nltk.corpus import wordnet
-from rapidfuzz import fuzz
-from rdflib.namespace import RDFS
+from concurrent.futures import ProcessPoolExecutor
+from embedding_cache import EmbeddingCache
+from classifier_backend import load_classifier_model, ensure_quantized, quantized_path_for, BACKENDS
+from graph_snapshot import write_snapshot
+from concept_matcher import encode_normalized
+from concept_index import ConceptIndex, load_glossary
+from passage_classifier import (classify_windows, aggregate_windows, relevant_spans, is_relevant_window,
+                                AGGREGATIONS, DEFAULT_STRIDE)
 
 ########################################################
-# ✅ 1) Load Models & Initialize RDF Graph
+# ✅ 1) Configuration, Models & RDF Namespace
 ########################################################
 
-print("Loading AI models...")
 MODEL_PATH = "models/posthuman_finetuned"
-tokenizer = DistilBertTokenizer.from_pretrained(MODEL_PATH)
-model = DistilBertForSequenceClassification.from_pretrained(MODEL_PATH)
-model.eval()
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+CONCEPT_SIMILARITY_THRESHOLD = 0.75
+RELATIONSHIP_SIMILARITY_THRESHOLD = 0.8
+CRITICISM_DIR = "data"
+RDF_OUTPUT_PATH = "results/criticism_rdf_fixed.ttl"
+GLOSSARY_PATHS = ["data/glossary_terms"]
+SPACY_BATCH_SIZE = 4  # whole documents per nlp.pipe batch
+WINDOW_BATCH_SIZE = 16  # 512-token windows per classifier batch
+# noun_chunks need the parser and tagger (via tok2vec/attribute_ruler); lemmas are never used
+SPACY_EXCLUDED_PIPES = ["lemmatizer", "senter"]
 
-nlp = spacy.load("en_core_web_sm")
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
-print("✅ Models loaded.")
-
-# ✅ RDF Graph
-g = rdflib.Graph()
 EX = rdflib.Namespace("http://example.org/posthuman#")
 
+# Model handles are per process and created lazily on first use through the get_*()
+# accessors, so --dry-run never imports torch, spaCy or transformers and every pool
+# worker loads each model at most once.
+_models = {}
+embedding_cache = None
+classifier_backend = "fp32"
+glossary_paths = GLOSSARY_PATHS
+# Long papers are classified in overlapping 512-token windows (see classify_document)
+window_aggregation = "any"
+window_stride = DEFAULT_STRIDE
+extract_full_text = False
+
+def worker_settings():
+    """The command-line settings a pool worker needs, passed to init_worker."""
+    return {"classifier_backend": classifier_backend, "glossary_paths": glossary_paths,
+            "window_aggregation": window_aggregation, "window_stride": window_stride,
+            "extract_full_text": extract_full_text}
+
+def init_worker(torch_threads=None, settings=None):
+    """Pool initializer: apply the parent's settings and share the CPU between workers instead of oversubscribing it."""
+    globals().update(settings or {})
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+
+def get_classifier():
+    """(tokenizer, model) for the fine-tuned DistilBERT classifier on the selected backend."""
+    if "classifier" not in _models:
+        from transformers import AutoTokenizer
+        print(f"Loading DistilBERT classifier ({classifier_backend}, pid {os.getpid()})...")
+        # Fast (Rust) tokenizer: windowing needs overflowing tokens with character offsets
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, use_fast=True)
+        model = load_classifier_model(MODEL_PATH, classifier_backend)
+        _models["classifier"] = (tokenizer, model)
+    return _models["classifier"]
+
+def get_nlp():
+    """spaCy pipeline with NER and the parser needed for noun chunks."""
+    if "nlp" not in _models:
+        import spacy
+        print(f"Loading spaCy pipeline (pid {os.getpid()})...")
+        nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDED_PIPES)
+        nlp.max_length = max(nlp.max_length, 5_000_000)  # whole papers are parsed as one document
+        _models["nlp"] = nlp
+    return _models["nlp"]
+
+def get_embedding_model():
+    """Sentence-BERT served from the shared on-disk cache; only unseen strings hit the model."""
+    global embedding_cache
+    if "embedding_model" not in _models:
+        from sentence_transformers import SentenceTransformer
+        print(f"Loading Sentence-BERT model (pid {os.getpid()})...")
+        embedding_cache = EmbeddingCache(EMBEDDING_MODEL_NAME)
+        _models["embedding_model"] = embedding_cache.wrap(SentenceTransformer(EMBEDDING_MODEL_NAME))
+    return _models["embedding_model"]
+
+def get_concept_index():
+    """ConceptIndex over every concept definition, loaded from .cache/concept_index/ or built once."""
+    if "concept_index" not in _models:
+        definitions = concept_definitions()
+        _models["concept_index"] = ConceptIndex.build(get_embedding_model(), list(definitions),
+                                                      list(definitions.values()), EMBEDDING_MODEL_NAME)
+    return _models["concept_index"]
+
 ########################################################
 # ✅ 2) Define Posthumanist Concepts (Fix for Missing `concepts`)
 ########################################################
@@ -68,84 +133,293 @@ def safe_uri(text):
     text = "".join(c for c in text if c.isalnum() or c == "_")
     return rdflib.URIRef(EX + quote(text))
 
-def predict_text(text):
-    """Use DistilBERT to predict if a text is posthumanism-related."""
-    inputs = tokenizer(text, return_tensors="pt", padding="max_length", truncation=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    logits = outputs.logits
-    return torch.argmax(logits, dim=1).item() == 1
+def classify_document(text):
+    """
+    Classify a whole paper instead of its first 512 tokens: the text is split into overlapping
+    windows (`window_stride` tokens shared by neighbours) that are classified in batches, and the
+    window decisions are combined with `window_aggregation` (any, mean or majority).
+    Returns (is_relevant, windows, spans), spans being the merged character ranges of the relevant windows.
+    """
+    tokenizer, model = get_classifier()
+    windows = classify_windows([text], tokenizer, model, stride=window_stride, batch_size=WINDOW_BATCH_SIZE)[0]
+    return aggregate_windows(windows, window_aggregation), windows, relevant_spans(windows)
+
+def relevant_excerpt(text, spans):
+    """The text concepts are extracted from: the relevant spans (one paragraph each), or all of it with --full-text."""
+    if extract_full_text:
+        return text
+    return "\n\n".join(text[start:end] for start, end in spans)
+
+def concept_definitions():
+    """
+    {concept: definition} for the built-in concepts above plus every glossary term.
+    A glossary definition replaces the built-in one; a term without a definition is matched by its name.
+    """
+    definitions = {name: entry["definition"] for name, entry in concepts.items()}
+    for term, definition in load_glossary(glossary_paths).items():
+        if definition or term not in definitions:
+            definitions[term] = definition or term
+    return definitions
+
+def map_phrases_to_concepts(phrases):
+    """
+    Map candidate phrases to the closest concept definition.
+    Phrases are deduplicated and looked up in the concept index in batches.
+    """
+    phrases = sorted(set(phrases))
+    matches = get_concept_index().search(get_embedding_model(), phrases, k=1)
+    return [best[0][0] for best in matches if best and best[0][1] > CONCEPT_SIMILARITY_THRESHOLD]
+
+def relationship_cue(text):
+    """Choose the fallback relationship from keyword cues in the text (evaluated once per text)."""
+    if "criticize" in text or "challenge" in text:
+        return "criticizes"
+    elif "influence" in text or "impact" in text:
+        return "hasInfluenceOn"
+    elif "extend" in text or "expand" in text:
+        return "extends"
+    return "relatedTo"  # Default
 
 def infer_relationships(concept_uris, text):
-    """Use AI embeddings to determine relationships between concepts."""
+    """
+    Use AI embeddings to determine relationships between concepts.
+    Every unique concept URI is encoded once and all pairwise similarities come from one matrix.
+    A pair (c1, c2) is produced when c1 occurs before c2 somewhere in `concept_uris`, which yields
+    the same triples as scanning all index pairs i < j without the quadratic blow-up from repeats.
+    """
+    if len(concept_uris) < 2:
+        return []
+
+    unique_uris = list(dict.fromkeys(concept_uris))
+    first_seen = np.array([concept_uris.index(uri) for uri in unique_uris])
+    last_seen = np.array([len(concept_uris) - 1 - concept_uris[::-1].index(uri) for uri in unique_uris])
+    ordered_pairs = np.argwhere(first_seen[:, None] < last_seen[None, :])
+
+    concept_matrix = encode_normalized(get_embedding_model(), [str(uri) for uri in unique_uris])
+    similarity = concept_matrix @ concept_matrix.T
+
+    fallback = EX[relationship_cue(text)]
     relationships = []
-    text_embedding = embedding_model.encode(text)
-    
-    concept_pairs = [(concept_uris[i], concept_uris[j]) for i in range(len(concept_uris)) for j in range(i+1, len(concept_uris))]
-
-    for c1, c2 in concept_pairs:
-        c1_emb = embedding_model.encode(str(c1))
-        c2_emb = embedding_model.encode(str(c2))
-        similarity_score = util.pytorch_cos_sim(c1_emb, c2_emb).item()
-
-        if similarity_score > 0.8:
-            relationships.append((c1, EX["relatedTo"], c2))
-        elif "criticize" in text or "challenge" in text:
-            relationships.append((c1, EX["criticizes"], c2))
-        elif "influence" in text or "impact" in text:
-            relationships.append((c1, EX["hasInfluenceOn"], c2))
-        elif "extend" in text or "expand" in text:
-            relationships.append((c1, EX["extends"], c2))
-        else:
-            relationships.append((c1, EX["relatedTo"], c2))  # Default
-        
+    for a, b in ordered_pairs:
+        predicate = EX["relatedTo"] if similarity[a, b] > RELATIONSHIP_SIMILARITY_THRESHOLD else fallback
+        relationships.append((unique_uris[a], predicate, unique_uris[b]))
     return relationships
 
-########################################################
-# ✅ 4) Process Criticism Texts
-########################################################
+def file_triples(filename, text, doc):
+    """
+    Build the triples for one relevant criticism file from its parsed spaCy document.
+    `doc` may cover only the relevant windows (see relevant_excerpt); `text` is the whole
+    paper, so relationship cues are detected anywhere in it.
+    Triples are returned in a deterministic order so that serial and parallel builds
+    insert them into the graph identically.
+    """
+    # ✅ Extract candidate concepts
+    candidate_phrases = set(ent.text for ent in doc.ents) | set(chunk.text for chunk in doc.noun_chunks)
 
-criticism_dir = "data"
-criticism_files = [f for f in os.listdir(criticism_dir) if f.startswith("c-") and f.endswith(".txt")]
+    # ✅ Map concepts using AI embeddings (definitions embedded once, phrases batched)
+    mapped_concepts = map_phrases_to_concepts(candidate_phrases)
+
+    # ✅ Collect relationships for the RDF graph
+    triples = []
+    concept_uris = [safe_uri(c) for c in mapped_concepts]
+    for c_uri in concept_uris:
+        triples.append((c_uri, EX["isMentionedIn"], safe_uri(filename.replace(".txt", ""))))
+    triples.extend(infer_relationships(concept_uris, text))
+    return triples, len(mapped_concepts), len(candidate_phrases)
 
-print("Processing criticism files...")
-for filename in criticism_files:
-    file_path = os.path.join(criticism_dir, filename)
+def read_file(filename):
+    file_path = os.path.join(CRITICISM_DIR, filename)
     with open(file_path, "r", encoding="utf-8") as f:
-        text = f.read()
+        return f.read()
+
+def skipped_message(filename, windows, started):
+    return (f"⏭ Skipped {filename} (not posthumanism-related, {len(windows)} windows, "
+            f"{time.perf_counter() - started:.2f}s).")
+
+def processed_message(filename, windows, n_concepts, n_phrases, started):
+    n_relevant = sum(map(is_relevant_window, windows))
+    return (f"✅ Processed {filename}, extracted {n_concepts} concepts from {n_phrases} phrases "
+            f"in {n_relevant}/{len(windows)} relevant windows, {time.perf_counter() - started:.2f}s.")
+
+def process_file(filename):
+    """Build the triples for a single criticism file. Returns (triples, log message)."""
+    started = time.perf_counter()
+    text = read_file(filename)
 
     # ✅ Check if text is relevant using AI
-    if not predict_text(text):
-        continue  
+    is_relevant, windows, spans = classify_document(text)
+    if not is_relevant:
+        return [], skipped_message(filename, windows, started)
 
-    # ✅ Extract candidate concepts
-    doc = nlp(text)
-    candidate_phrases = set(ent.text for ent in doc.ents) | set(chunk.text for chunk in doc.noun_chunks)
+    excerpt = relevant_excerpt(text, spans)
+    triples, n_concepts, n_phrases = file_triples(filename, text, get_nlp()(excerpt))
+    return triples, processed_message(filename, windows, n_concepts, n_phrases, started)
 
-    # ✅ Map concepts using AI embeddings
-    mapped_concepts = []
-    for phrase in candidate_phrases:
-        phrase_emb = embedding_model.encode(phrase)
-        best_match = max(concepts.keys(), key=lambda c: util.pytorch_cos_sim(phrase_emb, embedding_model.encode(concepts[c]["definition"])).item())
+def process_files(filenames, spacy_batch_size=SPACY_BATCH_SIZE, spacy_processes=1):
+    """
+    Serial build path: the relevant parts of relevant documents are streamed through nlp.pipe
+    (optionally with several spaCy processes) instead of calling nlp() per file.
+    Returns a list of (triples, log message) in `filenames` order.
+    """
+    results = {}
 
-        if util.pytorch_cos_sim(phrase_emb, embedding_model.encode(concepts[best_match]["definition"])).item() > 0.75:
-            mapped_concepts.append(best_match)
+    def relevant_texts():
+        for filename in filenames:
+            started = time.perf_counter()
+            text = read_file(filename)
+            # ✅ Check if text is relevant using AI
+            is_relevant, windows, spans = classify_document(text)
+            if is_relevant:
+                yield relevant_excerpt(text, spans), (filename, text, windows, started)
+            else:
+                results[filename] = ([], skipped_message(filename, windows, started))
 
-    # ✅ Add relationships to RDF
-    concept_uris = [safe_uri(c) for c in mapped_concepts]
-    for c_uri in concept_uris:
-        g.add((c_uri, EX["isMentionedIn"], safe_uri(filename.replace(".txt", ""))))
+    docs = get_nlp().pipe(relevant_texts(), as_tuples=True, batch_size=spacy_batch_size, n_process=spacy_processes)
+    for doc, (filename, text, windows, started) in docs:
+        triples, n_concepts, n_phrases = file_triples(filename, text, doc)
+        results[filename] = (triples, processed_message(filename, windows, n_concepts, n_phrases, started))
+    return [results[filename] for filename in filenames]
+
+def cache_stats():
+    """(hits, misses) of this process's embedding cache so far."""
+    return (embedding_cache.hits, embedding_cache.misses) if embedding_cache is not None else (0, 0)
 
-    relationships = infer_relationships(concept_uris, text)
-    for (subj, pred, obj) in relationships:
-        g.add((subj, pred, obj))
+def process_file_in_worker(filename):
+    """
+    Pool entry point: process one file and persist newly computed embeddings.
+    Returns (triples, log message, (cache hits, cache misses) for this file).
+    """
+    hits, misses = cache_stats()
+    triples, message = process_file(filename)
+    if embedding_cache is not None:
+        embedding_cache.save()
+    new_hits, new_misses = cache_stats()
+    return triples, message, (new_hits - hits, new_misses - misses)
 
-    print(f"✅ Processed {filename}, extracted {len(mapped_concepts)} concepts.")
+def merged_cache_summary(stats):
+    """Summary of the shared on-disk cache with the hits and misses of every worker added up."""
+    merged = EmbeddingCache(EMBEDDING_MODEL_NAME)
+    merged.hits = sum(hits for hits, _ in stats)
+    merged.misses = sum(misses for _, misses in stats)
+    return merged.summary()
 
 ########################################################
-# ✅ 5) Serialize RDF
+# ✅ 4) Process Criticism Texts
 ########################################################
 
-rdf_output_path = "results/criticism_rdf_fixed.ttl"
-g.serialize(destination=rdf_output_path, format="turtle")
-print(f"✅ Fixed RDF stored at {rdf_output_path}")
+def list_criticism_files(criticism_dir=CRITICISM_DIR):
+    """All c-*.txt files in a stable (sorted) order."""
+    return sorted(f for f in os.listdir(criticism_dir) if f.startswith("c-") and f.endswith(".txt"))
+
+def build_graph(criticism_files, workers=1, spacy_batch_size=SPACY_BATCH_SIZE, spacy_processes=1):
+    """
+    Process criticism files serially or in a process pool and merge the per-file triples
+    into one graph in file order, so the Turtle output does not depend on `workers`.
+    """
+    if workers > 1:
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        if classifier_backend == "int8":
+            ensure_quantized(MODEL_PATH)  # quantize once here rather than in every worker
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(torch_threads, worker_settings())) as pool:
+            worker_results = list(pool.map(process_file_in_worker, criticism_files))
+        results = [(triples, message) for triples, message, _ in worker_results]
+        print(f"✅ {merged_cache_summary([stats for _, _, stats in worker_results])} ({workers} workers)")
+    else:
+        results = process_files(criticism_files, spacy_batch_size=spacy_batch_size,
+                                spacy_processes=spacy_processes)
+        if embedding_cache is not None:
+            embedding_cache.save()
+            print(f"✅ {embedding_cache.summary()}")
+
+    g = rdflib.Graph()
+    for triples, message in results:
+        print(message)
+        for triple in triples:
+            g.add(triple)
+    return g
+
+def validate_inputs(backend="fp32"):
+    """Check the criticism corpus, classifier model and output location without loading models."""
+    ok = True
+    if os.path.isdir(CRITICISM_DIR):
+        criticism_files = list_criticism_files()
+        total_bytes = sum(os.path.getsize(os.path.join(CRITICISM_DIR, f)) for f in criticism_files)
+        print(f"{'✅' if criticism_files else '❌'} {len(criticism_files)} criticism files "
+              f"({total_bytes / 1024:.0f} KB) in {CRITICISM_DIR}/")
+        ok = ok and bool(criticism_files)
+    else:
+        print(f"❌ Criticism directory does not exist: {CRITICISM_DIR}")
+        ok = False
+
+    n_terms = len(load_glossary(glossary_paths))
+    print(f"{'✅' if n_terms else 'ℹ'} Glossary: {n_terms} terms in {', '.join(glossary_paths)} "
+          f"(plus {len(concepts)} built-in concepts)")
+
+    if os.path.exists(os.path.join(MODEL_PATH, "config.json")):
+        print(f"✅ Classifier model: {MODEL_PATH}")
+    else:
+        print(f"❌ Classifier model is missing config.json: {MODEL_PATH}")
+        ok = False
+    if backend == "int8":
+        quantized_path = quantized_path_for(MODEL_PATH)
+        state = "found" if os.path.exists(quantized_path) else "will be created"
+        print(f"ℹ int8 classifier cache {state}: {quantized_path}")
+
+    output_dir = os.path.dirname(os.path.abspath(RDF_OUTPUT_PATH))
+    if os.access(output_dir, os.W_OK):
+        print(f"✅ Output directory is writable: {output_dir}")
+    else:
+        print(f"❌ Output directory is not writable: {output_dir}")
+        ok = False
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the criticism RDF graph from data/c-*.txt files.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes; each loads the models once (default: %(default)s)")
+    parser.add_argument("--spacy-batch-size", type=int, default=SPACY_BATCH_SIZE,
+                        help="Documents per nlp.pipe batch in serial mode (default: %(default)s)")
+    parser.add_argument("--spacy-processes", type=int, default=1,
+                        help="nlp.pipe worker processes in serial mode (default: %(default)s)")
+    parser.add_argument("--glossary", nargs="+", default=GLOSSARY_PATHS,
+                        help="Glossary term folders or files added to the built-in concepts (default: data/glossary_terms)")
+    parser.add_argument("--backend", choices=BACKENDS, default="fp32",
+                        help="Classifier inference backend; int8 is dynamically quantized (default: %(default)s)")
+    parser.add_argument("--aggregation", choices=AGGREGATIONS, default="any",
+                        help="How window decisions make a document decision: any relevant window, mean "
+                             "probability, or a majority of windows (default: %(default)s)")
+    parser.add_argument("--window-stride", type=int, default=DEFAULT_STRIDE,
+                        help="Tokens shared by neighbouring 512-token windows (default: %(default)s)")
+    parser.add_argument("--full-text", action="store_true",
+                        help="Extract concepts from the whole relevant document, not only its relevant windows")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Validate inputs without loading any model")
+    args = parser.parse_args()
+    if not 0 <= args.window_stride <= 256:
+        parser.error("--window-stride must be between 0 and 256 tokens")
+
+    global classifier_backend, glossary_paths, window_aggregation, window_stride, extract_full_text
+    classifier_backend = args.backend
+    glossary_paths = args.glossary
+    window_aggregation = args.aggregation
+    window_stride = args.window_stride
+    extract_full_text = args.full_text
+
+    if args.dry_run:
+        exit(0 if validate_inputs(args.backend) else 1)
+
+    criticism_files = list_criticism_files()
+    print(f"Processing {len(criticism_files)} criticism files with {args.workers} worker(s)...")
+    g = build_graph(criticism_files, workers=args.workers, spacy_batch_size=args.spacy_batch_size,
+                    spacy_processes=args.spacy_processes)
+
+    ########################################################
+    # ✅ 5) Serialize RDF
+    ########################################################
+    g.serialize(destination=RDF_OUTPUT_PATH, format="turtle")
+    write_snapshot(g, RDF_OUTPUT_PATH)
+    print(f"✅ Fixed RDF stored at {RDF_OUTPUT_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+build_manifest.py
+
+Build manifest for incremental RDF builds.
+
+The manifest is a JSON Lines file written next to the RDF output. The first line records
+the inputs that affect every passage (model fingerprint, criticism graph hash, builder
+settings); each following line records one passage:
+
+    {"i": 42, "hash": "<sha1 of the passage text>", "relevant": true, "triples": [["<s>", "<p>", "<o>"], ...]}
+
+On the next build a passage whose index and hash match, under identical global inputs,
+reuses its recorded triples instead of being classified and annotated again. Entries are
+written in passage order, so the previous manifest is read as a stream alongside the text
+and memory stays flat.
+
+Usage:
+    previous = ManifestReader(path, inputs)
+    current = ManifestWriter(path, inputs)
+    entry = previous.get(i, text)        # None when the passage must be recomputed
+    current.record(i, text, relevant, triples)
+    current.close()
+"""
+
+import os
+import json
+import hashlib
+
+from rdflib.util import from_n3
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path):
+    """Content hash of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def directory_fingerprint(path):
+    """Cheap fingerprint of a model directory from file names, sizes and modification times."""
+    if not os.path.isdir(path):
+        return None
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(path)):
+        for name in sorted(files):
+            stat = os.stat(os.path.join(root, name))
+            digest.update(f"{os.path.relpath(os.path.join(root, name), path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def passage_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def manifest_path_for(output_path):
+    return os.path.splitext(output_path)[0] + ".manifest.jsonl"
+
+
+class ManifestReader:
+    """Streams the previous manifest; only usable when its global inputs match the current build."""
+
+    def __init__(self, path, inputs):
+        self.valid = False
+        self._file = None
+        self._next = None
+        if not os.path.exists(path):
+            return
+        self._file = open(path, "r", encoding="utf-8")
+        header = json.loads(self._file.readline() or "{}")
+        if header.get("version") == MANIFEST_VERSION and header.get("inputs") == inputs:
+            self.valid = True
+            self._advance()
+        else:
+            self.close()
+
+    def _advance(self):
+        line = self._file.readline()
+        self._next = json.loads(line) if line else None
+
+    def get(self, i, text):
+        """Recorded entry for passage `i` if its text is unchanged, else None. Indices must be increasing."""
+        if not self.valid:
+            return None
+        while self._next is not None and self._next["i"] < i:
+            self._advance()
+        entry = self._next
+        if entry is not None and entry["i"] == i and entry["hash"] == passage_hash(text):
+            return entry
+        return None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ManifestWriter:
+    """Writes the new manifest to a temporary file and moves it into place on close()."""
+
+    def __init__(self, path, inputs):
+        self.path = path
+        self._tmp_path = path + ".tmp"
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._file.write(json.dumps({"version": MANIFEST_VERSION, "inputs": inputs}) + "\n")
+
+    def record(self, i, text, relevant, triples):
+        entry = {
+            "i": i,
+            "hash": passage_hash(text),
+            "relevant": bool(relevant),
+            "triples": [[term.n3() for term in triple] for triple in triples],
+        }
+        self._file.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+
+def entry_triples(entry):
+    """Rebuild rdflib triples from a manifest entry."""
+    return [tuple(from_n3(term) for term in triple) for triple in entry["triples"]]
@@ -1,12 +1,18 @@
 import os
+import argparse
+import hashlib
 import rdflib
-import spacy
-import torch
+from itertools import islice
 from urllib.parse import quote
-from sentence_transformers import SentenceTransformer, util
-from collections import defaultdict
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from safetensors.torch import load_file  
+from collections import defaultdict, Counter
+from passage_classifier import classify_passages, DEFAULT_BATCH_SIZE
+from classifier_backend import load_classifier_model, quantized_path_for, BACKENDS
+from concept_index import ConceptIndex, load_glossary, glossary_fingerprint
+from embedding_cache import EmbeddingCache
+from graph_snapshot import write_snapshot
+from edge_counts import write_counts, triple_id
+from build_manifest import (ManifestReader, ManifestWriter, entry_triples, manifest_path_for,
+                            file_sha256, directory_fingerprint)
 
 # =============================================================================
 # 1) Define Relative Paths Using os.path.join()
@@ -17,47 +23,74 @@ MODEL_PATH = os.path.join(BASE_DIR, "../models/posthuman_finetuned")
 RDF_OUTPUT_PATH = os.path.join(BASE_DIR, "../results/novel_posthumanism_rdf_fixed.ttl")
 CRITICISM_RDF_PATH = os.path.join(BASE_DIR, "../results/criticism_rdf_fixed.ttl")
 NOVEL_TEXT_PATH = os.path.join(BASE_DIR, "../data/primary_text.txt")
+GLOSSARY_PATHS = [os.path.join(BASE_DIR, "../data/glossary_terms")]
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+DEFAULT_CHUNK_SIZE = 1024  # passages held in memory at once
+SPACY_BATCH_SIZE = 256
+# Only NER is used here; en_core_web_sm's ner component has its own tok2vec layer,
+# so the shared tok2vec, tagger, parser, attribute_ruler and lemmatizer are never loaded.
+SPACY_EXCLUDED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
 
 # =============================================================================
-# 2) Initialize RDF Graph and Namespace
+# 2) Initialize RDF Namespace
 # =============================================================================
-g = rdflib.Graph()
 EX = rdflib.Namespace("http://example.org/posthuman#")
 
+# Model handles are created lazily on first use (see the get_*() accessors below), so
+# --dry-run and fully incremental rebuilds never import torch, spaCy or transformers.
+_models = {}
+use_embedding_cache = True
+classifier_backend = "fp32"
+glossary_paths = GLOSSARY_PATHS
+embedding_cache = None
+
 # =============================================================================
-# 3) Load NLP and AI Models
+# 3) Lazily Loaded NLP and AI Models
 # =============================================================================
-print("Loading models...")
-nlp = spacy.load("en_core_web_sm")
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+def get_nlp():
+    """spaCy pipeline with only the NER component."""
+    if "nlp" not in _models:
+        import spacy
+        print("Loading spaCy NER pipeline...")
+        _models["nlp"] = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDED_PIPES)
+    return _models["nlp"]
+
+def get_embedding_model():
+    """Sentence-BERT model, wrapped by the on-disk embedding cache unless disabled."""
+    global embedding_cache
+    if "embedding_model" not in _models:
+        from sentence_transformers import SentenceTransformer
+        print("Loading Sentence-BERT model...")
+        embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        if use_embedding_cache:
+            embedding_cache = EmbeddingCache(EMBEDDING_MODEL_NAME)
+            embedding_model = embedding_cache.wrap(embedding_model)
+        _models["embedding_model"] = embedding_model
+    return _models["embedding_model"]
 
-tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, local_files_only=True)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH, local_files_only=True)
+def get_classifier():
+    """
+    (tokenizer, model) for the fine-tuned DistilBERT classifier on the selected backend.
+    from_pretrained() already reads model.safetensors, so the weights are loaded exactly once.
+    """
+    if "classifier" not in _models:
+        from transformers import AutoTokenizer
+        print(f"Loading DistilBERT classifier ({classifier_backend})...")
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, local_files_only=True)
+        model = load_classifier_model(MODEL_PATH, classifier_backend, local_files_only=True)
+        _models["classifier"] = (tokenizer, model)
+    return _models["classifier"]
 
-# If a safetensors file exists, load it explicitly
-safetensors_path = os.path.join(MODEL_PATH, "model.safetensors")
-if os.path.exists(safetensors_path):
-    weights = load_file(safetensors_path)
-    model.load_state_dict(weights)
-model.eval()
-print("✅ Models loaded successfully.")
+def get_concept_index():
+    """ConceptIndex over the glossary terms and the criticism RDF concepts, loaded or built on first use."""
+    if "concept_index" not in _models:
+        _models["concept_index"] = load_concept_index()
+    return _models["concept_index"]
 
 # =============================================================================
 # 4) Load and Debug Criticism RDF
 # =============================================================================
-criticism_graph = rdflib.Graph()
-criticism_graph.parse(CRITICISM_RDF_PATH, format="turtle")
-print(f"✅ Loaded {len(criticism_graph)} triples from Criticism RDF.")
-
-# Debug: Print first 10 triples from the criticism RDF
-print("\n🔍 Sample Criticism RDF Triples:")
-for i, (s, p, o) in enumerate(criticism_graph):
-    print(s, p, o)
-    if i >= 9:  # Show only 10 triples for debugging
-        break
-
-# Extract critical concepts and associated text from Criticism RDF
-query = """
+CRITICISM_CONCEPT_QUERY = """
 SELECT DISTINCT ?concept ?text WHERE {
     ?concept ?p ?text .
     FILTER (
@@ -71,24 +104,58 @@ SELECT DISTINCT ?concept ?text WHERE {
 }
 """
 
-criticism_data = {}
-for row in criticism_graph.query(query):
-    concept_uri = str(row[0])
-    text_val = str(row[1])
-    if concept_uri in criticism_data:
-        criticism_data[concept_uri].append(text_val)
-    else:
-        criticism_data[concept_uri] = [text_val]
+def extract_criticism_data(criticism_graph):
+    """Map each critical concept URI to its associated texts."""
+    criticism_data = {}
+    for row in criticism_graph.query(CRITICISM_CONCEPT_QUERY):
+        concept_uri = str(row[0])
+        text_val = str(row[1])
+        if concept_uri in criticism_data:
+            criticism_data[concept_uri].append(text_val)
+        else:
+            criticism_data[concept_uri] = [text_val]
+    return criticism_data
+
+def load_criticism_concepts():
+    """Concept URIs of the critical concepts in the Criticism RDF."""
+    criticism_graph = rdflib.Graph()
+    criticism_graph.parse(CRITICISM_RDF_PATH, format="turtle")
+    print(f"✅ Loaded {len(criticism_graph)} triples from Criticism RDF.")
 
-if not criticism_data:
-    print("⚠ Warning: No concept data extracted from Criticism RDF. Verify its contents!")
-    criticism_data_empty = True
-else:
-    criticism_data_empty = False
+    # Debug: Print first 10 triples from the criticism RDF
+    print("\n🔍 Sample Criticism RDF Triples:")
+    for i, (s, p, o) in enumerate(criticism_graph):
+        print(s, p, o)
+        if i >= 9:  # Show only 10 triples for debugging
+            break
+
+    criticism_data = extract_criticism_data(criticism_graph)
+    if not criticism_data:
+        print("⚠ Warning: No concept data extracted from Criticism RDF. Verify its contents!")
+        return []
     print(f"✅ Extracted {len(criticism_data)} concepts from Criticism RDF.")
+    return list(criticism_data.keys())
+
+def concept_name(uri):
+    """Readable name of a concept URI: Animal_Ethics -> Animal Ethics."""
+    return uri.rsplit("#", 1)[-1].replace("_", " ")
+
+def load_concept_index():
+    """
+    Index every glossary term (embedded by its definition, or its name when it has none) and
+    every criticism concept not already in the glossary (embedded by its name). Labels are the
+    concept URIs; the persisted index is reused until a glossary or the criticism RDF changes.
+    """
+    concepts = {str(safe_uri(term)): definition or term for term, definition in load_glossary(glossary_paths).items()}
+    if concepts:
+        print(f"✅ Loaded {len(concepts)} glossary terms.")
+    for uri in load_criticism_concepts():
+        concepts.setdefault(uri, concept_name(uri))
 
-# Precompute concept embeddings if data is available
-concept_embeddings = {c: embedding_model.encode(c) for c in criticism_data.keys()} if not criticism_data_empty else {}
+    concept_index = ConceptIndex.build(get_embedding_model(), list(concepts), list(concepts.values()),
+                                       EMBEDDING_MODEL_NAME)
+    print(f"✅ Concept index: {len(concept_index)} concepts.")
+    return concept_index
 
 # =============================================================================
 # 5) Helper Functions
@@ -99,33 +166,24 @@ def safe_uri(text):
     text = "".join(c for c in text if c.isalnum() or c == "_")
     return rdflib.URIRef(EX + quote(text))
 
-def predict_text(text):
-    """Predict if a passage is relevant to posthumanism using DistilBERT."""
-    inputs = tokenizer(text, return_tensors="pt", padding="max_length", truncation=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
-    logits = outputs.logits
-    return torch.argmax(logits, dim=1).item() == 1
-
-def infer_concept(text):
-    """
-    Infer the most relevant concept from criticism data using Sentence-BERT.
-    If criticism data is empty, return a fallback concept.
-    """
-    text_embedding = embedding_model.encode(text)
-    if criticism_data_empty or not concept_embeddings:
-        print("⚠ No concept mapping found, returning fallback concept.")
-        return None  # Do not return an artificial concept
-    
-    best_concept_uri = max(
-        criticism_data.keys(),
-        key=lambda c: util.pytorch_cos_sim(text_embedding, concept_embeddings[c]).item()
-    )
-    return safe_uri(best_concept_uri)
+def infer_concepts(texts, top_k=1):
+    """
+    Infer the top-k concepts for many passages at once.
+    Passages are encoded in batches and looked up in the concept index.
+    Returns a list of concept URI lists aligned with `texts`.
+    """
+    concept_index = get_concept_index()
+    if not len(concept_index):
+        print("⚠ No concept mapping found, no concepts are assigned.")
+        return [[] for _ in texts]  # Do not return an artificial concept
 
-def extract_named_entities(text):
+    matches = concept_index.search(get_embedding_model(), texts, k=top_k)
+    return [[rdflib.URIRef(uri) for uri, _ in passage_matches] for passage_matches in matches]
+
+def extract_named_entities(text, doc=None):
     """Extract named entities and classify them into humans, androids, animals, and locations."""
-    doc = nlp(text)
+    if doc is None:
+        doc = get_nlp()(text)
     entities = {"humans": [], "androids": [], "animals": [], "locations": []}
     lower_text = text.lower()
     for ent in doc.ents:
@@ -141,6 +199,11 @@ def extract_named_entities(text):
             entities["locations"].append(ent_uri)
     return entities
 
+def extract_named_entities_batch(texts, batch_size=SPACY_BATCH_SIZE, n_process=1):
+    """Run NER over many passages with nlp.pipe and classify the entities of each one."""
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [extract_named_entities(text, doc) for text, doc in zip(texts, docs)]
+
 def assign_relationship(character, text, concept_uri):
     """
     Assign a relationship between a character and a concept based on textual cues.
@@ -155,51 +218,292 @@ def assign_relationship(character, text, concept_uri):
         predicate = "questions"
     else:
         predicate = "linkedTo"
-    g.add((character, EX[predicate], concept_uri))
+    return (character, EX[predicate], concept_uri)
+
+def passage_triples(i, line, concept_uris, entities):
+    """All triples contributed by one relevant passage, in insertion order."""
+    # Create a unique node for the passage (to allow frequency counts)
+    passage_node = safe_uri(f"passage_{i}")
+    triples = []
+    for main_concept_uri in concept_uris:
+        triples.append((main_concept_uri, EX["isMentionedIn"], passage_node))
+
+        # Link each entity to the inferred concept using context-sensitive relationships
+        for human in entities["humans"]:
+            triples.append(assign_relationship(human, line, main_concept_uri))
+        for android in entities["androids"]:
+            triples.append((android, EX["strugglesWith"], main_concept_uri))
+        for animal in entities["animals"]:
+            triples.append((animal, EX["symbolizes"], main_concept_uri))
+        for loc in entities["locations"]:
+            triples.append((loc, EX["contextualizes"], main_concept_uri))
+    return triples
 
 # =============================================================================
-# 6) Process Novel Text and Build RDF Triples
+# 6) Streaming Passage Pipeline
 # =============================================================================
-if not os.path.exists(NOVEL_TEXT_PATH):
-    print("❌ Error: Novel text file does not exist.")
-    exit(1)
+def iter_passages(paths):
+    """
+    Yield (i, passage) for every non-empty line of the input texts without reading them whole.
+    Line numbers continue across files so that passage nodes stay unique in multi-novel corpora.
+    """
+    i = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield i, line
+                i += 1
 
-with open(NOVEL_TEXT_PATH, "r", encoding="utf-8") as file:
-    novel_text_lines = file.readlines()
+def iter_chunks(iterable, size):
+    """Split an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
-for i, line in enumerate(novel_text_lines):
-    line = line.strip()
-    if not line:
-        continue
+def process_chunk(passages, batch_size=DEFAULT_BATCH_SIZE, concept_top_k=1,
+                  spacy_batch_size=SPACY_BATCH_SIZE, spacy_processes=1):
+    """
+    Run classification, concept inference and NER over one bounded chunk of passages.
+    Returns {i: (is_relevant, triples)} for every passage in the chunk.
+    """
+    # Use the AI model to filter for posthumanism-relevant passages (batched, length-bucketed)
+    tokenizer, model = get_classifier()
+    relevance_mask = classify_passages([line for _, line in passages], tokenizer, model, batch_size=batch_size)
+    relevant_passages = [passage for passage, is_relevant in zip(passages, relevance_mask) if is_relevant]
 
-    # Use the AI model to filter for posthumanism-relevant passages
-    if not predict_text(line):
-        continue
+    # Infer the most relevant concept(s) for all relevant passages in one vectorized pass
+    passage_concepts = infer_concepts([line for _, line in relevant_passages], top_k=concept_top_k)
 
-    # Infer the most relevant concept for the passage
-    main_concept_uri = infer_concept(line)
-    if not main_concept_uri:  # Skip adding triples if no valid concept was found
-        continue
+    # Skip passages for which no valid concept was found
+    mapped = [(passage, uris) for passage, uris in zip(relevant_passages, passage_concepts) if uris]
 
-    # Create a unique node for the passage (to allow frequency counts)
-    passage_node = safe_uri(f"passage_{i}")
-    g.add((main_concept_uri, EX["isMentionedIn"], passage_node))
+    # Extract named entities from all mapped passages with one nlp.pipe call
+    passage_entities = extract_named_entities_batch(
+        [line for (_, line), _ in mapped], batch_size=spacy_batch_size, n_process=spacy_processes
+    )
+
+    results = {i: (is_relevant, []) for (i, _), is_relevant in zip(passages, relevance_mask)}
+    for ((i, line), concept_uris), entities in zip(mapped, passage_entities):
+        results[i] = (True, passage_triples(i, line, concept_uris, entities))
+    return results
+
+class GraphWriter:
+    """Collects triples in an rdflib Graph; close() serializes Turtle and its binary snapshot."""
+
+    def __init__(self, path):
+        self.path = path
+        self.graph = rdflib.Graph()
 
-    # Extract named entities from the passage
-    entities = extract_named_entities(line)
+    def add(self, triple):
+        self.graph.add(triple)
 
-    # Link each entity to the inferred concept using context-sensitive relationships
-    for human in entities["humans"]:
-        assign_relationship(human, line, main_concept_uri)
-    for android in entities["androids"]:
-        g.add((android, EX["strugglesWith"], main_concept_uri))
-    for animal in entities["animals"]:
-        g.add((animal, EX["symbolizes"], main_concept_uri))
-    for loc in entities["locations"]:
-        g.add((loc, EX["contextualizes"], main_concept_uri))
+    def close(self):
+        self.graph.serialize(destination=self.path, format="turtle")
+        write_snapshot(self.graph, self.path)
+
+class NTriplesWriter:
+    """
+    Appends each new triple to an N-Triples file as soon as it is produced.
+    N-Triples is a subset of Turtle, so the output can still be parsed with format="turtle".
+    Duplicates are skipped using 8-byte digests, keeping memory far below an rdflib Graph.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self.seen = set()
+
+    def add(self, triple):
+        line = " ".join(term.n3() for term in triple) + " .\n"
+        digest = hashlib.blake2b(line.encode("utf-8"), digest_size=8).digest()
+        if digest in self.seen:
+            return
+        self.seen.add(digest)
+        self.file.write(line)
+
+    def close(self):
+        self.file.close()
+
+# =============================================================================
+# 7) Incremental Build Inputs
+# =============================================================================
+def build_inputs(concept_top_k, backend="fp32"):
+    """Everything besides the passage text that determines a passage's triples."""
+    inputs = {
+        "model": directory_fingerprint(MODEL_PATH),
+        "embedding_model": EMBEDDING_MODEL_NAME,
+        "criticism_graph": file_sha256(CRITICISM_RDF_PATH) if os.path.exists(CRITICISM_RDF_PATH) else None,
+        "concept_top_k": concept_top_k,
+        "glossary": glossary_fingerprint(glossary_paths),
+    }
+    # Only recorded for non-default backends, so manifests written before --backend existed stay valid
+    if backend != "fp32":
+        inputs["classifier_backend"] = backend
+    return inputs
+
+def validate_inputs(args):
+    """
+    Check every input the build needs without loading any model.
+    Returns True when the build can run; also reports how many passages would be recomputed.
+    """
+    ok = True
+    for path in args.input:
+        if os.path.exists(path):
+            print(f"✅ Novel text: {path}")
+        else:
+            print(f"❌ Novel text file does not exist: {path}")
+            ok = False
+
+    if not os.path.exists(CRITICISM_RDF_PATH):
+        print(f"❌ Criticism RDF does not exist: {CRITICISM_RDF_PATH}")
+        ok = False
+    else:
+        try:
+            criticism_graph = rdflib.Graph()
+            criticism_graph.parse(CRITICISM_RDF_PATH, format="turtle")
+            n_concepts = len(extract_criticism_data(criticism_graph))
+            print(f"✅ Criticism RDF: {len(criticism_graph)} triples, {n_concepts} concepts with text")
+        except Exception as e:
+            print(f"❌ Criticism RDF could not be parsed: {e}")
+            ok = False
+
+    glossary = load_glossary(glossary_paths)
+    print(f"{'✅' if glossary else 'ℹ'} Glossary: {len(glossary)} terms in {', '.join(glossary_paths)}")
+
+    has_config = os.path.exists(os.path.join(MODEL_PATH, "config.json"))
+    has_weights = any(os.path.exists(os.path.join(MODEL_PATH, name))
+                      for name in ("model.safetensors", "pytorch_model.bin"))
+    if has_config and has_weights:
+        print(f"✅ Classifier model: {MODEL_PATH}")
+    else:
+        print(f"❌ Classifier model is missing config.json or weights: {MODEL_PATH}")
+        ok = False
+    if args.backend == "int8":
+        quantized_path = quantized_path_for(MODEL_PATH)
+        state = "found" if os.path.exists(quantized_path) else "will be created"
+        print(f"ℹ int8 classifier cache {state}: {quantized_path}")
+
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    if os.access(output_dir, os.W_OK):
+        print(f"✅ Output directory is writable: {output_dir}")
+    else:
+        print(f"❌ Output directory is not writable: {output_dir}")
+        ok = False
+
+    if ok and not args.full_rebuild:
+        previous = ManifestReader(manifest_path_for(args.output), build_inputs(args.concept_top_k, args.backend))
+        passages = list(iter_passages(args.input))
+        stale = sum(1 for i, line in passages if previous.get(i, line) is None)
+        previous.close()
+        print(f"ℹ {stale} of {len(passages)} passages would be recomputed.")
+    return ok
 
 # =============================================================================
-# 7) Serialize Final RDF
+# 8) Process Novel Text and Build RDF Triples
 # =============================================================================
-g.serialize(destination=RDF_OUTPUT_PATH, format="turtle")
-print(f"✅ Fixed RDF stored at {RDF_OUTPUT_PATH}")
+def main():
+    parser = argparse.ArgumentParser(description="Build the novel posthumanism RDF graph.")
+    parser.add_argument("--input", nargs="+", default=[NOVEL_TEXT_PATH],
+                        help="Novel text file(s), one passage per line (default: data/primary_text.txt)")
+    parser.add_argument("--output", default=RDF_OUTPUT_PATH, help="Output RDF path")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Number of passages per classifier batch (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Passages read and processed per streaming chunk (default: %(default)s)")
+    parser.add_argument("--concept-top-k", type=int, default=1,
+                        help="Link each relevant passage to its k most similar concepts (default: %(default)s)")
+    parser.add_argument("--spacy-batch-size", type=int, default=SPACY_BATCH_SIZE,
+                        help="Passages per nlp.pipe batch (default: %(default)s)")
+    parser.add_argument("--spacy-processes", type=int, default=1,
+                        help="nlp.pipe worker processes for NER (default: %(default)s)")
+    parser.add_argument("--glossary", nargs="+", default=GLOSSARY_PATHS,
+                        help="Glossary term folders or files indexed as concepts (default: data/glossary_terms)")
+    parser.add_argument("--backend", choices=BACKENDS, default="fp32",
+                        help="Classifier inference backend; int8 is dynamically quantized (default: %(default)s)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write N-Triples incrementally instead of holding the full graph in memory")
+    parser.add_argument("--no-embedding-cache", action="store_true",
+                        help="Do not read or write the on-disk embedding cache")
+    parser.add_argument("--full-rebuild", action="store_true",
+                        help="Ignore the build manifest and recompute every passage")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Validate inputs and report stale passages without loading any model")
+    args = parser.parse_args()
+
+    global use_embedding_cache, classifier_backend, glossary_paths
+    use_embedding_cache = not args.no_embedding_cache
+    classifier_backend = args.backend
+    glossary_paths = args.glossary
+
+    if args.dry_run:
+        exit(0 if validate_inputs(args) else 1)
+
+    missing = [path for path in args.input if not os.path.exists(path)]
+    if missing:
+        print(f"❌ Error: Novel text file does not exist: {', '.join(missing)}")
+        exit(1)
+
+    # Passages whose text and build inputs are unchanged reuse the triples from the last build
+    inputs = build_inputs(args.concept_top_k, args.backend)
+    manifest_path = manifest_path_for(args.output)
+    previous = None if args.full_rebuild else ManifestReader(manifest_path, inputs)
+    if previous is not None and not previous.valid and os.path.exists(manifest_path):
+        print("ℹ Build inputs changed since the last run; recomputing every passage.")
+    manifest = ManifestWriter(manifest_path, inputs)
+
+    writer = NTriplesWriter(args.output) if args.stream else GraphWriter(args.output)
+    # The graph keeps each triple once; how often a passage produced it is counted here
+    # (keyed by triple ID) and written to the .counts.tsv side table, see edge_counts.py
+    edge_counts = Counter()
+    n_passages = n_relevant = n_reused = 0
+    for chunk in iter_chunks(iter_passages(args.input), args.chunk_size):
+        results = {}
+        pending = []
+        for i, line in chunk:
+            entry = previous.get(i, line) if previous is not None else None
+            if entry is not None:
+                results[i] = (entry["relevant"], entry_triples(entry))
+            else:
+                pending.append((i, line))
+
+        if pending:
+            results.update(process_chunk(pending, batch_size=args.batch_size, concept_top_k=args.concept_top_k,
+                                         spacy_batch_size=args.spacy_batch_size,
+                                         spacy_processes=args.spacy_processes))
+
+        for i, line in chunk:
+            is_relevant, triples = results[i]
+            for triple in triples:
+                writer.add(triple)
+                edge_counts[triple_id(*triple)] += 1
+            manifest.record(i, line, is_relevant, triples)
+            n_relevant += is_relevant
+
+        n_passages += len(chunk)
+        n_reused += len(chunk) - len(pending)
+        print(f"… {n_passages} passages processed ({n_reused} reused), {n_relevant} posthumanism-relevant so far.")
+
+    # =============================================================================
+    # 9) Serialize Final RDF
+    # =============================================================================
+    writer.close()
+    counts_path = write_counts(edge_counts, args.output)
+    if previous is not None:
+        previous.close()
+    manifest.close()
+    print(f"✅ {n_relevant} of {n_passages} passages classified as posthumanism-relevant "
+          f"({n_passages - n_reused} recomputed, {n_reused} reused from {manifest_path}).")
+    print(f"✅ Fixed RDF stored at {args.output}")
+    print(f"✅ Occurrence counts of {len(edge_counts)} edges stored at {counts_path}")
+
+    if embedding_cache is not None:
+        embedding_cache.save()
+        print(f"✅ {embedding_cache.summary()}")
+
+if __name__ == "__main__":
+    main()
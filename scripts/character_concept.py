@@ -1,29 +1,16 @@
-import rdflib
+from triple_index import TripleIndex
+from relation_counts import count_relations
 from collections import defaultdict
 from prettytable import PrettyTable
 
 def main():
-    g = rdflib.Graph()
 
     # 파일 경로를 results 폴더 내로 변경
     ttl_file = "results/novel_posthumanism_rdf.ttl"
-    g.parse(ttl_file, format="turtle")
+    index = TripleIndex.from_snapshot(ttl_file)
 
-    EX = rdflib.Namespace("http://example.org/posthuman#")
-    g.bind("ex", EX)
-
-    query = """
-    PREFIX ex: <http://example.org/posthuman#>
-    SELECT ?char ?rel ?concept (COUNT(*) as ?relCount)
-    WHERE {
-      ?char ?rel ?concept .
-      FILTER(?rel IN (ex:strugglesWith, ex:linkedTo, ex:questions))
-    }
-    GROUP BY ?char ?rel ?concept
-    ORDER BY ?char ?rel
-    """
-
-    qres = g.query(query)
+    # ?char ?rel ?concept 의 (char, rel, concept)별 개수 (strugglesWith/linkedTo/questions)
+    counts = count_relations(index, ["strugglesWith", "linkedTo", "questions"])
 
     char_dict = defaultdict(lambda: {
         "strugglesWith": defaultdict(int),
@@ -31,12 +18,7 @@ def main():
         "questions": defaultdict(int),
     })
 
-    for row in qres:
-        char_uri = row["char"]
-        rel_uri = row["rel"]
-        concept_uri = row["concept"]
-        count_val = int(row["relCount"])
-
+    for char_uri, rel_uri, concept_uri, count_val in counts.itertuples(index=False):
         relation_str = rel_uri.split("#")[-1]
         char_name = char_uri.split("#")[-1]
         concept_name = concept_uri.split("#")[-1]
@@ -0,0 +1,99 @@
+"""
+character_similarity.py
+
+Top-k character neighbours from a sparse character x concept matrix.
+
+The character reports used to pivot their (character, concept, count) rows into a dense
+matrix and call `.T.corr()`, which holds a characters x characters float matrix in memory
+and writes all of it to CSV. Here the matrix stays scipy.sparse CSR (relation_counts.to_sparse)
+and similarities are computed one block of characters at a time: each block is a sparse
+product against the whole matrix, of which only the k best neighbours per character are
+kept. Memory is O(block_size x characters) instead of O(characters^2).
+
+Pearson correlation over concepts matches `DataFrame.T.corr()` (characters whose counts do
+not vary have no defined correlation and get no neighbours); cosine similarity is also
+available.
+
+Usage:
+    from relation_counts import to_sparse
+    from character_similarity import top_k_neighbours
+    matrix, characters, concepts = to_sparse(df, rows="Character", columns="Concept", values="Count")
+    neighbours = top_k_neighbours(matrix, characters, k=10)   # Character, Neighbor, Similarity
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+COLUMNS = ["Character", "Neighbor", "Similarity"]
+DEFAULT_BLOCK_SIZE = 256
+
+
+def _pearson_block(matrix, start, stop, means, norms):
+    """Correlation of rows start:stop with every row: centred dot products without densifying the matrix."""
+    n = matrix.shape[1]
+    block = (matrix[start:stop] @ matrix.T).toarray()
+    block -= n * np.outer(means[start:stop], means)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        block /= np.outer(norms[start:stop], norms)
+    return block
+
+
+def _cosine_block(matrix, start, stop, norms):
+    block = (matrix[start:stop] @ matrix.T).toarray()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        block /= np.outer(norms[start:stop], norms)
+    return block
+
+
+def top_k_neighbours(matrix, labels, k=10, metric="pearson", block_size=DEFAULT_BLOCK_SIZE):
+    """
+    The k most similar other rows of a sparse rows x features matrix, for every row.
+    Returns a long DataFrame (Character, Neighbor, Similarity) ordered by character label
+    order, then similarity descending; undefined similarities (NaN) are skipped.
+    """
+    matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+    n_rows, n_features = matrix.shape
+    if metric == "pearson":
+        means = np.asarray(matrix.mean(axis=1)).ravel()
+        squares = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+        # sqrt(sum((x - mean)^2)); a row without variance gets 0 and therefore NaN correlations
+        norms = np.sqrt(np.maximum(squares - n_features * means ** 2, 0.0))
+    elif metric == "cosine":
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    else:
+        raise ValueError(f"Unknown metric: {metric}")
+
+    labels = np.asarray(labels, dtype=object)
+    k = min(k, n_rows - 1)
+    if k <= 0:
+        return pd.DataFrame(columns=COLUMNS)
+
+    characters, neighbours, similarities = [], [], []
+    for start in range(0, n_rows, block_size):
+        stop = min(start + block_size, n_rows)
+        if metric == "pearson":
+            block = _pearson_block(matrix, start, stop, means, norms)
+        else:
+            block = _cosine_block(matrix, start, stop, norms)
+        block[np.arange(stop - start), np.arange(start, stop)] = np.nan  # never your own neighbour
+        block[np.isnan(block)] = -np.inf
+
+        # k best per row (unordered), then order them: similarity descending, label order on ties
+        candidates = np.argpartition(block, -k, axis=1)[:, -k:]
+        scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.lexsort((candidates, -scores), axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+
+        keep = np.isfinite(scores)
+        rows = np.repeat(np.arange(start, stop), k).reshape(-1, k)
+        characters.append(rows[keep])
+        neighbours.append(candidates[keep])
+        similarities.append(scores[keep])
+
+    return pd.DataFrame({
+        "Character": labels[np.concatenate(characters)],
+        "Neighbor": labels[np.concatenate(neighbours)],
+        "Similarity": np.concatenate(similarities),
+    }, columns=COLUMNS)
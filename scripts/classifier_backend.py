@@ -0,0 +1,127 @@
+"""
+classifier_backend.py
+
+CPU inference backends for the fine-tuned posthumanism DistilBERT classifier.
+
+  fp32:  the model as saved by fine-tuning (PyTorch eager, float32 weights).
+  int8:  dynamic int8 quantization of the encoder's nn.Linear layers (weights stored as
+         int8, activations quantized on the fly per batch). The attention and feed-forward
+         projections are almost all of DistilBERT's compute and parameters. The
+         classification head stays fp32: it costs nothing and is where a rounding error
+         would move a passage across the decision boundary.
+
+Quantizing takes a few seconds, so the quantized model is cached next to the model
+directory (models/posthuman_finetuned.int8.pt, outside the directory so that the build
+manifest's model fingerprint is unaffected). The whole quantized module is pickled, so
+loading it never materializes the fp32 weights; the cache records the fingerprint of the
+fp32 model and the torch/transformers versions it was made with, and is rebuilt when any
+of them change. It is a pickle: only load caches this script wrote.
+
+Check that the int8 backend keeps the same decisions before switching a build over:
+    python benchmarks/bench_quantized_classifier.py
+
+Usage:
+    from classifier_backend import load_classifier_model
+    model = load_classifier_model("models/posthuman_finetuned", backend="int8")
+"""
+
+import os
+import warnings
+from contextlib import contextmanager
+
+from build_manifest import directory_fingerprint
+
+BACKENDS = ("fp32", "int8")
+QUANTIZED_SUFFIX = ".int8.pt"
+
+
+def quantized_path_for(model_path):
+    return os.path.normpath(model_path) + QUANTIZED_SUFFIX
+
+
+@contextmanager
+def _quantization_warnings_ignored():
+    # torch.ao.quantization is deprecated in favour of torchao, which is not a dependency here
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*deprecated.*")
+        yield
+
+
+def _quantize(model):
+    """Dynamic int8 copy of `model` with only the encoder (model.base_model) quantized."""
+    import torch
+    from torch.ao.quantization import default_dynamic_qconfig
+    from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+    with _quantization_warnings_ignored():
+        return torch.ao.quantization.quantize_dynamic(
+            model, {model.base_model_prefix: default_dynamic_qconfig},
+            mapping={torch.nn.Linear: DynamicQuantizedLinear}, dtype=torch.qint8)
+
+
+def _source(model_path):
+    """What a cached quantized model depends on: the fp32 model and the libraries that pickled it."""
+    import torch
+    import transformers
+    return {"model": directory_fingerprint(model_path), "torch": torch.__version__,
+            "transformers": transformers.__version__}
+
+
+def _read_quantized(path, source):
+    """The cached int8 model, or None when it is missing, unreadable or was made from other inputs."""
+    import torch
+    if not os.path.exists(path):
+        return None
+    try:
+        with _quantization_warnings_ignored():
+            cached = torch.load(path, map_location="cpu", weights_only=False)
+    except Exception as e:
+        print(f"⚠ Ignoring unreadable quantized model {path}: {e}")
+        return None
+    if cached.get("source") != source:
+        return None
+    return cached["model"]
+
+
+def ensure_quantized(model_path, **kwargs):
+    """
+    Make sure the int8 cache for `model_path` is current; returns its path.
+    Call this once before starting worker processes so they do not all quantize at once.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    path = quantized_path_for(model_path)
+    source = _source(model_path)
+    if _read_quantized(path, source) is not None:
+        return path
+
+    print(f"Quantizing {model_path} to int8 (cached at {path})...")
+    model = AutoModelForSequenceClassification.from_pretrained(model_path, **kwargs)
+    model.eval()
+    quantized = _quantize(model)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    torch.save({"source": source, "model": quantized}, temp_path)
+    os.replace(temp_path, path)
+    return path
+
+
+def load_classifier_model(model_path, backend="fp32", **kwargs):
+    """
+    The sequence-classification model at `model_path` in eval mode, on the requested backend.
+    Extra keyword arguments go to from_pretrained (e.g. local_files_only=True).
+    """
+    from transformers import AutoModelForSequenceClassification
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown classifier backend: {backend}")
+    if backend == "fp32":
+        model = AutoModelForSequenceClassification.from_pretrained(model_path, **kwargs)
+        model.eval()
+        return model
+
+    path = quantized_path_for(model_path)
+    model = _read_quantized(path, _source(model_path))
+    if model is None:
+        model = _read_quantized(ensure_quantized(model_path, **kwargs), _source(model_path))
+    model.eval()
+    return model
@@ -0,0 +1,258 @@
+"""
+concept_index.py
+
+Persisted nearest-neighbour index over posthumanist concepts, shared by the RDF builders.
+
+Concepts come from one or more glossaries (data/glossary_terms/ and any extra term folders
+or files) plus the concepts found in the criticism RDF. Each concept is embedded once with
+Sentence-BERT and the normalized vectors are saved as one memory-mapped matrix, so a
+query's score is its cosine similarity. Up to EXACT_LIMIT concepts lookups are exact: one
+matrix product per block of passages plus argpartition (the same ranking as the old
+brute-force code; faiss' exact IndexFlatIP was slower than this on CPU).
+Above EXACT_LIMIT a faiss HNSW graph (faiss-cpu) is built next to the matrix and searched
+instead; without faiss those indexes fall back to exact search.
+
+The index is saved under .cache/concept_index/ keyed by a hash of the embedding model and
+every (label, text) pair, so it is rebuilt only when a glossary or the criticism concepts
+change.
+
+Glossary formats:
+    data/glossary_terms/<term>.txt     "# Term: <name>" heading and a "## Definition" section
+                                       (see data/glossary_terms/README.md); the file name is
+                                       used when the heading is missing
+    <glossary>.txt / .md               one "**term**: definition" entry per line
+
+Usage:
+    from concept_index import ConceptIndex, load_glossary
+    glossary = load_glossary(["data/glossary_terms"])          # {term: definition}
+    index = ConceptIndex.build(embedding_model, labels, texts, "all-MiniLM-L6-v2")
+    index.search(embedding_model, passages, k=3)                # [[(label, score), ...], ...]
+"""
+
+import os
+import re
+import json
+import hashlib
+
+import numpy as np
+
+from concept_matcher import encode_normalized, top_k_indices, DEFAULT_ENCODE_BATCH_SIZE, SCORE_CHUNK_SIZE
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "../.cache/concept_index")
+EXACT_LIMIT = 100000     # concepts; larger indexes use HNSW when faiss is installed
+SCORE_CELLS = 1 << 24    # query x concept scores held at once by exact search (64 MiB)
+HNSW_NEIGHBOURS = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+
+TERM_HEADING = re.compile(r"^#\s*Term:\s*(.+?)\s*$", re.MULTILINE)
+SECTION_HEADING = re.compile(r"^##\s*(.+?)\s*$", re.MULTILINE)
+GLOSSARY_LINE = re.compile(r"^\s*[-*]*\s*\*\*(.+?)\*\*\s*:\s*(.+?)\s*$", re.MULTILINE)
+PLACEHOLDER = re.compile(r"^\[.*\]$")
+
+
+def _faiss():
+    """The faiss module, or None when faiss-cpu is not installed."""
+    try:
+        import faiss
+    except ImportError:
+        return None
+    return faiss
+
+
+# ------------------------------------------------------------------ #
+# Glossaries
+# ------------------------------------------------------------------ #
+def parse_term_file(path):
+    """(term, definition) from one glossary term file; definition is "" when there is none."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    heading = TERM_HEADING.search(text)
+    term = heading.group(1) if heading else os.path.splitext(os.path.basename(path))[0].replace("_", " ").title()
+
+    sections = SECTION_HEADING.split(text)
+    # split() gives [preamble, name, body, name, body, ...]
+    bodies = {name.lower(): body for name, body in zip(sections[1::2], sections[2::2])}
+    if "definition" in bodies:
+        definition = bodies["definition"]
+    else:
+        definition = TERM_HEADING.sub("", sections[0])
+    definition = " ".join(definition.split())
+    return term, "" if PLACEHOLDER.match(definition) else definition
+
+
+def glossary_files(paths):
+    """Every glossary file under `paths` (folders of term files and single glossary files), sorted."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.endswith(".txt") and not name.lower().startswith("readme"))
+        elif os.path.isfile(path):
+            files.append(path)
+    return files
+
+
+def load_glossary(paths):
+    """
+    {term: definition} from glossary folders and files, in file order.
+    A term defined more than once keeps its first non-empty definition.
+    """
+    glossary = {}
+    for path in paths:
+        if os.path.isdir(path):
+            entries = [parse_term_file(file) for file in glossary_files([path])]
+        elif os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                entries = [(term, "" if PLACEHOLDER.match(definition) else definition)
+                           for term, definition in GLOSSARY_LINE.findall(f.read())]
+        else:
+            continue
+        for term, definition in entries:
+            if not glossary.get(term):
+                glossary[term] = definition
+    return glossary
+
+
+def glossary_fingerprint(paths):
+    """sha256 over the glossary files' names and contents; None when there are none."""
+    files = glossary_files(paths)
+    if not files:
+        return None
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+# ------------------------------------------------------------------ #
+# Index
+# ------------------------------------------------------------------ #
+def _ann_index(matrix):
+    """A faiss HNSW index over `matrix` when it has more than EXACT_LIMIT rows and faiss is installed."""
+    faiss = _faiss()
+    if faiss is None or matrix is None or len(matrix) <= EXACT_LIMIT:
+        return None
+    index = faiss.IndexHNSWFlat(matrix.shape[1], HNSW_NEIGHBOURS, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    index.add(np.ascontiguousarray(matrix, dtype=np.float32))
+    return index
+
+
+def index_key(model_name, labels, texts):
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for label, text in zip(labels, texts):
+        digest.update(f"\0{label}\0{text}".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class ConceptIndex:
+    """
+    Top-k concept lookup over normalized concept embeddings: exact numpy search over the
+    memory-mapped matrix, or a faiss HNSW graph when there are more than EXACT_LIMIT concepts.
+    """
+
+    def __init__(self, labels, matrix=None, index=None):
+        self.labels = list(labels)
+        self.matrix = matrix    # (concepts, dim) float32 unit vectors
+        self.index = index      # faiss HNSW index, or None for exact search
+
+    def __len__(self):
+        return len(self.labels)
+
+    @classmethod
+    def build(cls, embedding_model, labels, texts, model_name, cache_dir=None,
+              batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+        """Load the index for these concepts from `cache_dir` (default CACHE_DIR), or embed them and save a new one."""
+        cache_dir = cache_dir or CACHE_DIR
+        labels, texts = list(labels), list(texts)
+        key = index_key(model_name, labels, texts)
+        cached = cls.load(cache_dir, key)
+        if cached is not None:
+            return cached
+
+        matrix = encode_normalized(embedding_model, texts, batch_size) if texts else None
+        concept_index = cls(labels, matrix=matrix, index=_ann_index(matrix))
+        concept_index.save(cache_dir, key)
+        return concept_index
+
+    @classmethod
+    def load(cls, cache_dir, key):
+        """The index saved under `key`, or None when it has not been built."""
+        labels_path = os.path.join(cache_dir, f"{key}.json")
+        matrix_path = os.path.join(cache_dir, f"{key}.npy")
+        if not os.path.exists(labels_path):
+            return None
+        with open(labels_path, "r", encoding="utf-8") as f:
+            labels = json.load(f)["labels"]
+        if not labels:
+            return cls(labels)
+        if not os.path.exists(matrix_path):
+            return None
+
+        matrix = np.load(matrix_path, mmap_mode="r")
+        index_path = os.path.join(cache_dir, f"{key}.faiss")
+        faiss = _faiss()
+        if faiss is not None and os.path.exists(index_path):
+            index = faiss.read_index(index_path)
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+            return cls(labels, matrix=matrix, index=index)
+        concept_index = cls(labels, matrix=matrix, index=_ann_index(matrix))
+        if concept_index.index is not None:  # saved without faiss installed
+            concept_index.save(cache_dir, key)
+        return concept_index
+
+    def save(self, cache_dir, key):
+        """Write each file atomically, the labels last: a labels file marks a complete index."""
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_suffix = f".{os.getpid()}.tmp"
+        if self.matrix is not None:
+            path = os.path.join(cache_dir, f"{key}.npy")
+            with open(path + temp_suffix, "wb") as f:
+                np.save(f, np.asarray(self.matrix))
+            os.replace(path + temp_suffix, path)
+        if self.index is not None:
+            path = os.path.join(cache_dir, f"{key}.faiss")
+            _faiss().write_index(self.index, path + temp_suffix)
+            os.replace(path + temp_suffix, path)
+
+        path = os.path.join(cache_dir, f"{key}.json")
+        with open(path + temp_suffix, "w", encoding="utf-8") as f:
+            json.dump({"labels": self.labels}, f)
+        os.replace(path + temp_suffix, path)
+
+    def _exact_search(self, vectors, k):
+        # Score in row blocks so that the (queries, concepts) score matrix stays within SCORE_CELLS
+        rows = max(1, SCORE_CELLS // len(self.labels))
+        scores, indices = [], []
+        for start in range(0, len(vectors), rows):
+            block = vectors[start:start + rows] @ self.matrix.T
+            best = top_k_indices(block, k)
+            indices.append(best)
+            scores.append(np.take_along_axis(block, best, axis=1))
+        return np.concatenate(scores), np.concatenate(indices)
+
+    def search(self, embedding_model, queries, k=1, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+        """
+        The k best concepts for every query.
+        Returns one list of (label, score) pairs per query, best match first.
+        """
+        if not queries or not self.labels:
+            return [[] for _ in queries]
+        k = min(k, len(self.labels))
+        matches = []
+        for start in range(0, len(queries), SCORE_CHUNK_SIZE):
+            vectors = encode_normalized(embedding_model, queries[start:start + SCORE_CHUNK_SIZE], batch_size)
+            if self.index is not None:
+                scores, indices = self.index.search(vectors, k)
+            else:
+                scores, indices = self._exact_search(vectors, k)
+            matches.extend(
+                [(self.labels[j], float(score)) for j, score in zip(row_indices, row_scores) if j >= 0]
+                for row_indices, row_scores in zip(indices, scores)
+            )
+        return matches
@@ -0,0 +1,83 @@
+"""
+concept_matcher.py
+
+Vectorized concept assignment with Sentence-BERT embeddings.
+
+All concept embeddings are stacked once into a single L2-normalized matrix, passages are
+encoded in batches, and the best concept for every passage is found with one matrix
+multiply plus argmax (or argpartition for top-k), instead of calling cosine similarity
+once per (passage, concept) pair.
+
+Usage:
+    from concept_matcher import build_concept_matrix, match_concepts
+    labels = list(criticism_data.keys())
+    matrix = build_concept_matrix(embedding_model, labels)
+    best = match_concepts(embedding_model, passages, labels, matrix)
+"""
+
+import numpy as np
+
+DEFAULT_ENCODE_BATCH_SIZE = 64
+SCORE_CHUNK_SIZE = 4096  # passages scored per matrix multiply, bounds peak memory
+
+
+def normalize_rows(matrix):
+    """L2-normalize each row so that dot products equal cosine similarities."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def encode_normalized(embedding_model, texts, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+    """Encode texts in batches and return an (n, dim) float32 matrix of unit vectors."""
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    embeddings = embedding_model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True)
+    return normalize_rows(embeddings)
+
+
+def build_concept_matrix(embedding_model, labels, texts=None, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+    """
+    Embed every concept once and stack the vectors into a normalized matrix.
+    `texts` are the strings to embed for each label (defaults to the labels themselves).
+    """
+    return encode_normalized(embedding_model, texts if texts is not None else labels, batch_size)
+
+
+def similarity_matrix(embedding_model, passages, concept_matrix, batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+    """Cosine similarities between every passage and every concept, shape (passages, concepts)."""
+    passage_matrix = encode_normalized(embedding_model, passages, batch_size)
+    if passage_matrix.size == 0 or concept_matrix.size == 0:
+        return np.zeros((len(passages), len(concept_matrix)), dtype=np.float32)
+    return passage_matrix @ concept_matrix.T
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores per row, ordered best first."""
+    k = min(k, scores.shape[1])
+    if k == 1:
+        return np.argmax(scores, axis=1)[:, None]
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def match_concepts(embedding_model, passages, labels, concept_matrix, top_k=1,
+                   batch_size=DEFAULT_ENCODE_BATCH_SIZE):
+    """
+    Assign concepts to passages.
+    Returns one list of (label, score) pairs per passage, best match first.
+    """
+    if not passages or not labels:
+        return [[] for _ in passages]
+    matches = []
+    for start in range(0, len(passages), SCORE_CHUNK_SIZE):
+        chunk = passages[start:start + SCORE_CHUNK_SIZE]
+        scores = similarity_matrix(embedding_model, chunk, concept_matrix, batch_size)
+        best = top_k_indices(scores, top_k)
+        matches.extend(
+            [(labels[j], float(scores[row, j])) for j in best[row]]
+            for row in range(len(chunk))
+        )
+    return matches
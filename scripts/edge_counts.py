@@ -0,0 +1,170 @@
+"""
+edge_counts.py
+
+Per-edge occurrence counts for the RDF graphs.
+
+The count of every (subject, predicate, object) edge is stored in one of two ways:
+  - side table: `<file>.ttl.counts.tsv` next to the Turtle file, one `triple_id<TAB>count`
+    line per edge, where triple_id is a hash of the edge's N-Triples terms (triple_id()).
+    The Turtle file itself keeps only the original triples. build_novel_rdf_fixed.py writes
+    it while processing the passages (how often each edge was produced), update_rdf_ttl.py
+    writes it for an existing graph by default.
+  - reification (update_rdf_ttl.py --mode reify): a statement node per edge with
+    rdf:subject / rdf:predicate / rdf:object + ex:occurrenceCount, i.e. four extra triples
+    and a blank node per edge.
+
+EdgeCounts reads either from a TripleIndex, so each edge of the graph gets exactly one count
+(1 if it was never annotated) and annotation triples are not reported as edges.
+Subject-level `?s ex:occurrenceCount ?n` literals (written by older versions of
+results/update_rdf_ttl.py) say nothing about a particular edge and are ignored.
+
+Table 5 reads these counts directly instead of joining every edge of a character with every
+ex:occurrenceCount literal on that character.
+
+Usage:
+    from edge_counts import EdgeCounts
+    counts = EdgeCounts.from_snapshot("results/novel_posthumanism_rdf_fixed.ttl")
+    counts.get(s, p, o)       # occurrence count of one edge (0 if it is not in the graph)
+    df = counts.to_frame()    # columns: subject, predicate, object, count
+
+    write_counts({(s, p, o): 3, ...}, "results/novel_posthumanism_rdf_fixed.ttl")
+"""
+
+import os
+import hashlib
+
+import numpy as np
+import pandas as pd
+from rdflib import Namespace, RDF
+
+from triple_index import TripleIndex
+
+EX = Namespace("http://example.org/posthuman#")
+ANNOTATION_PREDICATES = [RDF.subject, RDF.predicate, RDF.object, EX.occurrenceCount]
+COLUMNS = ["subject", "predicate", "object", "count"]
+COUNTS_SUFFIX = ".counts.tsv"
+
+
+# ----------------------------------------------------------------------------- #
+# Side table
+# ----------------------------------------------------------------------------- #
+def counts_path_for(ttl_path):
+    return ttl_path + COUNTS_SUFFIX
+
+
+def _term_digest(term):
+    return hashlib.blake2b(term.n3().encode("utf-8"), digest_size=8).digest()
+
+
+def _edge_id(s_digest, p_digest, o_digest):
+    return hashlib.blake2b(s_digest + p_digest + o_digest, digest_size=8).hexdigest()
+
+
+def triple_id(s, p, o):
+    """
+    Stable 64-bit ID (hex) of an edge: hash of the hashes of its three N-Triples terms, so a
+    long literal is hashed once however many edges use it. Blank node labels change between
+    parses, so edges with a blank node do not keep their ID (and count as 1).
+    """
+    return _edge_id(_term_digest(s), _term_digest(p), _term_digest(o))
+
+
+def write_counts(counts, ttl_path):
+    """
+    Write {(s, p, o): count} (or {triple_id: count}) as the side table of `ttl_path`;
+    returns its path.
+    """
+    path = counts_path_for(ttl_path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("triple_id\tcount\n")
+        for key, count in counts.items():
+            f.write(f"{key if isinstance(key, str) else triple_id(*key)}\t{int(count)}\n")
+    return path
+
+
+def read_counts(*ttl_paths):
+    """{triple_id: count} summed over the side tables of the given Turtle files that have one."""
+    counts = {}
+    for ttl_path in ttl_paths:
+        path = counts_path_for(ttl_path)
+        if not os.path.exists(path):
+            continue
+        table = pd.read_csv(path, sep="\t", dtype={"triple_id": str, "count": np.int64})
+        for key, count in zip(table["triple_id"].tolist(), table["count"].tolist()):
+            counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+class EdgeCounts:
+    """(k, 3) edge ID array in SPO order with one occurrence count per edge."""
+
+    def __init__(self, index, edges, counts):
+        self.index = index
+        self.edges = edges
+        self.counts = counts
+        self._lookup = None
+
+    @classmethod
+    def from_snapshot(cls, *paths):
+        """Index the Turtle files (via their snapshots) and read their side tables, if any."""
+        return cls.from_index(TripleIndex.from_snapshot(*paths), read_counts(*paths))
+
+    @classmethod
+    def from_index(cls, index, side_counts=None):
+        """
+        Counts for every edge of `index`: reified statements first, then `side_counts`
+        ({triple_id: count}, see read_counts()), then 1.
+        """
+        statements = np.unique(index.match(p=RDF.subject)[:, 0])
+        annotated = cls._annotated(index, statements)
+
+        # Every other edge counts once, unless a statement node annotates it
+        annotation_ids = [i for i in (index.term_id(p) for p in ANNOTATION_PREDICATES) if i is not None]
+        rows = index.triples
+        rows = rows[~np.isin(rows[:, 1], annotation_ids) & ~np.isin(rows[:, 0], statements)]
+        plain = pd.DataFrame({"s": rows[:, 0], "p": rows[:, 1], "o": rows[:, 2], "count": 1})
+        if side_counts:
+            digests = [_term_digest(term) for term in index.terms]
+            plain["count"] = [side_counts.get(_edge_id(digests[s], digests[p], digests[o]), 1)
+                              for s, p, o in rows.tolist()]
+
+        merged = pd.concat([annotated, plain]).drop_duplicates(["s", "p", "o"], keep="first")
+        edges = merged[["s", "p", "o"]].to_numpy(dtype=np.int32)
+        counts = merged["count"].to_numpy(dtype=np.int64)
+        order = np.lexsort((edges[:, 2], edges[:, 1], edges[:, 0]))
+        return cls(index, edges[order], counts[order])
+
+    @staticmethod
+    def _annotated(index, statements):
+        """Summed ex:occurrenceCount per (s, p, o) ID triple over all reified statements."""
+        def pairs(prop, name):
+            rows = index.match(s=statements, p=prop)
+            return pd.DataFrame({"m": rows[:, 0], name: rows[:, 2]})
+
+        joined = (pairs(RDF.subject, "s")
+                  .merge(pairs(RDF.predicate, "p"), on="m")
+                  .merge(pairs(RDF.object, "o"), on="m")
+                  .merge(pairs(EX.occurrenceCount, "n"), on="m"))
+        literal_ids = np.unique(joined["n"].to_numpy())
+        values = dict(zip(literal_ids.tolist(), (int(index.terms[i]) for i in literal_ids.tolist())))
+        joined["count"] = joined["n"].map(values).astype(np.int64)
+        return joined.groupby(["s", "p", "o"], as_index=False)["count"].sum()
+
+    def __len__(self):
+        return len(self.edges)
+
+    def get(self, s, p, o):
+        """Occurrence count of the edge (s, p, o), given as rdflib terms; 0 if absent."""
+        if self._lookup is None:
+            self._lookup = dict(zip(map(tuple, self.edges.tolist()), self.counts.tolist()))
+        key = tuple(self.index.term_id(term) for term in (s, p, o))
+        return self._lookup.get(key, 0)
+
+    def to_frame(self):
+        terms = self.index.terms
+        return pd.DataFrame({
+            "subject": [terms[i] for i in self.edges[:, 0].tolist()],
+            "predicate": [terms[i] for i in self.edges[:, 1].tolist()],
+            "object": [terms[i] for i in self.edges[:, 2].tolist()],
+            "count": self.counts,
+        }, columns=COLUMNS)
@@ -0,0 +1,277 @@
+"""
+embedding_cache.py
+
+Persistent, content-addressed cache for SentenceTransformer embeddings shared by the
+RDF builders.
+
+Every embedding is keyed by sha256(model name + encode options + text) and stored as a
+row of an immutable float32 .npy shard that is memory-mapped on read. A JSON index maps
+keys to (shard, row) and records a logical access clock used for size-bounded LRU
+eviction. Re-running a build therefore only embeds strings that were never seen before.
+
+Cache layout:
+    .cache/embeddings/index.json        # key -> [shard, row, last_used]
+    .cache/embeddings/shards/<id>.npy   # float32 arrays, shape (rows, dim)
+
+Usage:
+    from embedding_cache import EmbeddingCache
+    embedding_cache = EmbeddingCache("all-MiniLM-L6-v2")
+    embedding_model = embedding_cache.wrap(SentenceTransformer("all-MiniLM-L6-v2"))
+    ...
+    embedding_cache.save()
+    print(embedding_cache.summary())
+"""
+
+import os
+import json
+import uuid
+import hashlib
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked writes
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "../.cache/embeddings")
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB of float32 vectors
+
+
+class EmbeddingCache:
+    """On-disk LRU cache of embedding vectors for a single embedding model."""
+
+    def __init__(self, model_name, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.shard_dir = os.path.join(cache_dir, "shards")
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = {}   # key -> [shard, row, last_used]
+        self._shards = {}    # shard -> {"rows": n, "dim": d}
+        self._clock = 0
+        self._mmaps = {}
+        self._pending = {}   # key -> vector encoded since the last save()
+        self._touched = set()
+        self._load_index()
+
+    # ------------------------------------------------------------------ #
+    # Index I/O
+    # ------------------------------------------------------------------ #
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {"clock": 0, "shards": {}, "entries": {}}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load_index(self):
+        index = self._read_index()
+        self._clock = index["clock"]
+        self._shards = index["shards"]
+        self._entries = index["entries"]
+
+    @contextmanager
+    def _locked(self):
+        os.makedirs(self.shard_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, ".lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _shard_path(self, shard):
+        return os.path.join(self.shard_dir, f"{shard}.npy")
+
+    def _shard_array(self, shard):
+        if shard not in self._mmaps:
+            self._mmaps[shard] = np.load(self._shard_path(shard), mmap_mode="r")
+        return self._mmaps[shard]
+
+    # ------------------------------------------------------------------ #
+    # Lookup
+    # ------------------------------------------------------------------ #
+    def key(self, text, normalize=False):
+        """Content address of `text` for this model and encode options."""
+        payload = f"{self.model_name}\0{int(bool(normalize))}\0{text}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def _lookup(self, key):
+        if key in self._pending:
+            return self._pending[key]
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        shard, row, _ = entry
+        try:
+            vector = np.array(self._shard_array(shard)[row], dtype=np.float32)
+        except (FileNotFoundError, IndexError, ValueError):
+            # Shard was compacted away by another process; treat as a miss.
+            del self._entries[key]
+            return None
+        self._clock += 1
+        entry[2] = self._clock
+        self._touched.add(key)
+        return vector
+
+    def encode(self, embedding_model, texts, batch_size=32, normalize_embeddings=False, **encode_kwargs):
+        """
+        Return an (n, dim) float32 array of embeddings for `texts`, encoding only cache misses.
+        Duplicate texts within one call, and texts encoded by earlier calls that are not saved yet,
+        are encoded once.
+        """
+        texts = list(texts)
+        keys = [self.key(text, normalize_embeddings) for text in texts]
+        vectors = {}
+        missing = {}
+        for text, key in zip(texts, keys):
+            if key in vectors or key in missing:
+                continue
+            vector = self._lookup(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                vectors[key] = vector
+
+        n_missing = sum(1 for key in keys if key in missing)
+        self.misses += n_missing
+        self.hits += len(keys) - n_missing
+
+        if missing:
+            encoded = embedding_model.encode(
+                list(missing.values()), batch_size=batch_size, convert_to_numpy=True,
+                normalize_embeddings=normalize_embeddings, **encode_kwargs
+            )
+            encoded = np.asarray(encoded, dtype=np.float32)
+            for key, vector in zip(missing.keys(), encoded):
+                vectors[key] = vector
+                self._pending[key] = vector
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def wrap(self, embedding_model):
+        """Return a drop-in replacement for `embedding_model` whose encode() goes through the cache."""
+        return CachedEmbeddingModel(embedding_model, self)
+
+    # ------------------------------------------------------------------ #
+    # Persistence and eviction
+    # ------------------------------------------------------------------ #
+    def save(self):
+        """Write pending vectors, merge with the on-disk index and evict LRU entries over max_bytes."""
+        with self._locked():
+            disk = self._read_index()
+            clock = max(disk["clock"], self._clock)
+            shards = dict(disk["shards"])
+            entries = dict(disk["entries"])
+
+            # Keep access times from this process for entries that are still on disk
+            for key in self._touched:
+                if key in entries and key in self._entries:
+                    entries[key][2] = max(entries[key][2], self._entries[key][2])
+
+            pending = [(k, v) for k, v in self._pending.items() if k not in entries]
+            if pending:
+                shard = uuid.uuid4().hex
+                array = np.stack([vector for _, vector in pending]).astype(np.float32)
+                np.save(self._shard_path(shard), array)
+                shards[shard] = {"rows": int(array.shape[0]), "dim": int(array.shape[1])}
+                for row, (key, _) in enumerate(pending):
+                    clock += 1
+                    entries[key] = [shard, row, clock]
+
+            evicted = self._evict(entries, shards)
+            if evicted:
+                self._compact(entries, shards)
+
+            index = {"clock": clock, "shards": shards, "entries": entries}
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+
+        self._mmaps.clear()
+        self._pending = {}
+        self._touched.clear()
+        self._clock, self._shards, self._entries = clock, shards, entries
+
+    def _entry_bytes(self, entry, shards):
+        return shards[entry[0]]["dim"] * 4
+
+    def _evict(self, entries, shards):
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        total = sum(self._entry_bytes(entry, shards) for entry in entries.values())
+        if total <= self.max_bytes:
+            return 0
+        evicted = 0
+        for key, entry in sorted(entries.items(), key=lambda item: item[1][2]):
+            if total <= self.max_bytes:
+                break
+            total -= self._entry_bytes(entry, shards)
+            del entries[key]
+            evicted += 1
+        return evicted
+
+    def _compact(self, entries, shards):
+        """Rewrite partially evicted shards into one new shard and delete dead ones."""
+        live = {}
+        for key, (shard, row, _) in entries.items():
+            live.setdefault(shard, []).append((key, row))
+
+        partial = [s for s, rows in live.items() if len(rows) < shards[s]["rows"]]
+        dead = [s for s in shards if s not in live or s in partial]
+        if partial:
+            keys, vectors = [], []
+            for shard in partial:
+                array = np.load(self._shard_path(shard), mmap_mode="r")
+                for key, row in live[shard]:
+                    keys.append(key)
+                    vectors.append(np.array(array[row], dtype=np.float32))
+                del array
+            new_shard = uuid.uuid4().hex
+            stacked = np.stack(vectors)
+            np.save(self._shard_path(new_shard), stacked)
+            shards[new_shard] = {"rows": int(stacked.shape[0]), "dim": int(stacked.shape[1])}
+            for row, key in enumerate(keys):
+                entries[key][0], entries[key][1] = new_shard, row
+
+        for shard in dead:
+            del shards[shard]
+            if os.path.exists(self._shard_path(shard)):
+                os.remove(self._shard_path(shard))
+
+    # ------------------------------------------------------------------ #
+    # Statistics
+    # ------------------------------------------------------------------ #
+    def summary(self):
+        """Human-readable hit/miss statistics."""
+        requests = self.hits + self.misses
+        hit_rate = self.hits / requests if requests else 0.0
+        size_mb = sum(self._entry_bytes(e, self._shards) for e in self._entries.values()
+                      if e[0] in self._shards) / (1 << 20)
+        return (f"Embedding cache ({self.model_name}): {self.hits} hits, {self.misses} misses "
+                f"({hit_rate:.1%} hit rate), {len(self._entries)} entries, {size_mb:.1f} MB")
+
+
+class CachedEmbeddingModel:
+    """Wraps a SentenceTransformer so that encode() reads and fills an EmbeddingCache."""
+
+    def __init__(self, embedding_model, cache):
+        self.embedding_model = embedding_model
+        self.cache = cache
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = self.cache.encode(self.embedding_model, texts, batch_size=batch_size,
+                                       normalize_embeddings=normalize_embeddings, **kwargs)
+        return embeddings[0] if single else embeddings
@@ -0,0 +1,195 @@
+"""
+graph_snapshot.py
+
+Binary snapshots of the project's Turtle graphs for fast loading in the analysis scripts.
+
+Parsing Turtle in pure Python dominates the start-up of every analysis script. A snapshot
+stores the same graph as an interned term dictionary plus an (n, 3) int32 array of term
+IDs; the array is memory-mapped on load, so a snapshot is read in milliseconds. Snapshots
+live next to their source file and are rebuilt automatically when the source changes
+(size and mtime are checked first, the sha256 only when those differ).
+
+Snapshot layout:
+    results/<name>.ttl.snapshot/meta.json     # version, source size/mtime/sha256, prefixes
+    results/<name>.ttl.snapshot/terms.json    # [[kind, value, datatype or language], ...]
+    results/<name>.ttl.snapshot/triples.npy   # int32 array, shape (triples, 3)
+
+Usage:
+    from graph_snapshot import load_graph
+    g = load_graph("results/novel_posthumanism_rdf_fixed.ttl")   # drop-in for Graph().parse(...)
+
+    python scripts/graph_snapshot.py results/*.ttl                # (re)build snapshots ahead of time
+"""
+
+import os
+import sys
+import json
+
+import numpy as np
+from rdflib import Graph, URIRef, BNode, Literal
+from rdflib.util import guess_format
+
+from build_manifest import file_sha256
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+
+URI, BLANK, LITERAL = "u", "b", "l"
+
+
+def snapshot_dir_for(source_path):
+    return source_path + SNAPSHOT_SUFFIX
+
+
+# ------------------------------------------------------------------ #
+# Term dictionary
+# ------------------------------------------------------------------ #
+def encode_term(term):
+    if isinstance(term, URIRef):
+        return [URI, str(term), None]
+    if isinstance(term, BNode):
+        return [BLANK, str(term), None]
+    if term.language:
+        return [LITERAL, str(term), "@" + term.language]
+    return [LITERAL, str(term), str(term.datatype) if term.datatype else None]
+
+
+def decode_term(kind, value, extra):
+    if kind == URI:
+        return URIRef(value)
+    if kind == BLANK:
+        return BNode(value)
+    if extra is None:
+        return Literal(value)
+    if extra.startswith("@"):
+        return Literal(value, lang=extra[1:])
+    return Literal(value, datatype=URIRef(extra))
+
+
+# ------------------------------------------------------------------ #
+# Writing
+# ------------------------------------------------------------------ #
+def write_snapshot(graph, source_path):
+    """Store `graph` (the parsed or just-serialized contents of `source_path`) as a snapshot."""
+    snapshot_dir = snapshot_dir_for(source_path)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    meta_path = os.path.join(snapshot_dir, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)  # an incomplete snapshot must never look valid
+
+    ids = {}
+    terms = []
+    triples = np.empty((len(graph), 3), dtype=np.int32)
+    for row, triple in enumerate(graph):
+        for column, term in enumerate(triple):
+            term_id = ids.get(term)
+            if term_id is None:
+                term_id = ids[term] = len(terms)
+                terms.append(encode_term(term))
+            triples[row, column] = term_id
+
+    with open(os.path.join(snapshot_dir, "terms.json"), "w", encoding="utf-8") as f:
+        json.dump(terms, f)
+    np.save(os.path.join(snapshot_dir, "triples.npy"), triples)
+
+    stat = os.stat(source_path)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(source_path)},
+        "namespaces": {prefix: str(namespace) for prefix, namespace in graph.namespaces()},
+        "terms": len(terms),
+        "triples": int(triples.shape[0]),
+    }
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + ".tmp", meta_path)
+    return snapshot_dir
+
+
+def build_snapshot(source_path):
+    """Parse `source_path` once and write its snapshot; returns the parsed graph."""
+    graph = Graph()
+    graph.parse(source_path, format=guess_format(source_path) or "turtle")
+    write_snapshot(graph, source_path)
+    return graph
+
+
+# ------------------------------------------------------------------ #
+# Reading
+# ------------------------------------------------------------------ #
+def read_meta(source_path):
+    """Snapshot metadata if the snapshot is up to date with `source_path`, else None."""
+    meta_path = os.path.join(snapshot_dir_for(source_path), "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    stat = os.stat(source_path)
+    source = meta["source"]
+    if source["size"] == stat.st_size and source["mtime_ns"] == stat.st_mtime_ns:
+        return meta
+    if source["size"] != stat.st_size or source["sha256"] != file_sha256(source_path):
+        return None
+
+    # Touched but unchanged (e.g. a fresh checkout): remember the new mtime
+    source["mtime_ns"] = stat.st_mtime_ns
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(meta_path + ".tmp", meta_path)
+    return meta
+
+
+def load_triples(source_path):
+    """
+    (terms, triples, meta) for `source_path`: a list of rdflib terms and a memory-mapped
+    (n, 3) int32 array of indices into it. The snapshot is (re)built first if it is stale.
+    """
+    if not os.path.exists(source_path):
+        raise FileNotFoundError(source_path)
+    meta = read_meta(source_path)
+    if meta is None:
+        build_snapshot(source_path)
+        meta = read_meta(source_path)
+
+    snapshot_dir = snapshot_dir_for(source_path)
+    with open(os.path.join(snapshot_dir, "terms.json"), "r", encoding="utf-8") as f:
+        terms = [decode_term(*term) for term in json.load(f)]
+    triples = np.load(os.path.join(snapshot_dir, "triples.npy"), mmap_mode="r")
+    return terms, triples, meta
+
+
+def load_graph(source_path, graph=None):
+    """
+    Drop-in replacement for `Graph().parse(source_path, format="turtle")` that reads the
+    binary snapshot. Pass `graph` to add the triples to an existing graph instead.
+    """
+    terms, triples, meta = load_triples(source_path)
+    if graph is None:
+        graph = Graph()
+    for prefix, namespace in meta["namespaces"].items():
+        graph.bind(prefix, namespace, override=False)
+    graph.addN((terms[s], terms[p], terms[o], graph) for s, p, o in triples.tolist())
+    return graph
+
+
+def main():
+    paths = sys.argv[1:]
+    if not paths:
+        print(__doc__)
+        return 1
+    for path in paths:
+        if path.endswith(SNAPSHOT_SUFFIX) or not os.path.isfile(path):
+            continue
+        if read_meta(path) is not None:
+            print(f"⏭ Snapshot is up to date: {path}")
+            continue
+        graph = build_snapshot(path)
+        print(f"✅ Snapshot written for {path} ({len(graph)} triples)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
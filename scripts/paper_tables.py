@@ -0,0 +1,330 @@
+"""
+paper_tables.py
+
+All paper tables from one process, with every RDF graph loaded only once.
+
+The table scripts (analysis.py, analyze_table4.py, generate_table2.py, generate_table5.py,
+query_novel.py) used to load their graphs from scratch in separate processes. Here each
+table is a function that takes a GraphStore and returns its DataFrames keyed by CSV path
+(relative to results/); the store loads each graph on first use (from its binary snapshot,
+see graph_snapshot.py) and shares it between tables. The old scripts are thin wrappers
+around these functions.
+
+Usage:
+    python scripts/paper_tables.py run-all                 # every CSV, one process
+    python scripts/paper_tables.py table2 table5           # selected tables
+    python scripts/paper_tables.py run-all --results-dir /tmp/results
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+from collections import defaultdict
+
+import pandas as pd
+
+from graph_snapshot import load_graph
+from triple_index import TripleIndex, local_name
+from relation_counts import count_relations, RELATIONS
+from edge_counts import EdgeCounts, read_counts
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, "../results")
+
+# Graph name -> Turtle files (in the results folder) merged into that graph
+GRAPH_FILES = {
+    "criticism": ["criticism_rdf_fixed.ttl"],
+    "novel": ["novel_posthumanism_rdf_fixed.ttl"],
+    "novel_mentions": ["novel_posthumanism_rdf.ttl"],
+    # Builder outputs with their .counts.tsv side tables (edge_counts.py); no update_rdf_ttl.py pass
+    "counted": ["novel_posthumanism_rdf_fixed.ttl", "criticism_rdf_fixed.ttl"],
+}
+
+
+class GraphStore:
+    """Loads each named graph (or its TripleIndex) on first use and keeps it for every later table."""
+
+    def __init__(self, results_dir=RESULTS_DIR):
+        self.results_dir = results_dir
+        self._graphs = {}
+        self._indexes = {}
+
+    def path(self, filename):
+        return os.path.join(self.results_dir, filename)
+
+    def graph(self, name):
+        if name not in self._graphs:
+            graph = None
+            for filename in GRAPH_FILES[name]:
+                print(f"Loading {name} RDF from: {self.path(filename)}")
+                graph = load_graph(self.path(filename), graph)
+            print(f"Loaded {len(graph)} triples for the {name} graph.")
+            self._graphs[name] = graph
+        return self._graphs[name]
+
+    def index(self, name):
+        """Integer-encoded TripleIndex of a named graph, for pattern lookups without SPARQL."""
+        if name not in self._indexes:
+            paths = [self.path(filename) for filename in GRAPH_FILES[name]]
+            print(f"Indexing {name} RDF from: {', '.join(paths)}")
+            self._indexes[name] = TripleIndex.from_snapshot(*paths)
+            print(f"Indexed {len(self._indexes[name])} triples for the {name} graph.")
+        return self._indexes[name]
+
+
+# =============================================================================
+# Tables 3 & 4 / character-theme mapping / concept linkage (analysis.py)
+# =============================================================================
+QUERY_CONCEPT_COUNTS = """
+SELECT ?concept (COUNT(?ref) AS ?mentionCount)
+WHERE {
+  ?concept <http://example.org/posthuman#isMentionedIn> ?ref .
+}
+GROUP BY ?concept
+ORDER BY DESC(?mentionCount)
+"""
+
+QUERY_CHARACTER_MAPPING = """
+SELECT ?character ?relation ?concept
+WHERE {
+  ?character ?relation ?concept .
+  FILTER (?relation IN (
+    <http://example.org/posthuman#linkedTo>,
+    <http://example.org/posthuman#strugglesWith>,
+    <http://example.org/posthuman#exemplifies>,
+    <http://example.org/posthuman#contextualizes>
+  ))
+}
+ORDER BY ?character
+"""
+
+QUERY_CONCEPT_LINKAGE = """
+SELECT ?concept1 ?relation ?concept2
+WHERE {
+  ?concept1 ?relation ?concept2 .
+  FILTER (?relation IN (
+    <http://example.org/posthuman#relatedTo>,
+    <http://example.org/posthuman#criticizes>,
+    <http://example.org/posthuman#extends>
+  ))
+}
+ORDER BY ?concept1
+"""
+
+
+def concept_mention_counts(graph):
+    """(concept URI, isMentionedIn count) pairs, most mentioned first."""
+    return [(row[0], int(row[1])) for row in graph.query(QUERY_CONCEPT_COUNTS)]
+
+
+def analysis_tables(store):
+    """Concept counts, character-to-theme mapping and concept linkage (analysis.py)."""
+    criticism_graph, novel_graph = store.graph("criticism"), store.graph("novel")
+
+    df_criticism_counts = pd.DataFrame(
+        [(str(concept).split("#")[-1], count) for concept, count in concept_mention_counts(criticism_graph)],
+        columns=["Concept", "Criticism Mentions"])
+    df_novel_counts = pd.DataFrame(
+        [(str(concept).split("#")[-1], count) for concept, count in concept_mention_counts(novel_graph)],
+        columns=["Concept", "Novel Mentions"])
+    df_concept_counts = pd.merge(df_criticism_counts, df_novel_counts, on="Concept", how="outer").fillna(0)
+
+    character_mapping_data = [
+        (str(row[0]).split("#")[-1], str(row[1]).split("#")[-1], str(row[2]).split("#")[-1].replace("_", " "))
+        for row in novel_graph.query(QUERY_CHARACTER_MAPPING)
+    ]
+    df_character_mapping = pd.DataFrame(character_mapping_data, columns=["Character", "Relation", "Concept"])
+
+    concept_linkage_data = [
+        (str(row[0]).split("#")[-1], str(row[1]).split("#")[-1], str(row[2]).split("#")[-1].replace("_", " "))
+        for row in criticism_graph.query(QUERY_CONCEPT_LINKAGE)
+    ]
+    df_concept_linkage = pd.DataFrame(concept_linkage_data, columns=["Concept 1", "Relation", "Concept 2"])
+
+    return {
+        "analysis_results/concept_counts.csv": df_concept_counts,
+        "analysis_results/character_theme_mapping.csv": df_character_mapping,
+        "analysis_results/concept_linkage_analysis.csv": df_concept_linkage,
+    }
+
+
+# =============================================================================
+# Table 4: concept mentions comparison (analyze_table4.py)
+# =============================================================================
+def table4(store):
+    def readable_counts(graph):
+        counts = {}
+        for concept, count in concept_mention_counts(graph):
+            concept = str(concept).split("#")[-1].replace("_", " ")
+            if concept.lower() == "unknown concept":  # skip the fallback concept
+                continue
+            counts[concept] = count
+        return counts
+
+    criticism_data = readable_counts(store.graph("criticism"))
+    novel_data = readable_counts(store.graph("novel"))
+
+    all_concepts = set(criticism_data.keys()).union(set(novel_data.keys()))
+    merged_data = [(concept, criticism_data.get(concept, 0), novel_data.get(concept, 0)) for concept in all_concepts]
+    df_table4 = pd.DataFrame(merged_data, columns=["Concept", "Criticism Mentions", "Novel Mentions"])
+    df_table4 = df_table4.sort_values(by="Criticism Mentions", ascending=False)
+    return {"analysis_table4.csv": df_table4}
+
+
+# =============================================================================
+# Table 2: character-to-concept mapping (generate_table2.py)
+# =============================================================================
+TABLE2_CHARACTERS = ["Deckard", "Rachael", "Isidore", "Luba_Luft"]
+TABLE2_CONCEPTS = {
+    "httpexampleorgposthumanCyborg_Theory": "Cyborg Theory",
+    "httpexampleorgposthumanAnimal_Ethics": "Animal Ethics",
+    "httpexampleorgposthumanPosthuman_Ethics": "Posthuman Ethics",
+    "empathy_box": "Empathy"  # Assuming "empathy_box" represents Empathy
+}
+TABLE2_PREDICATES = {
+    "strugglesWith": "Struggles With",
+    "linkedTo": "Linked To",
+    "questions": "Questions"
+}
+
+
+def table2(store):
+    character_concept_counts = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    index = store.index("novel_mentions")
+
+    # Local names are compared once per distinct term, then matched through the index
+    characters = index.find_terms(lambda term: local_name(term) in TABLE2_CHARACTERS, position="s")
+    predicates = index.find_terms(lambda term: local_name(term) in TABLE2_PREDICATES, position="p")
+    concepts = index.find_terms(lambda term: local_name(term) in TABLE2_CONCEPTS, position="o")
+
+    for (s, p, o), count in index.count_by("spo", s=characters, p=predicates, o=concepts).items():
+        mapped_predicate = TABLE2_PREDICATES[local_name(p)]
+        character_concept_counts[local_name(s)][mapped_predicate][TABLE2_CONCEPTS[local_name(o)]] += count
+
+    table2_data = []
+    for character, predicates in character_concept_counts.items():
+        row = {"Character": character}
+        for predicate, concepts in predicates.items():
+            for concept, count in concepts.items():
+                row[f"{predicate} ({concept})"] = count
+        table2_data.append(row)
+
+    df_table2 = pd.DataFrame(table2_data, columns=None if table2_data else ["Character"])
+    # object dtype first: pandas 3 no longer upcasts float columns when filling them with a string
+    df_table2 = df_table2.astype(object).fillna("-")
+    df_table2 = df_table2.set_index("Character").reindex(TABLE2_CHARACTERS).reset_index()
+    return {"table2_results.csv": df_table2}
+
+
+# =============================================================================
+# Table 5: occurrence-weighted character-predicate-concept counts (generate_table5.py)
+# =============================================================================
+def table5(store):
+    """
+    Occurrence count of every character-predicate-concept edge, highest first. Counts come
+    from the .counts.tsv side tables the builders write next to their output (edge_counts.py),
+    one row per edge; edges without a recorded count count once.
+    """
+    side_counts = read_counts(*(store.path(filename) for filename in GRAPH_FILES["counted"]))
+    edges = EdgeCounts.from_index(store.index("counted"), side_counts).to_frame()
+    df = pd.DataFrame({
+        "character": [local_name(term) for term in edges["subject"]],
+        "predicate": [local_name(term) for term in edges["predicate"]],
+        "concept": [local_name(term) for term in edges["object"]],
+        "total_count": edges["count"],
+    })
+    df = df.sort_values(["total_count", "character", "predicate", "concept"],
+                        ascending=[False, True, True, True], kind="stable")
+    return {"table5_results.csv": df.reset_index(drop=True)}
+
+
+# =============================================================================
+# Mention-level relation counts (query_novel.py)
+# =============================================================================
+MENTION_RELATIONS = RELATIONS
+
+
+def mention_counts(store):
+    """Character, Relation, Concept, Count rows; characters alphabetical, counts descending per relation."""
+    char_dict = defaultdict(lambda: {relation: defaultdict(int) for relation in MENTION_RELATIONS})
+    counts = count_relations(store.index("novel_mentions"), MENTION_RELATIONS, via_mentions=True)
+    for char_uri, rel_uri, concept_uri, count in counts.itertuples(index=False):
+        char_dict[char_uri.split("#")[-1]][rel_uri.split("#")[-1]][concept_uri.split("#")[-1]] += count
+
+    rows = [
+        (char_name, relation, concept_name, cnt)
+        for char_name, rel_map in sorted(char_dict.items())
+        for relation in MENTION_RELATIONS
+        for concept_name, cnt in sorted(rel_map[relation].items(), key=lambda x: -x[1])
+    ]
+    return {"mention_counts.csv": pd.DataFrame(rows, columns=["Character", "Relation", "Concept", "Count"])}
+
+
+# =============================================================================
+# Running and saving
+# =============================================================================
+TABLES = {
+    "analysis": analysis_tables,
+    "table2": table2,
+    "table4": table4,
+    "table5": table5,
+    "mentions": mention_counts,
+}
+
+
+# These CSVs were always written with the csv module; keep its \r\n line endings
+CSV_MODULE_OUTPUTS = {"table5_results.csv", "mention_counts.csv"}
+
+
+def save_tables(tables, results_dir=RESULTS_DIR):
+    """Write {relative CSV path: DataFrame} into the results folder; returns the written paths."""
+    paths = []
+    for relative_path, df in tables.items():
+        path = os.path.join(results_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if relative_path in CSV_MODULE_OUTPUTS:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(df.columns)
+                writer.writerows(df.itertuples(index=False))
+        else:
+            df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def run_tables(names, store):
+    """Generate and save the named tables against one GraphStore; returns {name: seconds}."""
+    timings = {}
+    for name in names:
+        start = time.perf_counter()
+        try:
+            paths = save_tables(TABLES[name](store), store.results_dir)
+        except FileNotFoundError as e:
+            print(f"❌ {name}: input graph not found: {e}")
+            continue
+        timings[name] = time.perf_counter() - start
+        for path in paths:
+            print(f"✅ {name}: {path}")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tables", nargs="+", choices=["run-all"] + list(TABLES),
+                        help="Tables to generate, or run-all for every table")
+    parser.add_argument("--results-dir", default=RESULTS_DIR, help="Folder with the input .ttl files and output CSVs")
+    args = parser.parse_args()
+
+    names = list(TABLES) if "run-all" in args.tables else list(dict.fromkeys(args.tables))
+    start = time.perf_counter()
+    timings = run_tables(names, GraphStore(args.results_dir))
+    print(f"\n✅ {len(timings)} of {len(names)} tables generated in {time.perf_counter() - start:.2f}s "
+          f"({', '.join(f'{name} {seconds:.2f}s' for name, seconds in timings.items())})")
+    return 0 if len(timings) == len(names) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+passage_classifier.py
+
+Batched inference for the fine-tuned posthumanism DistilBERT classifier.
+
+Instead of padding every passage to 512 tokens and running the model one line at a
+time, passages are tokenized once, grouped by token length (length bucketing) and
+sent through the model in batches that are only padded to the longest member of the
+batch (dynamic padding).
+
+Documents longer than the model's 512 tokens (whole criticism papers) are not truncated:
+classify_windows() splits them into overlapping token windows (a fast tokenizer's
+overflowing tokens, `stride` tokens shared by neighbouring windows), classifies the windows
+in the same batched way and keeps each window's character span. aggregate_windows() turns
+the window decisions into a document decision and relevant_spans() merges the relevant
+windows into the character ranges worth extracting concepts from.
+
+Usage:
+    from passage_classifier import classify_passages
+    mask = classify_passages(lines, tokenizer, model, batch_size=32)
+
+    from passage_classifier import classify_windows, aggregate_windows, relevant_spans
+    windows = classify_windows([paper], tokenizer, model)[0]
+    if aggregate_windows(windows, "any"):
+        spans = relevant_spans(windows)       # [(start, end), ...] character offsets
+"""
+
+from collections import namedtuple
+
+DEFAULT_BATCH_SIZE = 32
+MAX_LENGTH = 512
+DEFAULT_STRIDE = 128
+AGGREGATIONS = ("any", "mean", "majority")
+
+# Character span of one token window and the model's probability for label 1
+Window = namedtuple("Window", ["start", "end", "score"])
+
+
+def length_buckets(lengths, batch_size):
+    """Group passage indices into batches of similar token length."""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+def classify_passages(texts, tokenizer, model, batch_size=DEFAULT_BATCH_SIZE, max_length=MAX_LENGTH):
+    """
+    Predict posthumanism relevance for a list of passages.
+    Returns a list of booleans aligned with `texts` (True = label 1).
+    """
+    import torch  # imported lazily so that importing this module stays cheap
+
+    if not texts:
+        return []
+
+    encodings = tokenizer(list(texts), truncation=True, max_length=max_length)
+    input_ids = encodings["input_ids"]
+    lengths = [len(ids) for ids in input_ids]
+
+    mask = [False] * len(texts)
+    with torch.inference_mode():
+        for batch in length_buckets(lengths, batch_size):
+            features = [{key: encodings[key][i] for key in encodings.keys()} for i in batch]
+            inputs = tokenizer.pad(features, padding="longest", return_tensors="pt")
+            logits = model(**inputs).logits
+            predictions = torch.argmax(logits, dim=1).tolist()
+            for i, label in zip(batch, predictions):
+                mask[i] = label == 1
+    return mask
+
+
+def classify_windows(texts, tokenizer, model, max_length=MAX_LENGTH, stride=DEFAULT_STRIDE,
+                     batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Split every text into overlapping windows of at most `max_length` tokens and classify them.
+    Needs a fast tokenizer (overflowing tokens with offsets). Returns one list of Window per text,
+    in text order.
+    """
+    import torch
+
+    if not texts:
+        return []
+
+    encodings = tokenizer(list(texts), truncation=True, max_length=max_length, stride=stride,
+                          return_overflowing_tokens=True, return_offsets_mapping=True)
+    input_ids = encodings["input_ids"]
+    lengths = [len(ids) for ids in input_ids]
+
+    scores = [0.0] * len(input_ids)
+    with torch.inference_mode():
+        for batch in length_buckets(lengths, batch_size):
+            features = [{"input_ids": input_ids[i], "attention_mask": encodings["attention_mask"][i]} for i in batch]
+            inputs = tokenizer.pad(features, padding="longest", return_tensors="pt")
+            probabilities = torch.softmax(model(**inputs).logits, dim=1)[:, 1].tolist()
+            for i, probability in zip(batch, probabilities):
+                scores[i] = probability
+
+    windows = [[] for _ in texts]
+    for i, (text_index, offsets) in enumerate(zip(encodings["overflow_to_sample_mapping"],
+                                                   encodings["offset_mapping"])):
+        spans = [(start, end) for start, end in offsets if end > start]  # special tokens are (0, 0)
+        start, end = (spans[0][0], spans[-1][1]) if spans else (0, 0)
+        windows[text_index].append(Window(start, end, scores[i]))
+    return windows
+
+
+def is_relevant_window(window):
+    # Same decision as argmax over the two labels
+    return window.score > 0.5
+
+
+def aggregate_windows(windows, method="any"):
+    """
+    Document decision from its windows:
+      any:       at least one window is relevant
+      mean:      the mean label-1 probability is above 0.5
+      majority:  more than half of the windows are relevant
+    """
+    if not windows:
+        return False
+    if method == "any":
+        return any(map(is_relevant_window, windows))
+    if method == "mean":
+        return sum(window.score for window in windows) / len(windows) > 0.5
+    if method == "majority":
+        return sum(map(is_relevant_window, windows)) * 2 > len(windows)
+    raise ValueError(f"Unknown aggregation: {method}")
+
+
+def relevant_spans(windows):
+    """Character spans of the relevant windows, with overlapping or touching windows merged."""
+    spans = []
+    for window in sorted(filter(is_relevant_window, windows)):
+        if spans and window.start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], window.end))
+        else:
+            spans.append((window.start, window.end))
+    return spans
@@ -1,36 +1,238 @@
+"""
+preprocess_text.py
+
+Cleans every file in data/ into data/processed/: runs of whitespace become one space and
+characters that are neither word characters nor whitespace are removed (clean_text).
+
+Files are cleaned in a process pool and streamed in chunks, so a large novel is never held
+in memory whole; the chunked output is identical to cleaning the whole text at once. A
+manifest (data/processed/manifest.json) records the content hash of every input and the
+output written from it, and inputs whose hash is unchanged since the last run are skipped.
+
+With --sentences the text is also split into sentences before punctuation is removed, and
+one cleaned sentence per line is written to <name>.sentences<ext>, the passage-per-line
+format the RDF builders read.
+
+Usage:
+    python scripts/preprocess_text.py
+    python scripts/preprocess_text.py --sentences --workers 4
+    python scripts/preprocess_text.py --force          # ignore the manifest
+"""
+
 import os
 import re
 import json
-from pathlib import Path
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from build_manifest import file_sha256
+
+INPUT_DIR = "data"
+OUTPUT_DIR = "data/processed"
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 1 << 20  # characters read per chunk
+
+WHITESPACE = re.compile(r"\s+")
+SPECIAL_CHARACTERS = re.compile(r"[^\w\s]")
+# End of sentence: . ! or ? (and any closing quotes or brackets) followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"'”’)\]]*\s+")
+
 
 def clean_text(text):
     """Text cleaning function: Remove special characters and unnecessary whitespace"""
-    text = re.sub(r'\s+', ' ', text)  # Remove multiple whitespace
-    text = re.sub(r'[^\w\s]', '', text)  # Remove special characters
+    text = WHITESPACE.sub(" ", text)  # Remove multiple whitespace
+    text = SPECIAL_CHARACTERS.sub("", text)  # Remove special characters
     return text.strip()
 
-def preprocess_file(input_path, output_path):
-    """Preprocess a single file and save"""
-    with open(input_path, 'r', encoding='utf-8') as infile:
-        text = infile.read()
-    
-    cleaned_text = clean_text(text)
-    
-    with open(output_path, 'w', encoding='utf-8') as outfile:
-        outfile.write(cleaned_text)
-    print(f"Processed: {input_path} -> {output_path}")
-
-def preprocess_all(input_dir, output_dir):
+
+class StreamCleaner:
+    """
+    clean_text() over a text that arrives in chunks.
+    Whitespace at the end of a chunk is held back until the next chunk (a whitespace run may
+    continue there), and spaces at the end of the output until more text follows (strip()).
+    """
+
+    def __init__(self):
+        self._carry = ""
+        self._spaces = ""
+        self._started = False
+
+    def feed(self, chunk):
+        text = self._carry + chunk
+        end = len(text.rstrip())
+        self._carry = text[end:]
+        cleaned = SPECIAL_CHARACTERS.sub("", WHITESPACE.sub(" ", text[:end]))
+        if not self._started:
+            cleaned = cleaned.lstrip()
+            self._started = bool(cleaned)
+        cleaned = self._spaces + cleaned
+        kept = cleaned.rstrip()
+        self._spaces = cleaned[len(kept):]
+        return kept
+
+    def finish(self):
+        return ""  # only whitespace can be left over, and strip() drops it
+
+
+class SentenceSplitter:
+    """Cleaned sentences from a text that arrives in chunks; the last, unfinished sentence is carried over."""
+
+    def __init__(self):
+        self._carry = ""
+
+    def feed(self, chunk):
+        parts = SENTENCE_BOUNDARY.split(self._carry + chunk)
+        self._carry = parts.pop()
+        return [sentence for sentence in map(clean_text, parts) if sentence]
+
+    def finish(self):
+        sentence = clean_text(self._carry)
+        self._carry = ""
+        return [sentence] if sentence else []
+
+
+def processed(processor, chunks):
+    """Feed chunks through a StreamCleaner or SentenceSplitter, yielding its output as it is produced."""
+    for chunk in chunks:
+        yield processor.feed(chunk)
+    yield processor.finish()
+
+
+def output_name(name, sentences=False):
+    if not sentences:
+        return name
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.sentences{ext}"
+
+
+def preprocess_file(input_path, output_path, sentences=False, chunk_size=CHUNK_SIZE):
+    """
+    Clean one file chunk by chunk into output_path (written atomically).
+    Returns the number of sentences written, or None without `sentences`.
+    """
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    n_sentences = None
+    with open(input_path, "r", encoding="utf-8") as infile, open(temp_path, "w", encoding="utf-8") as outfile:
+        chunks = iter(lambda: infile.read(chunk_size), "")
+        if sentences:
+            n_sentences = 0
+            for lines in processed(SentenceSplitter(), chunks):
+                outfile.writelines(line + "\n" for line in lines)
+                n_sentences += len(lines)
+        else:
+            outfile.writelines(processed(StreamCleaner(), chunks))
+    os.replace(temp_path, output_path)
+    return n_sentences
+
+
+def process_task(task):
+    """
+    Pool entry point: hash the input, skip it when the hash matches the previous run,
+    otherwise clean it. Returns the manifest entry and whether the file was rewritten.
+    """
+    input_path, output_path, sentences, chunk_size, previous = task
+    stat = os.stat(input_path)
+    entry = {
+        "input": os.path.basename(input_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_sha256(input_path),
+        "sentences": sentences,
+    }
+    if previous is not None and previous.get("sha256") == entry["sha256"] and os.path.exists(output_path):
+        return {**previous, **entry}, False
+    n_sentences = preprocess_file(input_path, output_path, sentences, chunk_size)
+    entry["output_size"] = os.path.getsize(output_path)
+    if sentences:
+        entry["n_sentences"] = n_sentences
+    return entry, True
+
+
+def read_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(path, manifest):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def unchanged(previous, input_path, output_path):
+    """True when size and mtime match the manifest, so the file need not even be hashed."""
+    if previous is None or not os.path.exists(output_path):
+        return False
+    stat = os.stat(input_path)
+    return previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns
+
+
+def preprocess_all(input_dir, output_dir, sentences=False, workers=None, chunk_size=CHUNK_SIZE, force=False):
     """Preprocess all files in data directory and save to new directory"""
     os.makedirs(output_dir, exist_ok=True)
-    
-    for file in os.listdir(input_dir):
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    previous_manifest = {} if force else read_manifest(manifest_path)
+    manifest = {}
+
+    tasks = []
+    n_inputs = 0
+    for file in sorted(os.listdir(input_dir)):
         input_path = os.path.join(input_dir, file)
-        output_path = os.path.join(output_dir, file)
-        if os.path.isfile(input_path):
-            preprocess_file(input_path, output_path)
-    
+        if not os.path.isfile(input_path):
+            continue
+        n_inputs += 1
+        name = output_name(file, sentences)
+        output_path = os.path.join(output_dir, name)
+        previous = previous_manifest.get(name)
+        if previous is not None and previous.get("sentences") != sentences:
+            previous = None
+        if unchanged(previous, input_path, output_path):
+            manifest[name] = previous
+            print(f"⏭ Unchanged: {input_path}")
+        else:
+            tasks.append((input_path, output_path, sentences, chunk_size, previous))
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(process_task, tasks))
+    else:
+        results = [process_task(task) for task in tasks]
+
+    n_written = 0
+    for (input_path, output_path, *_), (entry, written) in zip(tasks, results):
+        manifest[os.path.basename(output_path)] = entry
+        n_written += written
+        print(f"Processed: {input_path} -> {output_path}" if written else f"⏭ Unchanged: {input_path}")
+
+    # Entries of other modes (with and without --sentences) are kept while their input exists
+    for name, entry in previous_manifest.items():
+        if name not in manifest and entry.get("sentences") != sentences \
+                and os.path.isfile(os.path.join(input_dir, entry.get("input", ""))):
+            manifest[name] = entry
+    write_manifest(manifest_path, manifest)
+    print(f"✅ {n_written} written, {n_inputs - n_written} unchanged; manifest: {manifest_path}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean the text files in data/ into data/processed/.")
+    parser.add_argument("--input-dir", default=INPUT_DIR, help="Folder of input files (default: %(default)s)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="Folder for cleaned files (default: %(default)s)")
+    parser.add_argument("--sentences", action="store_true",
+                        help="Write one cleaned sentence per line to <name>.sentences<ext>")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU, at most one per changed file)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="Characters read per chunk (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and rewrite every output")
+    args = parser.parse_args()
+    preprocess_all(args.input_dir, args.output_dir, sentences=args.sentences, workers=args.workers,
+                   chunk_size=args.chunk_size, force=args.force)
+
+
 if __name__ == "__main__":
-    input_directory = "data"
-    output_directory = "data/processed"
-    preprocess_all(input_directory, output_directory)
+    main()
@@ -0,0 +1,93 @@
+"""
+relation_counts.py
+
+Character x relation x concept counts computed directly on a TripleIndex.
+
+Several reports (query_novel.py, character_concept.py, rdf_analysis.py and
+results/sparql_character_analysis.py) run the same SPARQL aggregation
+
+    SELECT ?char ?rel ?concept (COUNT(*) AS ?count)
+    WHERE { ?char ?rel ?concept . FILTER(?rel IN (ex:strugglesWith, ex:linkedTo, ex:questions)) }
+    GROUP BY ?char ?rel ?concept
+
+through rdflib's pure-Python evaluator. count_relations() returns the same groups from
+the integer-encoded index with one searchsorted lookup and one np.unique, either for
+direct (character, relation, concept) triples or for reified ex:Mention nodes
+(ex:subject / ex:predicate / ex:object). to_sparse() turns the result into a character x
+concept scipy.sparse matrix for similarity work.
+
+Usage:
+    from triple_index import TripleIndex
+    from relation_counts import count_relations
+    index = TripleIndex.from_snapshot("results/novel_posthumanism_rdf.ttl")
+    df = count_relations(index)                      # columns: character, relation, concept, count
+    df = count_relations(index, via_mentions=True)   # counts over ex:Mention nodes
+"""
+
+import numpy as np
+import pandas as pd
+from rdflib import Namespace, RDF
+from scipy import sparse
+
+EX = Namespace("http://example.org/posthuman#")
+RELATIONS = ["strugglesWith", "linkedTo", "questions"]
+COLUMNS = ["character", "relation", "concept", "count"]
+
+
+def _mention_rows(index, relation_ids):
+    """(character, relation, concept) ID rows for every ex:Mention node, joined like SPARQL would."""
+    mentions = index.match(p=RDF.type, o=EX.Mention)[:, 0]
+    if len(mentions) == 0:
+        return np.empty((0, 3), dtype=np.int32)
+
+    def pairs(prop, name):
+        rows = index.match(s=mentions, p=EX[prop])
+        return pd.DataFrame({"m": rows[:, 0], name: rows[:, 2]})
+
+    joined = (pairs("subject", "s")
+              .merge(pairs("predicate", "p"), on="m")
+              .merge(pairs("object", "o"), on="m"))
+    joined = joined[joined["p"].isin(relation_ids)]
+    return joined[["s", "p", "o"]].to_numpy(dtype=np.int32)
+
+
+def count_relations(index, relations=RELATIONS, via_mentions=False):
+    """
+    Count (character, relation, concept) groups for the given ex: relation names.
+    Returns a DataFrame of rdflib terms plus an integer `count`, ordered by character,
+    relation and concept (as strings), like ORDER BY ?char ?rel ?concept.
+    """
+    relation_ids = [i for i in (index.term_id(EX[r]) for r in relations) if i is not None]
+    rows = _mention_rows(index, relation_ids) if via_mentions else index.match(p=relation_ids)
+    if len(rows) == 0:
+        return pd.DataFrame(columns=COLUMNS)
+
+    keys, counts = np.unique(rows, axis=0, return_counts=True)
+
+    # Order by the string form of each term: rank the distinct IDs once, then lexsort
+    ids = np.unique(keys)
+    names = np.array([str(index.terms[i]) for i in ids.tolist()], dtype=object)
+    rank = np.zeros(ids.max() + 1, dtype=np.int64)
+    rank[ids[np.argsort(names, kind="stable")]] = np.arange(len(ids))
+    order = np.lexsort((rank[keys[:, 2]], rank[keys[:, 1]], rank[keys[:, 0]]))
+    keys, counts = keys[order], counts[order]
+
+    terms = index.terms
+    return pd.DataFrame({
+        "character": [terms[i] for i in keys[:, 0].tolist()],
+        "relation": [terms[i] for i in keys[:, 1].tolist()],
+        "concept": [terms[i] for i in keys[:, 2].tolist()],
+        "count": counts.astype(int),
+    })
+
+
+def to_sparse(df, rows="character", columns="concept", values="count"):
+    """
+    Sum `values` into a rows x columns scipy.sparse CSR matrix.
+    Returns (matrix, row labels, column labels), labels sorted.
+    """
+    row_labels, row_codes = np.unique([str(value) for value in df[rows]], return_inverse=True)
+    column_labels, column_codes = np.unique([str(value) for value in df[columns]], return_inverse=True)
+    matrix = sparse.coo_matrix((df[values].to_numpy(dtype=np.float64), (row_codes, column_codes)),
+                               shape=(len(row_labels), len(column_labels))).tocsr()
+    return matrix, row_labels.tolist(), column_labels.tolist()
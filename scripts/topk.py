@@ -0,0 +1,75 @@
+"""
+topk.py
+
+Top-k rows per group without a Python call per group.
+
+The character reports used `df.groupby("Character").apply(lambda x: x.nlargest(3, "Count"))`,
+which runs the lambda (and builds a DataFrame) once for every character.
+top_k_per_group() gives the same rows with one stable sort and one groupby().cumcount():
+groups in sorted order, values descending, ties in their original row order - what
+nlargest(keep="first") keeps. keep="all" also keeps rows tied with the k-th value, like
+nlargest(keep="all").
+
+TopK is a heap-based streaming version for rows that arrive in chunks (e.g. passage by
+passage over a multi-novel corpus) and never sit in one DataFrame: memory is k entries per
+group.
+
+Usage:
+    from topk import top_k_per_group, TopK
+    df_top = top_k_per_group(df, "Character", "Count", k=3)
+    top = TopK(k=3)
+    for character, count, row in rows:
+        top.add(character, count, row)
+    top.items()      # {character: [(count, row), ...]} best first
+"""
+
+import heapq
+import itertools
+
+
+def top_k_per_group(df, by, column, k=3, keep="first"):
+    """
+    The k rows with the largest `column` in each `by` group (a column name or list of names).
+    keep="first" breaks ties by row order; keep="all" keeps every row tied with the k-th value.
+    Returns a DataFrame with a fresh RangeIndex, ordered by group, then `column` descending.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    ordered = df.sort_values(by + [column], ascending=[True] * len(by) + [False], kind="stable")
+    if keep == "first":
+        selected = ordered.groupby(by, sort=False).cumcount() < k
+    elif keep == "all":
+        selected = ordered.groupby(by, sort=False)[column].rank(method="min", ascending=False) <= k
+    else:
+        raise ValueError(f"keep must be 'first' or 'all', not {keep!r}")
+    return ordered[selected].reset_index(drop=True)
+
+
+class TopK:
+    """Streaming top-k per group: a min-heap of at most k (value, order, item) entries per group."""
+
+    def __init__(self, k=3):
+        self.k = k
+        self._heaps = {}
+        self._order = itertools.count()
+
+    def add(self, group, value, item=None):
+        # Earlier items win ties: a larger negated arrival number ranks higher in the min-heap
+        entry = (value, -next(self._order), item)
+        heap = self._heaps.setdefault(group, [])
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    def update(self, rows):
+        """Add (group, value, item) tuples."""
+        for group, value, item in rows:
+            self.add(group, value, item)
+        return self
+
+    def items(self):
+        """{group: [(value, item), ...]} with groups sorted and values descending."""
+        return {
+            group: [(value, item) for value, _, item in sorted(self._heaps[group], key=lambda e: e[:2], reverse=True)]
+            for group in sorted(self._heaps)
+        }
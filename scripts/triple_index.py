@@ -0,0 +1,182 @@
+"""
+triple_index.py
+
+Integer-encoded, read-only triple index for the analysis scripts.
+
+Terms are dictionary-encoded to integer IDs (the same encoding as the binary snapshots in
+graph_snapshot.py) and the (n, 3) ID array is sorted three ways - SPO, POS and OSP - so
+any triple pattern with bound positions is answered by a binary search (np.searchsorted)
+on the permutation led by a bound position, instead of a Python loop over every triple.
+String conditions such as "local name is strugglesWith" are evaluated once per distinct
+term with find_terms(), not once per triple.
+
+Usage:
+    from triple_index import TripleIndex
+    index = TripleIndex.from_snapshot("results/novel_posthumanism_rdf.ttl")
+    predicates = index.find_terms(lambda term: str(term).endswith("#strugglesWith"), position="p")
+    rows = index.match(p=predicates)                      # (k, 3) array of term IDs
+    counts = index.count_by("so", p=predicates)           # {(subject, object): count}
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from graph_snapshot import load_triples
+
+POSITIONS = {"s": 0, "p": 1, "o": 2}
+
+# Permutation used for each combination of bound positions: its leading columns are bound
+PERMUTATIONS = {
+    "spo": (0, 1, 2),
+    "pos": (1, 2, 0),
+    "osp": (2, 0, 1),
+}
+PLAN = {
+    frozenset("s"): "spo", frozenset("sp"): "spo", frozenset("spo"): "spo",
+    frozenset("p"): "pos", frozenset("po"): "pos",
+    frozenset("o"): "osp", frozenset("so"): "osp",
+}
+
+
+def local_name(uri):
+    """The part of a term after its last #, or the whole term (shared label for tables and plots)."""
+    uri = str(uri)
+    return uri.split("#")[-1] if "#" in uri else uri
+
+
+class TripleIndex:
+    """Dictionary-encoded triples with SPO/POS/OSP sort orders for pattern matching."""
+
+    def __init__(self, terms, triples):
+        self.terms = list(terms)
+        self.triples = np.ascontiguousarray(triples, dtype=np.int32).reshape(-1, 3)
+        self._ids = None
+        self._orders = {}
+        self._distinct = {}
+
+    @classmethod
+    def from_snapshot(cls, *paths):
+        """Index one or more Turtle files (merged, duplicates removed) via their snapshots."""
+        terms, ids, parts = [], {}, []
+        for path in paths:
+            file_terms, file_triples, _ = load_triples(path)
+            remap = np.empty(len(file_terms), dtype=np.int32)
+            for local_id, term in enumerate(file_terms):
+                term_id = ids.get(term)
+                if term_id is None:
+                    term_id = ids[term] = len(terms)
+                    terms.append(term)
+                remap[local_id] = term_id
+            parts.append(remap[np.asarray(file_triples)])
+        triples = np.concatenate(parts) if parts else np.empty((0, 3), dtype=np.int32)
+        if len(paths) > 1:
+            _, first = np.unique(triples, axis=0, return_index=True)
+            triples = triples[np.sort(first)]
+        index = cls(terms, triples)
+        index._ids = ids
+        return index
+
+    @classmethod
+    def from_graph(cls, graph):
+        ids, terms = {}, []
+        triples = np.empty((len(graph), 3), dtype=np.int32)
+        for row, triple in enumerate(graph):
+            for column, term in enumerate(triple):
+                term_id = ids.get(term)
+                if term_id is None:
+                    term_id = ids[term] = len(terms)
+                    terms.append(term)
+                triples[row, column] = term_id
+        index = cls(terms, triples)
+        index._ids = ids
+        return index
+
+    def __len__(self):
+        return len(self.triples)
+
+    # ------------------------------------------------------------------ #
+    # Terms
+    # ------------------------------------------------------------------ #
+    def term_id(self, term):
+        """ID of an rdflib term, or None if it does not occur in the index."""
+        if self._ids is None:
+            self._ids = {t: i for i, t in enumerate(self.terms)}
+        return self._ids.get(term)
+
+    def distinct(self, position):
+        """Sorted IDs of the distinct terms used in one position ("s", "p" or "o")."""
+        if position not in self._distinct:
+            self._distinct[position] = np.unique(self.triples[:, POSITIONS[position]])
+        return self._distinct[position]
+
+    def find_terms(self, condition, position=None):
+        """
+        IDs of the distinct terms for which `condition(term)` is true, optionally only among
+        the terms used in `position` (much fewer candidates for predicates and subjects).
+        """
+        candidates = range(len(self.terms)) if position is None else self.distinct(position).tolist()
+        return np.array([i for i in candidates if condition(self.terms[i])], dtype=np.int32)
+
+    def _ids_for(self, value):
+        """Normalize a pattern value (term, ID, or collection of either) to a sorted ID array."""
+        if isinstance(value, np.ndarray):
+            return np.unique(value.astype(np.int32))
+        if isinstance(value, (int, np.integer)):
+            return np.array([value], dtype=np.int32)
+        if isinstance(value, Iterable) and not isinstance(value, str):
+            ids = [v if isinstance(v, (int, np.integer)) else self.term_id(v) for v in value]
+            return np.unique(np.array([i for i in ids if i is not None], dtype=np.int32))
+        term_id = self.term_id(value)
+        return np.array([] if term_id is None else [term_id], dtype=np.int32)
+
+    # ------------------------------------------------------------------ #
+    # Pattern matching
+    # ------------------------------------------------------------------ #
+    def _sorted(self, name):
+        """Triple rows sorted by the columns of permutation `name` (e.g. POS), built on first use."""
+        if name not in self._orders:
+            a, b, c = PERMUTATIONS[name]
+            self._orders[name] = self.triples[np.lexsort((self.triples[:, c], self.triples[:, b], self.triples[:, a]))]
+        return self._orders[name]
+
+    def match(self, s=None, p=None, o=None):
+        """
+        All triples matching the pattern, as an (k, 3) array of term IDs in SPO column order.
+        Each of s/p/o may be None (unbound), a term, a term ID, or a collection of those.
+        """
+        bound = {name: self._ids_for(value) for name, value in (("s", s), ("p", p), ("o", o)) if value is not None}
+        if not bound:
+            return self.triples
+        if any(len(ids) == 0 for ids in bound.values()):
+            return np.empty((0, 3), dtype=np.int32)
+
+        plan = PLAN[frozenset(bound)]
+        rows = self._sorted(plan)
+        first = PERMUTATIONS[plan][0]
+        leading = bound[plan[0]]
+
+        # Binary search every requested value of the leading column
+        column = rows[:, first]
+        starts = np.searchsorted(column, leading, side="left")
+        ends = np.searchsorted(column, leading, side="right")
+        lengths = ends - starts
+        selected = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        result = rows[selected]
+
+        for name, ids in bound.items():
+            if name != plan[0]:
+                result = result[np.isin(result[:, POSITIONS[name]], ids)]
+        return result
+
+    def count_by(self, by, s=None, p=None, o=None):
+        """
+        Group the triples matching the pattern by the positions in `by` (e.g. "so") and count
+        them. Returns {(term, ...): count} ordered by term ID.
+        """
+        rows = self.match(s, p, o)
+        columns = [POSITIONS[name] for name in by]
+        if len(rows) == 0:
+            return {}
+        keys, counts = np.unique(rows[:, columns], axis=0, return_counts=True)
+        return {tuple(self.terms[i] for i in key): int(count) for key, count in zip(keys.tolist(), counts.tolist())}
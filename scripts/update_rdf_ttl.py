@@ -2,7 +2,15 @@
 update_rdf_ttl.py
 
 This script loads two RDF/Turtle files, counts occurrences of each (subject, predicate, object) triple,
-and updates the files by adding an 'ex:occurrenceCount' property using RDF reification.
+and stores the counts per edge in one of two ways:
+  - side table (default): updated_*.ttl keeps only the original triples and the counts go to
+    updated_*.ttl.counts.tsv, keyed by triple ID (see edge_counts.py)
+  - reify: an 'ex:occurrenceCount' property on an RDF reification node for every triple
+    (a blank node plus four triples per edge, roughly five times the graph size)
+
+build_novel_rdf_fixed.py now writes the side table for its own output while it processes the
+passages, with real multiplicities (this script can only count each triple of a graph once),
+so Table 5 no longer needs this step; it remains for graphs built by other means.
 
 Installation:
     pip install rdflib
@@ -10,10 +18,14 @@ Installation:
 Usage:
     Run this script in VS Code terminal:
     python update_rdf_ttl.py
+    python update_rdf_ttl.py --mode reify
 """
 
+import argparse
 from rdflib import Graph, Namespace, Literal, RDF, BNode
 from collections import defaultdict
+from graph_snapshot import load_graph, write_snapshot
+from edge_counts import write_counts
 
 # 📂 File paths (Modify if needed)
 base_path = "/Users/sujinkkang/Dropbox/pkd_rdf_project/results/"
@@ -27,16 +39,15 @@ updated_criticism_ttl_path = base_path + "updated_criticism_rdf.ttl"
 # Define the namespace for RDF reification and custom properties
 ex = Namespace("http://example.org/posthuman#")
 
-def process_ttl_file(input_path, output_path):
+def process_ttl_file(input_path, output_path, mode="side-table"):
     """
     Reads an RDF Turtle file, counts occurrences of each (subject, predicate, object) triple,
-    and writes a new Turtle file with 'ex:occurrenceCount' added using RDF reification.
+    and writes a new Turtle file with the counts in a side table or as RDF reification.
     """
     print(f"📂 Processing: {input_path}")
 
     # 1️⃣ Load the RDF file
-    g = Graph()
-    g.parse(input_path, format="turtle")
+    g = load_graph(input_path)
 
     # 2️⃣ Count occurrences of each (subject, predicate, object) triple
     triple_counts = defaultdict(int)
@@ -48,20 +59,36 @@ def process_ttl_file(input_path, output_path):
     new_g += g  # Keep existing triples
 
     # 4️⃣ Add RDF reification for occurrence count
-    for (s, p, o), count in triple_counts.items():
-        statement = BNode()  # Create a blank node to store metadata
-        new_g.add((statement, RDF.subject, s))
-        new_g.add((statement, RDF.predicate, p))
-        new_g.add((statement, RDF.object, o))
-        new_g.add((statement, ex.occurrenceCount, Literal(count)))
+    if mode == "reify":
+        for (s, p, o), count in triple_counts.items():
+            statement = BNode()  # Create a blank node to store metadata
+            new_g.add((statement, RDF.subject, s))
+            new_g.add((statement, RDF.predicate, p))
+            new_g.add((statement, RDF.object, o))
+            new_g.add((statement, ex.occurrenceCount, Literal(count)))
 
     # 5️⃣ Save the updated RDF file
     new_g.serialize(destination=output_path, format="turtle")
+    write_snapshot(new_g, output_path)
+    if mode == "side-table":
+        print(f"✅ Occurrence counts saved: {write_counts(triple_counts, output_path)}")
 
     print(f"✅ Updated RDF file saved: {output_path}\n")
 
-# 📌 Process both RDF files and update them
-process_ttl_file(novel_ttl_path, updated_novel_ttl_path)
-process_ttl_file(criticism_ttl_path, updated_criticism_ttl_path)
+parser = argparse.ArgumentParser(description="Add per-edge occurrence counts to the RDF files")
+parser.add_argument("--mode", choices=["side-table", "reify"], default="side-table",
+                    help="Store counts in a .counts.tsv side table (default) or as RDF reification")
+args = parser.parse_args()
 
-print("🎉 All RDF files have been updated with ex:occurrenceCount!")
+# 📌 Process both RDF files and update them
+process_ttl_file(novel_ttl_path, updated_novel_ttl_path, args.mode)
+process_ttl_file(criticism_ttl_path, updated_criticism_ttl_path, args.mode)
+
+if args.mode == "reify":
+    print("🎉 All RDF files have been updated with ex:occurrenceCount!")
+else:
+    print("🎉 All RDF files have been updated with .counts.tsv side tables!")
+    # A parsed graph holds each triple once, so every edge written here has count 1
+    print("ℹ These side tables can only record a count of 1 per edge. For real occurrence counts use the "
+          ".counts.tsv that build_novel_rdf_fixed.py writes next to its output "
+          "(results/novel_posthumanism_rdf_fixed.ttl.counts.tsv).")
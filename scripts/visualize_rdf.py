@@ -1,76 +1,281 @@
+"""
+visualize_rdf.py
+
+Static (PNG, matplotlib) and interactive (HTML, pyvis) views of the RDF graphs.
+
+Drawing every triple of the merged graph is slow and unreadable, so the graph is coarsened
+first:
+  - passage nodes (ex:passage_<n> of the novel graph, ex:Sentence_<hash> of the merged graph)
+    are collapsed: every triple linking a node to a passage adds one to that node's mention
+    count (the node size), and nodes linked to the same passage are joined by a weighted
+    coMentioned edge
+  - parallel edges between two nodes become one edge weighted by the number of triples,
+    labelled with its most frequent predicate
+  - literal objects (definitions, criticism texts) are dropped
+  - edges below --min-weight and nodes below --min-degree (weighted degree plus mentions)
+    are removed, and only the --max-nodes highest-ranked nodes are kept
+
+Layouts are computed once per coarsened graph and cached in .cache/layouts/ keyed by a hash
+of its nodes, weighted edges and the layout settings, so re-rendering the same graph (e.g.
+with other labels or only to HTML) does not run the layout again. The HTML view uses the
+same positions with physics disabled, so the browser does not simulate the graph either.
+
+Usage:
+    python scripts/visualize_rdf.py                                  # merged graph -> PNG + HTML
+    python scripts/visualize_rdf.py --input results/novel_posthumanism_rdf_fixed.ttl \\
+        --png novel.png --min-weight 2 --max-nodes 150
+    python scripts/visualize_rdf.py --html graph.html --no-coarsen  # every node (small graphs only)
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+import argparse
+import unicodedata
+from itertools import combinations
+from collections import Counter, defaultdict
+
 import matplotlib
 matplotlib.use('Agg')  # GUI 없이 이미지 저장
 
 import rdflib
 import networkx as nx
 import matplotlib.pyplot as plt
-from pyvis.network import Network
-import unicodedata
+from graph_snapshot import load_graph
+from triple_index import local_name
 
 # 폰트 설정
 plt.rcParams['font.family'] = 'Arial'  # 시스템에서 지원하는 폰트 사용
 plt.rcParams['axes.unicode_minus'] = False  # 마이너스 기호 깨짐 방지
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "../.cache/layouts")
+RDF_PATHS = ["results/merged_posthumanism_graph.ttl"]
+PNG_PATH = "rdf_graph.png"
+HTML_PATH = "rdf_knowledge_graph.html"
+MAX_NODES = 200
+LABELLED_NODES = 30
+LAYOUTS = ("spring", "kamada_kawai", "spectral")
+HTML_SCALE = 1000  # layout coordinates are in [-1, 1]; vis-network works in pixels
+
+PASSAGE_NODE = re.compile(r"(passage_\d+|Sentence_-?\d+)$")
+CO_MENTIONED = "coMentioned"
+
 # 제어문자 및 특수문자 제거 함수
 def clean_text(text):
     """제어문자 및 특수문자 제거"""
     return ''.join(c for c in text if unicodedata.category(c)[0] != 'C')  # C = Control Character
 
-# RDF 파일 로드
-rdf_file_path = "results/criticism_rdf.ttl"
-g = rdflib.Graph()
-g.parse(rdf_file_path, format="turtle")
+########################################################
+# Coarsening
+########################################################
+
+def coarsen(triples, collapse_passages=True):
+    """
+    Weighted DiGraph from RDF triples. Nodes are the cleaned URIs with a `label` and a `mentions`
+    count; each edge has a `weight` (number of triples) and `predicates` ({predicate: count}).
+    Literal objects are skipped; with collapse_passages, passage nodes are folded into the mention
+    counts of their neighbours and coMentioned edges between them.
+    """
+    names = {}
+
+    def name(term):
+        if term not in names:
+            names[term] = clean_text(str(term))
+        return names[term]
+
+    edges = defaultdict(Counter)
+    mentions = Counter()
+    passage_members = defaultdict(set)
+    for subj, pred, obj in triples:
+        if isinstance(obj, rdflib.Literal):
+            continue
+        subj_name, obj_name = name(subj), name(obj)
+        subj_is_passage = collapse_passages and PASSAGE_NODE.search(subj_name)
+        obj_is_passage = collapse_passages and PASSAGE_NODE.search(obj_name)
+        if subj_is_passage and not obj_is_passage:
+            mentions[obj_name] += 1
+            passage_members[subj_name].add(obj_name)
+        elif obj_is_passage and not subj_is_passage:
+            mentions[subj_name] += 1
+            passage_members[obj_name].add(subj_name)
+        elif not subj_is_passage:
+            edges[subj_name, obj_name][local_name(name(pred))] += 1
+
+    # Nodes sharing a passage, e.g. the concepts of one novel passage or a paper and its title
+    for members in passage_members.values():
+        for a, b in combinations(sorted(members), 2):
+            edges[a, b][CO_MENTIONED] += 1
+
+    G = nx.DiGraph()
+    G.add_nodes_from(mentions)
+    for (u, v), predicates in edges.items():
+        G.add_edge(u, v, weight=sum(predicates.values()), predicates=dict(predicates),
+                   label=predicates.most_common(1)[0][0])
+    for node in G:
+        G.nodes[node]["label"] = local_name(node)
+        G.nodes[node]["mentions"] = mentions[node]
+    return G
 
-# NetworkX 그래프 생성
-G = nx.DiGraph()
+def node_scores(G):
+    """Weighted degree plus passage mentions: how prominent a node is."""
+    degree = G.degree(weight="weight")
+    return {node: degree[node] + G.nodes[node]["mentions"] for node in G}
 
-for subj, pred, obj in g:
-    subj_clean = clean_text(str(subj))
-    obj_clean = clean_text(str(obj))
-    pred_clean = clean_text(str(pred).split("#")[-1])
-    G.add_edge(subj_clean, obj_clean, label=pred_clean)
+def filter_graph(G, min_weight=1, min_degree=1, max_nodes=MAX_NODES):
+    """Drop light edges and minor nodes, then keep the `max_nodes` highest-scoring nodes."""
+    G = G.copy()
+    G.remove_edges_from([(u, v) for u, v, weight in G.edges(data="weight") if weight < min_weight])
+    scores = node_scores(G)
+    ranked = sorted((node for node in G if scores[node] >= min_degree), key=lambda node: (-scores[node], node))
+    return G.subgraph(ranked[:max_nodes] if max_nodes else ranked).copy()
+
+########################################################
+# Layout (cached on disk)
+########################################################
+
+def layout_key(G, layout, seed):
+    """Hash of the nodes, weighted edges and layout settings; the cache file name."""
+    digest = hashlib.sha256(f"{layout}\0{seed}\0{nx.__version__}".encode("utf-8"))
+    for node in sorted(G):
+        digest.update(f"\0n{node}".encode("utf-8"))
+    for u, v, weight in sorted(G.edges(data="weight")):
+        digest.update(f"\0e{u}\0{v}\0{weight}".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+def compute_layout(G, layout="spring", seed=42):
+    if not len(G):
+        return {}
+    # Log weights keep a few heavy edges from pulling everything into one point
+    for u, v, weight in G.edges(data="weight"):
+        G.edges[u, v]["layout_weight"] = 1 + math.log(weight)
+    if layout == "spring":
+        return nx.spring_layout(G, weight="layout_weight", seed=seed)
+    if layout == "kamada_kawai":
+        return nx.kamada_kawai_layout(G.to_undirected())
+    if layout == "spectral":
+        return nx.spectral_layout(G, weight="layout_weight")
+    raise ValueError(f"Unknown layout: {layout}")
+
+def cached_layout(G, layout="spring", seed=42, cache_dir=None, use_cache=True):
+    """{node: (x, y)} for G, read from `cache_dir` (default CACHE_DIR) or computed and saved there."""
+    cache_dir = cache_dir or CACHE_DIR
+    path = os.path.join(cache_dir, f"{layout_key(G, layout, seed)}.json")
+    if use_cache and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            print(f"⏭ Layout loaded from cache: {path}")
+            return {node: tuple(xy) for node, xy in json.load(f).items()}
+
+    pos = {node: (float(x), float(y)) for node, (x, y) in compute_layout(G, layout, seed).items()}
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(pos, f)
+        os.replace(temp_path, path)
+    return pos
+
+########################################################
+# Rendering
+########################################################
+
+def node_color(G, node):
+    return "lightgreen" if G.nodes[node]["mentions"] else "lightblue"
+
+def edge_title(data):
+    return ", ".join(f"{predicate} ×{count}" for predicate, count in
+                     sorted(data["predicates"].items(), key=lambda item: -item[1]))
 
 # Matplotlib을 이용한 정적 그래프 시각화
-def draw_static_graph():
-    plt.figure(figsize=(12, 8))
-    pos = nx.spring_layout(G, seed=42)
-    edges = G.edges(data=True)
+def draw_static_graph(G, pos, output_file=PNG_PATH, labelled_nodes=LABELLED_NODES, edge_labels=False):
+    scores = node_scores(G)
+    top_score = max(scores.values(), default=1) or 1
+    side = min(40, 12 + len(G) // 25)
+    plt.figure(figsize=(side, side * 2 / 3))
 
-    nx.draw(G, pos, with_labels=True, node_color="lightblue", edge_color="gray", node_size=2000, font_size=10)
-    edge_labels = {(u, v): d["label"] for u, v, d in edges}
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_size=8)
+    nx.draw_networkx_edges(G, pos, edge_color="gray", alpha=0.4, arrows=G.number_of_edges() <= 1000,
+                           width=[0.5 + math.log(weight) for _, _, weight in G.edges(data="weight")])
+    nx.draw_networkx_nodes(G, pos, node_color=[node_color(G, node) for node in G],
+                           node_size=[100 + 1900 * math.sqrt(scores[node] / top_score) for node in G])
+    labelled = sorted(G, key=lambda node: (-scores[node], node))[:labelled_nodes]
+    nx.draw_networkx_labels(G, pos, labels={node: G.nodes[node]["label"] for node in labelled}, font_size=10)
+    if edge_labels:
+        nx.draw_networkx_edge_labels(G, pos, font_size=7, edge_labels={
+            (u, v): f"{data['label']} ×{data['weight']}" for u, v, data in G.edges(data=True)})
 
-    plt.title("RDF 기반 지식 그래프")
-    plt.savefig("rdf_graph.png")
-    print("정적 그래프가 rdf_graph.png 파일로 저장되었습니다.")
+    plt.title(f"RDF knowledge graph ({G.number_of_nodes()} nodes, {G.number_of_edges()} edges)")
+    plt.axis("off")
+    plt.savefig(output_file, bbox_inches="tight")
+    plt.close()
+    print(f"✅ Static graph saved to {output_file}")
 
 # Pyvis를 이용한 인터랙티브 웹 시각화
-def draw_interactive_graph():
-    net = Network(notebook=False, directed=True)
-
-    for subj, pred, obj in g:
-        subj_clean = clean_text(str(subj))
-        obj_clean = clean_text(str(obj))
-        pred_clean = clean_text(str(pred).split("#")[-1])
-        net.add_node(subj_clean, label=subj_clean, color="lightblue")
-        net.add_node(obj_clean, label=obj_clean, color="lightgreen")
-        net.add_edge(subj_clean, obj_clean, title=pred_clean)
-
-    output_file = "rdf_knowledge_graph.html"
-    net.show(output_file)
-    print(f"웹 기반 지식 그래프가 생성되었습니다: {output_file}")
-
-# 실행 옵션 선택
+def draw_interactive_graph(G, pos, output_file=HTML_PATH):
+    try:
+        from pyvis.network import Network
+    except ImportError:
+        print("❌ pyvis is not installed (pip install pyvis); skipping the HTML graph")
+        return False
+
+    scores = node_scores(G)
+    top_score = max(scores.values(), default=1) or 1
+    # Scripts inlined: one self-contained file instead of a lib/ folder next to it
+    net = Network(height="900px", width="100%", directed=True, notebook=False, cdn_resources="in_line")
+    for node, data in G.nodes(data=True):
+        x, y = pos[node]
+        net.add_node(node, label=data["label"], title=f"{node}\nmentions: {data['mentions']}",
+                     color=node_color(G, node), size=10 + 40 * math.sqrt(scores[node] / top_score),
+                     x=x * HTML_SCALE, y=y * HTML_SCALE, physics=False)
+    for u, v, data in G.edges(data=True):
+        net.add_edge(u, v, title=edge_title(data), value=data["weight"])
+    net.toggle_physics(False)
+    net.save_graph(output_file)
+    print(f"✅ Interactive graph saved to {output_file}")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Draw an RDF graph as a PNG (matplotlib) and/or HTML (pyvis).")
+    parser.add_argument("--input", nargs="+", default=RDF_PATHS,
+                        help="Turtle files to draw, merged into one graph (default: %(default)s)")
+    parser.add_argument("--png", default=None, help=f"PNG output path (default: {PNG_PATH} unless only --html is given)")
+    parser.add_argument("--html", default=None, help=f"HTML output path (default: {HTML_PATH} unless only --png is given)")
+    parser.add_argument("--no-coarsen", action="store_true",
+                        help="Keep passage nodes and do not filter nodes or edges")
+    parser.add_argument("--min-weight", type=int, default=1, help="Drop edges backed by fewer triples (default: %(default)s)")
+    parser.add_argument("--min-degree", type=int, default=1,
+                        help="Drop nodes whose weighted degree plus mentions is lower (default: %(default)s)")
+    parser.add_argument("--max-nodes", type=int, default=MAX_NODES,
+                        help="Keep at most this many of the highest-ranked nodes; 0 keeps all (default: %(default)s)")
+    parser.add_argument("--labels", type=int, default=LABELLED_NODES,
+                        help="Label the N highest-ranked nodes in the PNG (default: %(default)s)")
+    parser.add_argument("--edge-labels", action="store_true", help="Draw predicate labels on PNG edges")
+    parser.add_argument("--layout", choices=LAYOUTS, default="spring", help="Layout algorithm (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=42, help="Layout seed (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help=f"Do not read or write the layout cache ({CACHE_DIR})")
+    args = parser.parse_args()
+
+    png_path, html_path = args.png, args.html
+    if png_path is None and html_path is None:
+        png_path, html_path = PNG_PATH, HTML_PATH
+
+    g = rdflib.Graph()
+    for path in args.input:
+        g += load_graph(path)
+    print(f"Loaded {len(g)} triples from {', '.join(args.input)}")
+
+    G = coarsen(g, collapse_passages=not args.no_coarsen)
+    if not args.no_coarsen:
+        n_nodes, n_edges = G.number_of_nodes(), G.number_of_edges()
+        G = filter_graph(G, args.min_weight, args.min_degree, args.max_nodes)
+        print(f"Coarsened to {G.number_of_nodes()} of {n_nodes} nodes and {G.number_of_edges()} of {n_edges} edges")
+
+    pos = cached_layout(G, args.layout, args.seed, use_cache=not args.no_cache)
+    if png_path:
+        draw_static_graph(G, pos, png_path, labelled_nodes=args.labels, edge_labels=args.edge_labels)
+    if html_path:
+        draw_interactive_graph(G, pos, html_path)
+
 if __name__ == "__main__":
-    print("실행 옵션 선택:")
-    print("1. Matplotlib을 이용한 정적 그래프")
-    print("2. Pyvis를 이용한 웹 기반 인터랙티브 그래프")
-    
-    option = input("옵션을 선택하세요 (1/2): ").strip()
-    
-    if option == "1":
-        draw_static_graph()
-    elif option == "2":
-        draw_interactive_graph()
-    else:
-        print("올바른 옵션을 선택하세요!")
\ No newline at end of file
+    main()
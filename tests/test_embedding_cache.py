@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../scripts"))
+from embedding_cache import EmbeddingCache  # noqa: E402
+
+
+class CountingModel:
+    """SentenceTransformer stand-in that records every text it embeds."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        self.encoded.extend(sentences)
+        return np.array([[len(text), ord(text[0])] for text in sentences], dtype=np.float32)
+
+
+def test_vectors_from_earlier_calls_are_reused_before_save(tmp_path):
+    cache = EmbeddingCache("test-model", cache_dir=str(tmp_path))
+    model = CountingModel()
+
+    first = cache.encode(model, ["x", "y"])
+    again = cache.encode(model, ["x"])
+
+    assert model.encoded == ["x", "y"]
+    np.testing.assert_array_equal(again[0], first[0])
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    cache.save()
+    shards = os.listdir(os.path.join(str(tmp_path), "shards"))
+    assert len(shards) == 1
+    assert np.load(os.path.join(str(tmp_path), "shards", shards[0])).shape == (2, 2)
+
+    reloaded = EmbeddingCache("test-model", cache_dir=str(tmp_path))
+    np.testing.assert_array_equal(reloaded.encode(model, ["y"])[0], first[1])
+    assert model.encoded == ["x", "y"]